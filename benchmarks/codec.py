@@ -0,0 +1,85 @@
+"""Compare JSON codecs on large v2 transaction pages.
+
+Run from the repository root with `python -m benchmarks.codec`.
+"""
+
+import json
+
+from timeit import repeat
+
+from requests import Response
+
+from coinbase.codec import get_codec
+
+
+def transaction(index: int) -> dict:
+    return {
+        "id": f"{index:08x}-5f1c-4e3a-9c2b-7d4e8f0a1b2c",
+        "type": "send",
+        "status": "completed",
+        "amount": {"amount": "-0.00100000", "currency": "BTC"},
+        "native_amount": {"amount": "-27.41", "currency": "USD"},
+        "description": None,
+        "created_at": "2023-03-01T12:34:56Z",
+        "updated_at": "2023-03-01T12:35:10Z",
+        "resource": "transaction",
+        "resource_path": f"/v2/accounts/a/transactions/{index:08x}",
+        "network": {"status": "confirmed", "hash": "ab" * 32},
+        "to": {"resource": "bitcoin_address", "address": "bc1q" + "x" * 38},
+        "details": {"title": "Sent Bitcoin", "subtitle": "To Bitcoin address"},
+    }
+
+
+def page(size: int = 100) -> bytes:
+    payload = {
+        "pagination": {"limit": size, "next_uri": "/v2/next"},
+        "data": [transaction(index) for index in range(size)],
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def response(body: bytes) -> Response:
+    result = Response()
+    result._content = body
+    result.encoding = "utf-8"
+    return result
+
+
+def best(statement, number: int) -> float:
+    return min(repeat(statement, number=number, repeat=5)) / number
+
+
+def main(number: int = 200):
+    body = page()
+    print(f"page of 100 transactions, {len(body)} bytes")
+
+    # Messenger.page decoded every page, then the subscriber decoded it again
+    def twice():
+        result = response(body)
+        result.json()
+        result.json()
+
+    baseline = best(twice, number)
+    print(f"{'requests json() x2':>20}: {baseline * 1e6:8.1f} us")
+
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec = get_codec(name)
+        except ValueError:
+            print(f"{name:>20}: not installed")
+            continue
+
+        def once():
+            result = codec.bind(response(body))
+            result.json()
+            result.json()
+
+        elapsed = best(once, number)
+        print(
+            f"{name:>20}: {elapsed * 1e6:8.1f} us"
+            f"  ({baseline / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
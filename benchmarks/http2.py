@@ -0,0 +1,84 @@
+"""Compare pooled HTTP/1.1 with multiplexed HTTP/2 under concurrency.
+
+Each worker thread shares one Messenger and the stand-in servers delay
+every response to mimic network latency. The servers are cleartext, so
+HTTP/2 is spoken with prior knowledge. Against the real API it is
+negotiated over TLS, where each connection it saves also saves a
+handshake.
+
+Run from the repository root with `python -m benchmarks.http2`.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from time import sleep
+
+from tests.server import H2Server
+from tests.server import Server
+
+from coinbase.api import API
+from coinbase.auth import Auth
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+from coinbase.transport import HttpxTransport
+from coinbase.transport import SessionTransport
+from coinbase.transport import Urllib3Transport
+
+
+class CountingServer(Server):
+    connections = 0
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.connections += 1
+        super().process_request(request, client_address)
+
+
+def payload(request):
+    sleep(0.01)
+    return 200, {}, {"data": {"iso": "2023-03-01T00:00:00Z", "epoch": 1}}
+
+
+def burst(messenger: Messenger, number: int, workers: int) -> float:
+    def call(_):
+        return messenger.get("/time").json()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(call, range(workers)))
+        start = perf_counter()
+        list(executor.map(call, range(number)))
+    return perf_counter() - start
+
+
+def main(number: int = 1000, workers: int = 32):
+    transports = (
+        ("HTTP/1.1 session", Server, SessionTransport),
+        ("HTTP/1.1 urllib3", Server, lambda: Urllib3Transport(maxsize=10)),
+        ("HTTP/2 httpx", H2Server, lambda: HttpxTransport(http1=False)),
+    )
+    results = {}
+    for name, server_type, transport in transports:
+        if server_type is Server:
+            server_type = CountingServer
+        with server_type(payload) as server:
+            limiter = Limiter(rate=1e9, capacity=1e9)
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                limiter,
+                {},
+                transport=transport(),
+            )
+            elapsed = burst(messenger, number, workers)
+            messenger.close()
+            results[name] = (elapsed, server.connections)
+
+    print(f"{number} requests from {workers} threads, 10 ms server delay")
+    for name, (elapsed, connections) in results.items():
+        print(
+            f"{name:>18}: {number / elapsed:8.1f} requests/s"
+            f"  {connections:4d} connections opened"
+        )
+
+
+if __name__ == "__main__":
+    main()
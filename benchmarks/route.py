@@ -0,0 +1,69 @@
+"""Compare request preparation through API.url and a compiled route.
+
+Run from the repository root with `python -m benchmarks.route`.
+"""
+
+from timeit import repeat
+
+from requests import Request
+from requests import Session
+
+from coinbase.api import AdvancedAPI
+from coinbase.auth import Auth
+from coinbase.codec import Codec
+from coinbase.route import Route
+
+ORDER = {
+    "client_order_id": "0d3f1b5c-7f0e-4a53-9b8e-6d2f3c1a9e7b",
+    "product_id": "BTC-USD",
+    "side": "BUY",
+    "order_configuration": {
+        "limit_limit_gtc": {"base_size": "0.001", "limit_price": "20000.00"}
+    },
+}
+
+
+def rate(statement, number: int) -> float:
+    return number / min(repeat(statement, number=number, repeat=5))
+
+
+def main(number: int = 20_000):
+    api = AdvancedAPI({"key": "key", "secret": "secret"})
+    auth = Auth(api)
+    codec = Codec()
+    session = Session()
+    route = Route(api, "POST", "/orders")
+
+    def generic():
+        # what Session.request does before handing the request to an adapter
+        request = Request(
+            "POST", api.url("/orders"), data=codec.encode(ORDER), auth=auth
+        )
+        prepared = session.prepare_request(request)
+        session.merge_environment_settings(prepared.url, {}, None, None, None)
+
+    def uncompiled():
+        # what Messenger.post does before handing the request to a transport
+        body = codec.encode(ORDER)
+        path = api.path("/orders")
+        api.url(path)
+        auth.stamp("POST", path, body)
+
+    def compiled():
+        # what Messenger.call does before handing the request to a transport
+        body = codec.encode(ORDER)
+        path = route.path()
+        route.url(path)
+        route.stamp(auth, path, body)
+
+    before = rate(generic, number)
+    middle = rate(uncompiled, number)
+    after = rate(compiled, number)
+    print(f"{'session.request':>16}: {before:10,.0f} requests/s")
+    print(f"{'transport':>16}: {middle:10,.0f} requests/s")
+    print(f"{'compiled route':>16}: {after:10,.0f} requests/s")
+    print(f"{'speedup':>16}: {after / middle:10.2f}x over transport")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure order latency while a backfill saturates the rate budget.
+
+Sixteen threads page through history as fast as the limiter allows while
+orders are posted one at a time, first with the limiter alone and then
+with a priority scheduler in front of it.
+
+Run from the repository root with `python -m benchmarks.scheduler`.
+"""
+
+from statistics import median
+from threading import Event
+from threading import Thread
+from time import perf_counter
+from time import sleep
+
+from tests.server import Server
+
+from coinbase.limiter import Limiter
+from coinbase.messenger import get_advanced_messenger
+from coinbase.scheduler import Priority
+from coinbase.scheduler import Scheduler
+
+
+def payload(request):
+    return 200, {}, {"success": True}
+
+
+def measure(scheduler: bool, orders: int = 20) -> list[float]:
+    with Server(payload) as server:
+        limiter = Limiter(rate=50, capacity=5)
+        messenger = get_advanced_messenger(
+            server.settings,
+            limiter,
+            scheduler=Scheduler(limiter) if scheduler else None,
+        )
+        done = Event()
+
+        def backfill():
+            with messenger.prioritize(Priority.BACKFILL):
+                while not done.is_set():
+                    messenger.get("/orders/historical/fills")
+
+        threads = [Thread(target=backfill) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        sleep(0.5)
+        latencies = []
+        for _ in range(orders):
+            start = perf_counter()
+            messenger.post("/orders", {"side": "BUY"})
+            latencies.append(perf_counter() - start)
+            sleep(0.05)
+        done.set()
+        for thread in threads:
+            thread.join()
+        messenger.close()
+    return latencies
+
+
+def main():
+    for name, scheduler in (("limiter", False), ("scheduler", True)):
+        latencies = sorted(measure(scheduler))
+        print(
+            f"{name:>10}: median {median(latencies) * 1e3:7.1f} ms"
+            f"  max {latencies[-1] * 1e3:7.1f} ms per order"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Measure request signing throughput.
+
+Run from the repository root with `python -m benchmarks.signing`.
+"""
+
+import hashlib
+import hmac
+
+from timeit import repeat
+
+from coinbase import __agent__
+from coinbase import __source__
+from coinbase import __version__
+
+from coinbase.api import API
+from coinbase.auth import Auth
+
+SECRET = "0123456789abcdef0123456789abcdef"
+MESSAGE = '1680000000POST/api/v3/brokerage/orders{"product_id":"BTC-USD"}'
+
+
+def rebuilt(api: API, timestamp: str, message: str) -> dict:
+    # signing as it was done before the keyed state and headers were cached
+    key = api.secret.encode("ascii")
+    signature = hmac.new(key, message.encode("ascii"), hashlib.sha256)
+    return {
+        "User-Agent": f"{__agent__}/{__version__} {__source__}",
+        "CB-ACCESS-KEY": api.key,
+        "CB-ACCESS-SIGN": signature.hexdigest(),
+        "CB-ACCESS-TIMESTAMP": timestamp,
+        "CB-VERSION": "2021-08-03",
+        "Content-Type": "application/json",
+    }
+
+
+def rate(statement, number: int) -> float:
+    return number / min(repeat(statement, number=number, repeat=5))
+
+
+def main(number: int = 100_000):
+    api = API({"key": "key", "secret": SECRET})
+    auth = Auth(api)
+    before = rate(lambda: rebuilt(api, "1680000000", MESSAGE), number)
+    after = rate(lambda: auth.header("1680000000", MESSAGE), number)
+    print(f"{'rebuilt per request':>20}: {before:12,.0f} headers/s")
+    print(f"{'precomputed':>20}: {after:12,.0f} headers/s")
+    print(f"{'speedup':>20}: {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
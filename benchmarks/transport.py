@@ -0,0 +1,66 @@
+"""Compare transports on round trips to a local stand-in server.
+
+Run from the repository root with `python -m benchmarks.transport`.
+"""
+
+from time import perf_counter
+
+from requests import Session
+
+from tests.server import Server
+
+from coinbase.api import API
+from coinbase.auth import Auth
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+from coinbase.transport import SessionTransport
+from coinbase.transport import Urllib3Transport
+
+
+def payload(request):
+    return 200, {}, {"data": {"iso": "2023-03-01T00:00:00Z", "epoch": 1}}
+
+
+def measure(call, number: int) -> float:
+    call()
+    start = perf_counter()
+    for _ in range(number):
+        call()
+    return (perf_counter() - start) / number
+
+
+def main(number: int = 2000):
+    with Server(payload) as server:
+        api = API(server.settings)
+        auth = Auth(api)
+        session = Session()
+
+        def legacy():
+            # how every request was sent before the transport layer
+            session.request(
+                "GET", api.url("/time"), auth=auth, timeout=30
+            ).json()
+
+        results = {"session.request": measure(legacy, number)}
+        for name, transport in (
+            ("SessionTransport", SessionTransport()),
+            ("Urllib3Transport", Urllib3Transport()),
+        ):
+            limiter = Limiter(rate=1e9, capacity=1e9)
+            messenger = Messenger(auth, limiter, {}, transport=transport)
+            results[name] = measure(
+                lambda: messenger.get("/time").json(), number
+            )
+            messenger.close()
+        session.close()
+
+    baseline = results["session.request"]
+    for name, elapsed in results.items():
+        print(
+            f"{name:>18}: {elapsed * 1e6:8.1f} us/request"
+            f"  ({baseline / elapsed:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -26,3 +26,7 @@ __limit__: float = 1 / (10000 / 3600)
 # The rate limit of the API requests, in seconds.
 # This is calculated as 1 / (10000 requests per hour / 3600 seconds per hour)
 # The rate limit is used to block a request for at least 0.36 seconds.
+
+__burst__: int = 30
+# The number of requests that may be sent back to back before the rate limit
+# is applied. Requests beyond the burst are paced at one every `__limit__`.
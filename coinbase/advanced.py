@@ -13,14 +13,40 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
-from coinbase.abstract import AbstractClient
-from coinbase.messenger import API, Auth, Messenger, Subscriber
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+from coinbase.api import AdvancedAPI
+from coinbase.columns import Columns
+from coinbase.columns import to_columns
+from coinbase.messenger import AdvancedMessenger
+from coinbase.messenger import Auth
+from coinbase.messenger import Messenger
+from coinbase.messenger import Subscriber
+from coinbase.model import AccountRecord
+from coinbase.model import CandleRecord
+from coinbase.model import FillRecord
+from coinbase.model import OrderRecord
+from coinbase.model import ProductRecord
 
 
 class Account(Subscriber):
     def list(self):
         return self.messenger.get("/accounts").json()
 
+    def iter(
+        self, data: dict = None, until=None, typed: bool = False
+    ) -> Iterator:
+        return self.messenger.iter_items(
+            "/accounts",
+            data,
+            "accounts",
+            until=until,
+            model=AccountRecord if typed else None,
+        )
+
     def get(self, account_id: str) -> dict:
         return self.messenger.get(f"/accounts/{account_id}").json()
 
@@ -86,7 +112,7 @@ class Transfer(Subscriber):
         return self.messenger.get(f"/transfers/{transfer_id}").json()
 
     def withdraw_to_address(self, data: dict) -> dict:
-        return self.messenger.post("/withdrawals/crypto", data)
+        return self.messenger.post("/withdrawals/crypto", data).json()
 
     def withdraw_estimate(self, data: dict = None) -> dict:
         return self.messenger.get("/withdrawals/fee-estimate", data).json()
@@ -104,20 +130,48 @@ class Order(Subscriber):
     def fills(self, data: dict) -> list:
         return self.messenger.get("/fills", data).json()
 
+    def iter_fills(
+        self, data: dict = None, until=None, typed: bool = False
+    ) -> Iterator:
+        return self.messenger.iter_items(
+            "/fills",
+            data,
+            "fills",
+            until=until,
+            model=FillRecord if typed else None,
+        )
+
+    def fill_columns(self, data: dict = None, until=None) -> Columns:
+        return to_columns(self.iter_fills(data, until), FillRecord)
+
     def list(self, data: dict):
         return self.messenger.get("/orders", data).json()
 
+    def iter(
+        self, data: dict = None, until=None, typed: bool = False
+    ) -> Iterator:
+        return self.messenger.iter_items(
+            "/orders",
+            data,
+            "orders",
+            until=until,
+            model=OrderRecord if typed else None,
+        )
+
     def cancel_all(self, data: dict = None) -> list:
         return self.messenger.delete("/orders", data).json()
 
     def post(self, data: dict) -> dict:
-        return self.messenger.post("/orders", data).json()
+        route = self.messenger.route("POST", "/orders")
+        return self.messenger.call(route, data).json()
 
     def get(self, order_id: str) -> dict:
-        return self.messenger.get(f"/orders/{order_id}").json()
+        route = self.messenger.route("GET", "/orders/{order_id}")
+        return self.messenger.call(route, order_id=order_id).json()
 
     def cancel(self, order_id: str, data: dict = None) -> str:
-        return self.messenger.delete(f"/orders/{order_id}", data).json()
+        route = self.messenger.route("DELETE", "/orders/{order_id}")
+        return self.messenger.call(route, data, order_id=order_id).json()
 
 
 class Oracle(Subscriber):
@@ -126,11 +180,15 @@ class Oracle(Subscriber):
 
 
 class Product(Subscriber):
-    def list(self):
-        return self.messenger.get("/products").json()
+    def list(self, typed: bool = False):
+        payload = self.messenger.get("/products").json()
+        if typed:
+            return list(ProductRecord.from_items(payload["products"]))
+        return payload
 
-    def get(self, product_id: str) -> dict:
-        return self.messenger.get(f"/products/{product_id}").json()
+    def get(self, product_id: str, typed: bool = False):
+        payload = self.messenger.get(f"/products/{product_id}").json()
+        return ProductRecord.from_dict(payload) if typed else payload
 
     def book(self, product_id: str, data: dict = None) -> dict:
         return self.messenger.get(f"/products/{product_id}/book", data).json()
@@ -143,10 +201,21 @@ class Product(Subscriber):
             f"/products/{product_id}/trades", data
         ).json()
 
-    def candles(self, product_id: str, data: dict = None) -> list:
-        return self.messenger.get(
+    def candles(
+        self, product_id: str, data: dict = None, typed: bool = False
+    ) -> list:
+        payload = self.messenger.get(
             f"/products/{product_id}/candles", data
         ).json()
+        if typed:
+            return list(CandleRecord.from_items(payload["candles"]))
+        return payload
+
+    def candle_columns(self, product_id: str, data: dict = None) -> Columns:
+        payload = self.messenger.get(
+            f"/products/{product_id}/candles", data
+        ).json()
+        return to_columns(payload["candles"], CandleRecord)
 
     def stats(self, product_id: str) -> dict:
         return self.messenger.get(f"/products/{product_id}/stats").json()
@@ -196,7 +265,7 @@ class Time(Subscriber):
         return self.messenger.get("/time").json()
 
 
-class AdvancedTrade(AbstractClient):
+class AdvancedTrade:
     def __init__(self, messenger: Messenger):
         self.messenger = messenger
         self.account = Account(messenger)
@@ -231,6 +300,14 @@ class AdvancedTrade(AbstractClient):
         instance = cls(self.messenger)
         setattr(self, name, instance)
 
+    def gather(self, calls: Iterable[Callable[[], Any]]) -> list:
+        return self.messenger.gather(calls)
+
+    def completed(
+        self, calls: Iterable[Callable[[], Any]]
+    ) -> Iterator[tuple[int, Any]]:
+        return self.messenger.completed(calls)
+
 
 def get_trade(settings: dict = None) -> AdvancedTrade:
-    return AdvancedTrade(Messenger(Auth(API(settings))))
+    return AdvancedTrade(AdvancedMessenger(Auth(AdvancedAPI(settings))))
@@ -0,0 +1,82 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from coinbase import advanced
+
+from coinbase.aio.messenger import AsyncAdvancedMessenger
+from coinbase.aio.messenger import AsyncMessenger
+from coinbase.aio.messenger import gather
+from coinbase.aio.subscriber import asynchronous
+from coinbase.api import AdvancedAPI
+from coinbase.messenger import Auth
+
+Account = asynchronous(advanced.Account, __name__)
+Coinbase = asynchronous(advanced.Coinbase, __name__)
+Convert = asynchronous(advanced.Convert, __name__)
+Currency = asynchronous(advanced.Currency, __name__)
+Transfer = asynchronous(advanced.Transfer, __name__)
+Fee = asynchronous(advanced.Fee, __name__)
+Order = asynchronous(advanced.Order, __name__)
+Oracle = asynchronous(advanced.Oracle, __name__)
+Product = asynchronous(advanced.Product, __name__)
+Profile = asynchronous(advanced.Profile, __name__)
+Report = asynchronous(advanced.Report, __name__)
+User = asynchronous(advanced.User, __name__)
+Time = asynchronous(advanced.Time, __name__)
+
+
+class AsyncAdvancedTrade:
+    def __init__(self, messenger: AsyncMessenger):
+        self.messenger = messenger
+        self.account = Account(messenger)
+        self.coinbase = Coinbase(messenger)
+        self.convert = Convert(messenger)
+        self.currency = Currency(messenger)
+        self.transfer = Transfer(messenger)
+        self.fee = Fee(messenger)
+        self.order = Order(messenger)
+        self.oracle = Oracle(messenger)
+        self.product = Product(messenger)
+        self.profile = Profile(messenger)
+        self.report = Report(messenger)
+        self.user = User(messenger)
+        self.time = Time(messenger)
+
+    def __repr__(self) -> str:
+        return f"AsyncAdvancedTrade(name={self.name}, key={self.key})"
+
+    def __str__(self) -> str:
+        return " ".join(word.capitalize() for word in self.name.split("_"))
+
+    @property
+    def key(self) -> str:
+        return self.messenger.auth.api.key
+
+    @property
+    def name(self):
+        return "coinbase_pro"
+
+    def plug(self, cls: object, name: str):
+        instance = cls(self.messenger)
+        setattr(self, name, instance)
+
+    async def gather(self, *calls, limit: int = None) -> list:
+        return await gather(*calls, limit=limit)
+
+
+def get_async_trade(settings: dict = None) -> AsyncAdvancedTrade:
+    return AsyncAdvancedTrade(
+        AsyncAdvancedMessenger(Auth(AdvancedAPI(settings)))
+    )
@@ -0,0 +1,423 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import asyncio
+
+from time import time
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Generator
+
+import httpx
+
+from coinbase.api import API
+from coinbase.api import AdvancedAPI
+
+from coinbase.auth import Auth
+
+from coinbase.limiter import FileLimiter
+from coinbase.limiter import Limiter
+from coinbase.limiter import get_limiter
+
+from coinbase.messenger import next_advanced_page
+from coinbase.messenger import next_page
+from coinbase.messenger import page_size
+
+from coinbase.retry import Retry
+
+from coinbase.route import Route
+
+
+class AsyncAuth(httpx.Auth):
+    """Sign httpx requests with the same headers as the Auth class.
+
+    :param auth: (optional) authentication instance whose keys sign the request.
+    """
+
+    def __init__(self, auth: Auth = None):
+        self.__auth: Auth = auth if auth else Auth()
+
+    @property
+    def auth(self) -> Auth:
+        """Return the authentication instance.
+
+        :return: authentication instance
+        """
+        return self.__auth
+
+    def auth_flow(
+        self, request: httpx.Request
+    ) -> Generator[httpx.Request, httpx.Response, None]:
+        """Yield the request with updated headers.
+
+        :param request: An httpx request.
+        :return: The same request with updated headers.
+        """
+        timestamp: str = str(int(time()))
+        signature: str = self.auth.sign(
+            timestamp.encode("ascii"),
+            request.method.upper().encode("ascii"),
+            request.url.raw_path,
+            request.content,
+        )
+        request.headers.update(self.auth.signed(timestamp, signature))
+        yield request
+
+
+def get_async_retries() -> dict[str, Retry]:
+    """Return the default retry policy for each HTTP method.
+
+    Mirrors `coinbase.retry.get_retries` using httpx exception types.
+
+    :return: Dictionary of Retry objects keyed by HTTP method.
+    """
+    idempotent: Retry = Retry(errors=(httpx.TransportError,))
+    return {
+        "GET": idempotent,
+        "PUT": idempotent,
+        "DELETE": idempotent,
+        "POST": Retry(statuses=(429,), errors=(httpx.ConnectError,)),
+    }
+
+
+class AsyncMessenger:
+    """Class to manage asynchronous HTTP request/response with authentication.
+
+    :param auth: (optional) authentication instance to pass to this class
+    :param limiter: (optional) rate limiter shared with other messengers. Defaults to the limiter registered for the API key.
+    :param retries: (optional) retry policy for each HTTP method. Defaults to `get_async_retries()`.
+    """
+
+    def __init__(
+        self,
+        auth: Auth = None,
+        limiter: Limiter = None,
+        retries: dict[str, Retry] = None,
+    ):
+        self.__auth: Auth = auth if auth else Auth()
+        self.__client: httpx.AsyncClient = httpx.AsyncClient(
+            auth=AsyncAuth(self.__auth)
+        )
+        self.__limiter: Limiter = (
+            limiter if limiter else get_limiter(self.__auth.api.key)
+        )
+        self.__retries: dict[str, Retry] = (
+            retries if retries is not None else get_async_retries()
+        )
+        self.__routes: dict[tuple[str, str], Route] = {}
+
+    async def __aenter__(self) -> "AsyncMessenger":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    @property
+    def auth(self) -> Auth:
+        """Return the authentication instance.
+
+        :return: authentication instance
+        """
+        return self.__auth
+
+    @property
+    def api(self) -> API:
+        """Return the API instance from the authentication instance.
+
+        :return: API instance
+        """
+        return self.__auth.api
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the httpx client instance.
+
+        :return: httpx client instance
+        """
+        return self.__client
+
+    @property
+    def limiter(self) -> Limiter:
+        """Return the rate limiter instance.
+
+        :return: rate limiter instance
+        """
+        return self.__limiter
+
+    @property
+    def retries(self) -> dict[str, Retry]:
+        """Return the retry policy for each HTTP method.
+
+        :return: Dictionary of Retry objects keyed by HTTP method.
+        """
+        return self.__retries
+
+    @property
+    def timeout(self) -> int:
+        """Return the timeout value for HTTP request.
+
+        :return: timeout value in seconds
+        """
+        return 30
+
+    def limit(self, path: str) -> int:
+        """Return the largest page size accepted by an endpoint.
+
+        :param path: The API endpoint to be requested.
+        :return: page size, see `page_size`
+        """
+        return page_size(self.api, path)
+
+    def cursor(self, payload: dict) -> dict:
+        """Return the query parameters of the page that follows a payload.
+
+        :param payload: A decoded page returned by the API.
+        :return: Parameters for the next request, or None on the last page.
+        """
+        return next_page(payload)
+
+    async def reserve(self) -> float:
+        """Reserve a request from the rate limiter.
+
+        A `FileLimiter` locks a file shared with other processes, so it is
+        consulted on a worker thread instead of blocking the event loop.
+
+        :return: seconds to wait before sending the request
+        """
+        if isinstance(self.limiter, FileLimiter):
+            return await asyncio.to_thread(self.limiter.reserve)
+        return self.limiter.reserve()
+
+    async def penalize(self, seconds: float) -> None:
+        """Hold back every request sharing the rate limiter.
+
+        :param seconds: how long the limiter stays empty
+        :return: None
+        """
+        if isinstance(self.limiter, FileLimiter):
+            await asyncio.to_thread(self.limiter.penalize, seconds)
+        else:
+            self.limiter.penalize(seconds)
+
+    async def request(
+        self, method: str, path: str, url: str = None, **kwargs
+    ) -> httpx.Response:
+        """Perform a rate limited request, retrying it as the policy allows.
+
+        Waiting on the limiter suspends only the calling task.
+
+        :param method: The HTTP method of the request.
+        :param path: The API endpoint to be requested.
+        :param url: (optional) the prebuilt URL of the path, see `call`.
+        :param kwargs: Additional arguments passed on to the client.
+        :return: The last response received.
+        """
+        url = url if url else self.api.url(path)
+        retry: Retry = self.retries.get(method.upper(), Retry(total=0))
+        attempt: int = 0
+        while True:
+            delay: float = await self.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            try:
+                response: httpx.Response = await self.client.request(
+                    method,
+                    url,
+                    timeout=self.timeout,
+                    **kwargs,
+                )
+            except retry.errors:
+                if attempt >= retry.total:
+                    raise
+                await asyncio.sleep(retry.delay(attempt))
+                attempt += 1
+                continue
+            if not retry.retryable(response) or attempt >= retry.total:
+                return response
+            delay = retry.delay(attempt, response)
+            if 429 == response.status_code:
+                await self.penalize(delay)
+            else:
+                await asyncio.sleep(delay)
+            attempt += 1
+
+    async def get(self, path: str, data: dict = None) -> httpx.Response:
+        """Perform a GET request to the specified API path.
+
+        :param path: The API endpoint to be requested.
+        :param data: (optional) Query parameters to be passed with the request.
+        :return: The response of the GET request.
+        """
+        return await self.request("GET", path, params=data)
+
+    async def post(self, path: str, data: dict = None) -> httpx.Response:
+        """Perform a POST request to the specified API path.
+
+        :param path: The API endpoint to be requested.
+        :param data: (optional) JSON payload to be sent with the request.
+        :return: The response of the POST request.
+        """
+        return await self.request("POST", path, json=data)
+
+    async def put(self, path: str, data: dict = None) -> httpx.Response:
+        """Perform a PUT request to the specified API path.
+
+        :param path: The API endpoint to be requested.
+        :param data: (optional) JSON payload to be sent with the request.
+        :return: The response of the PUT request.
+        """
+        return await self.request("PUT", path, json=data)
+
+    async def delete(self, path: str, data: dict = None) -> httpx.Response:
+        """Perform a DELETE request to the specified API path.
+
+        :param path: The API endpoint to be requested.
+        :param data: (optional) JSON payload to be sent with the request.
+        :return: The response of the DELETE request.
+        """
+        return await self.request("DELETE", path, json=data)
+
+    def route(self, method: str, template: str) -> Route:
+        """Return the compiled route of an endpoint template.
+
+        Routes are compiled on first use and reused afterwards.
+
+        :param method: The HTTP method of the route.
+        :param template: The endpoint, e.g. "/orders/{order_id}".
+        :return: The compiled route.
+        """
+        key: tuple[str, str] = (method.upper(), template)
+        route: Route = self.__routes.get(key)
+        if route is None:
+            route = self.__routes[key] = Route(self.api, method, template)
+        return route
+
+    async def call(
+        self, route: Route, data: dict = None, **values
+    ) -> httpx.Response:
+        """Send a request through a compiled route.
+
+        GET data is sent as query parameters, other data as a JSON body.
+
+        :param route: A route returned by `route`.
+        :param data: (optional) query parameters or JSON payload.
+        :param values: The value of every variable in the route template.
+        :return: The response of the request.
+        """
+        path: str = route.path(**values)
+        if "GET" == route.method:
+            return await self.request(
+                route.method, path, route.url(path), params=data
+            )
+        return await self.request(
+            route.method, path, route.url(path), json=data
+        )
+
+    async def page(
+        self, path: str, data: dict = None
+    ) -> AsyncIterator[httpx.Response]:
+        """Iterate over paginated responses from the API with `async for`.
+
+        A failed page is yielded as is and ends the iteration.
+
+        :param path: The API endpoint to send the request to.
+        :param data: Data to include in the request query parameters.
+        :return: An asynchronous iterator of Response objects.
+        """
+        data = dict(data) if data else {}
+        data.setdefault("limit", self.limit(path))
+        while True:
+            response: httpx.Response = await self.get(path, data)
+            if 200 != response.status_code:
+                yield response
+                return
+            payload: dict = response.json()
+            if not payload:
+                return
+            following: dict = self.cursor(payload)
+            yield response
+            if not following or all(
+                data.get(key) == value for key, value in following.items()
+            ):
+                return
+            data.update(following)
+
+    async def close(self) -> None:
+        """Close the underlying client object.
+
+        :return: None
+        """
+        await self.client.aclose()
+
+
+class AsyncAdvancedMessenger(AsyncMessenger):
+    """Class for making asynchronous API requests. Inherits from the AsyncMessenger class.
+
+    :param AsyncMessenger: Base class for making API requests.
+    """
+
+    def cursor(self, payload: dict) -> dict:
+        """Return the query parameters of the page that follows a payload.
+
+        :param payload: A decoded page returned by the API.
+        :return: Parameters for the next request, or None on the last page.
+        """
+        return next_advanced_page(payload)
+
+
+async def gather(*calls: Awaitable, limit: int = None) -> list:
+    """Run many API calls concurrently and return their results in order.
+
+    Every call still passes through its messenger's rate limiter, so the
+    calls share the API key's budget; `limit` additionally bounds how many
+    are in flight at once.
+
+    :param calls: Awaitables such as `wallet.price.spot("BTC-USD")`.
+    :param limit: (optional) maximum number of concurrent calls.
+    :return: A list of results in the order the calls were given.
+    """
+    if not limit:
+        return await asyncio.gather(*calls)
+    semaphore: asyncio.Semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(call: Awaitable):
+        async with semaphore:
+            return await call
+
+    return await asyncio.gather(*(bounded(call) for call in calls))
+
+
+def get_async_messenger(
+    settings: dict, limiter: Limiter = None
+) -> AsyncMessenger:
+    """Create and return an AsyncMessenger object.
+
+    :param settings: Dictionary containing API authentication and connection settings.
+    :param limiter: (optional) rate limiter to share with other messengers.
+    :return: AsyncMessenger object.
+    """
+    return AsyncMessenger(Auth(API(settings)), limiter)
+
+
+def get_async_advanced_messenger(
+    settings: dict, limiter: Limiter = None
+) -> AsyncAdvancedMessenger:
+    """Create and return an AsyncAdvancedMessenger object.
+
+    :param settings: Dictionary containing API authentication and connection settings.
+    :param limiter: (optional) rate limiter to share with other messengers.
+    :return: AsyncAdvancedMessenger object.
+    """
+    return AsyncAdvancedMessenger(Auth(AdvancedAPI(settings)), limiter)
@@ -0,0 +1,203 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from functools import wraps
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+
+from requests import HTTPError
+
+from coinbase.aio.messenger import AsyncMessenger
+
+from coinbase.messenger import Subscriber
+
+from coinbase.model import Record
+
+from coinbase.route import Route
+
+
+class Request:
+    """A request made by a synchronous subscriber method.
+
+    :param method: The messenger method, "page" for a paginated listing or "call" for a compiled route.
+    :param path: The API endpoint, or the route of a "call".
+    :param data: (optional) Query parameters or JSON payload.
+    :param options: (optional) the listing's `key`, `until` and `model`, or the route's values.
+    """
+
+    __slots__ = ("method", "path", "data", "options")
+
+    def __init__(
+        self, method: str, path: Any, data: dict = None, options: dict = None
+    ):
+        self.method: str = method
+        self.path: Any = path
+        self.data: dict = data
+        self.options: dict = options or {}
+
+    async def send(self, messenger: AsyncMessenger) -> Any:
+        """Send the request with an asynchronous messenger.
+
+        :param messenger: AsyncMessenger object used to make API requests.
+        :return: The response, or every item of a listing.
+        """
+        if "call" == self.method:
+            return await messenger.call(self.path, self.data, **self.options)
+        if "page" != self.method:
+            send = getattr(messenger, self.method)
+            return await send(self.path, self.data)
+        return await self.collect(messenger)
+
+    async def collect(self, messenger: AsyncMessenger) -> list:
+        """Collect the items of a listing, see `Messenger.iter_items`.
+
+        :param messenger: AsyncMessenger object used to make API requests.
+        :return: Every item of the listing.
+        :raises HTTPError: if a page fails.
+        """
+        key: str = self.options.get("key", "data")
+        until: Callable[[dict], bool] = self.options.get("until")
+        model: type[Record] = self.options.get("model")
+        items: list = []
+        pages = messenger.page(self.path, self.data)
+        try:
+            async for page in pages:
+                if 200 != page.status_code:
+                    raise HTTPError(
+                        f"{page.status_code} Error for {self.path}",
+                        response=page,
+                    )
+                for item in page.json()[key]:
+                    if until and until(item):
+                        return items
+                    items.append(model.from_dict(item) if model else item)
+        finally:
+            await pages.aclose()
+        return items
+
+
+class Pending(Exception):
+    """Raised by a `Replay` for a request it has no response for yet.
+
+    :param request: The request to send.
+    """
+
+    def __init__(self, request: Request):
+        super().__init__(request.method, request.path)
+        self.request: Request = request
+
+
+class Replay:
+    """Stand-in messenger that answers requests from a list of results.
+
+    Requests are answered in the order they are made. The first request
+    without a result raises `Pending`, so a synchronous method can be run
+    again once that request was sent.
+
+    :param messenger: AsyncMessenger object whose routes are used.
+    :param results: The responses received so far, in request order.
+    """
+
+    def __init__(self, messenger: AsyncMessenger, results: list):
+        self.__messenger: AsyncMessenger = messenger
+        self.__results: list = results
+        self.__index: int = 0
+
+    def answer(self, request: Request) -> Any:
+        """Return the result of the next request.
+
+        :param request: The request made by the synchronous method.
+        :return: Its response, or every item of a listing.
+        :raises Pending: if the request was not sent yet.
+        """
+        if self.__index == len(self.__results):
+            raise Pending(request)
+        self.__index += 1
+        return self.__results[self.__index - 1]
+
+    def get(self, path: str, data: dict = None) -> Any:
+        return self.answer(Request("get", path, data))
+
+    def post(self, path: str, data: dict = None) -> Any:
+        return self.answer(Request("post", path, data))
+
+    def put(self, path: str, data: dict = None) -> Any:
+        return self.answer(Request("put", path, data))
+
+    def delete(self, path: str, data: dict = None) -> Any:
+        return self.answer(Request("delete", path, data))
+
+    def iter_items(
+        self,
+        path: str,
+        data: dict = None,
+        key: str = "data",
+        prefetch: int = 0,
+        until: Callable[[dict], bool] = None,
+        model: type[Record] = None,
+    ) -> list:
+        options: dict = {"key": key, "until": until, "model": model}
+        return self.answer(Request("page", path, data, options))
+
+    def route(self, method: str, template: str) -> Route:
+        return self.__messenger.route(method, template)
+
+    def call(self, route: Route, data: dict = None, **values) -> Any:
+        return self.answer(Request("call", route, data, values))
+
+
+def coroutine(cls: type, method: Callable) -> Callable[..., Awaitable]:
+    """Return a coroutine method running a synchronous subscriber method.
+
+    The method runs against a `Replay` of the responses received so far.
+    Each request it has no response for yet is sent with the subscriber's
+    AsyncMessenger and the method runs again, until it returns.
+
+    :param cls: The synchronous subscriber class.
+    :param method: The synchronous method, whose name and docstring are kept.
+    :return: An unbound coroutine method for an async subscriber.
+    """
+
+    @wraps(method)
+    async def call(self, *args, **kwargs) -> Any:
+        results: list = []
+        while True:
+            replay: Replay = Replay(self.messenger, results)
+            try:
+                return method(cls(replay), *args, **kwargs)
+            except Pending as pending:
+                results.append(await pending.request.send(self.messenger))
+
+    return call
+
+
+def asynchronous(cls: type, module: str) -> type:
+    """Build an asynchronous subscriber from a synchronous one.
+
+    Every public method defined by `cls` becomes a coroutine, so the sync
+    and async clients share one definition of each route, its parameters
+    and how the response is decoded. Lazy listings such as `iter` collect
+    every item and return a list.
+
+    :param cls: The synchronous subscriber class.
+    :param module: The name of the module defining the async subscriber.
+    :return: A Subscriber class with the same name and methods.
+    """
+    namespace: dict = {"__doc__": cls.__doc__, "__module__": module}
+    for name, method in vars(cls).items():
+        if callable(method) and not name.startswith("_"):
+            namespace[name] = coroutine(cls, method)
+    return type(cls.__name__, (Subscriber,), namespace)
@@ -0,0 +1,123 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from coinbase import wallet
+
+from coinbase.api import API
+
+from coinbase.auth import Auth
+
+from coinbase.aio.messenger import AsyncMessenger
+from coinbase.aio.messenger import gather
+
+from coinbase.aio.subscriber import asynchronous
+
+User = asynchronous(wallet.User, __name__)
+Account = asynchronous(wallet.Account, __name__)
+Address = asynchronous(wallet.Address, __name__)
+Transaction = asynchronous(wallet.Transaction, __name__)
+Buy = asynchronous(wallet.Buy, __name__)
+Sell = asynchronous(wallet.Sell, __name__)
+Deposit = asynchronous(wallet.Deposit, __name__)
+Withdraw = asynchronous(wallet.Withdraw, __name__)
+Payment = asynchronous(wallet.Payment, __name__)
+Currency = asynchronous(wallet.Currency, __name__)
+Exchange = asynchronous(wallet.Exchange, __name__)
+Price = asynchronous(wallet.Price, __name__)
+Time = asynchronous(wallet.Time, __name__)
+
+
+class AsyncWallet:
+    """Class for handling asynchronous API requests for a coinbase wallet.
+
+    :param messenger: AsyncMessenger object for handling API requests.
+    """
+
+    def __init__(self, messenger: AsyncMessenger):
+        """Initialize the wallet with a messenger object.
+
+        :param messenger: AsyncMessenger object for handling API requests.
+        """
+        self.messenger = messenger
+        self.user = User(messenger)
+        self.account = Account(messenger)
+        self.address = Address(messenger)
+        self.transaction = Transaction(messenger)
+        self.buy = Buy(messenger)
+        self.sell = Sell(messenger)
+        self.deposit = Deposit(messenger)
+        self.withdraw = Withdraw(messenger)
+        self.payment = Payment(messenger)
+        self.currency = Currency(messenger)
+        self.exchange = Exchange(messenger)
+        self.price = Price(messenger)
+        self.time = Time(messenger)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the wallet object.
+
+        :return: String representation of the wallet object.
+        """
+        return f"AsyncWallet(name={self.name}, key={self.key})"
+
+    def __str__(self) -> str:
+        """Return the capitalized name of the wallet.
+
+        :return: Capitalized name of the wallet.
+        """
+        return self.name.capitalize()
+
+    @property
+    def key(self) -> str:
+        """Return the API key for the wallet.
+
+        :return: API key for the wallet.
+        """
+        return self.messenger.auth.api.key
+
+    @property
+    def name(self):
+        """Return the name of the wallet.
+
+        :return: Name of the wallet.
+        """
+        return "coinbase"
+
+    def plug(self, cls: object, name: str):
+        """Add an object to the wallet for handling API requests.
+
+        :param cls: Class to be added to the wallet.
+        :param name: Name to give the object when added to the wallet.
+        """
+        instance = cls(self.messenger)
+        setattr(self, name, instance)
+
+    async def gather(self, *calls, limit: int = None) -> list:
+        """Run many wallet calls concurrently and return their results in order.
+
+        :param calls: Awaitables such as `wallet.price.spot("BTC-USD")`.
+        :param limit: (optional) maximum number of concurrent calls.
+        :return: A list of results in the order the calls were given.
+        """
+        return await gather(*calls, limit=limit)
+
+
+def get_async_wallet(settings: dict) -> AsyncWallet:
+    """Return an AsyncWallet object for handling API requests.
+
+    :param settings: Dictionary containing API settings.
+    :return: AsyncWallet object for handling API requests.
+    """
+    return AsyncWallet(AsyncMessenger(Auth(API(settings))))
@@ -41,6 +41,8 @@ class Auth(AuthBase):
         :param api: Instance of the API class, if not provided, a default instance is created.
         """
         self.__api: API = api if api else API()
+        self.__keyed: tuple[str, hmac.HMAC] = None
+        self.__static: tuple[str, dict] = None
 
     def __call__(self, request: PreparedRequest) -> PreparedRequest:
         """Return the prepared request with updated headers.
@@ -48,14 +50,10 @@ class Auth(AuthBase):
         :param request: A prepared HTTP request.
         :return: The same request with updated headers.
         """
-        timestamp: str = str(int(time()))
-        body: str = (
-            "" if request.body is None else request.body.decode("utf-8")
-        )
-        message: str = (
-            f"{timestamp}{request.method.upper()}{request.path_url}{body}"
-        )
-        header: dict = self.header(timestamp, message)
+        body: bytes = b"" if request.body is None else request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        header: dict = self.stamp(request.method, request.path_url, body)
         request.headers.update(header)
         return request
 
@@ -67,15 +65,76 @@ class Auth(AuthBase):
         """
         return self.__api
 
+    def stamp(self, method: str, path: str, body: bytes = b"") -> dict:
+        """Return the headers that sign a request made now.
+
+        The encoded body is signed as sent, without converting it to text.
+
+        :param method: The HTTP method of the request.
+        :param path: The versioned path of the request, including the query.
+        :param body: (optional) The encoded request body.
+        :return: The headers for an authenticated request.
+        """
+        timestamp: str = str(int(time()))
+        signature: str = self.sign(
+            timestamp.encode("ascii"),
+            method.upper().encode("ascii"),
+            path.encode("ascii"),
+            body,
+        )
+        return self.signed(timestamp, signature)
+
     def signature(self, message: str) -> str:
         """Return the signature of a message.
 
         :param message: The message to sign.
         :return: The signature of the message.
         """
-        key = self.api.secret.encode("ascii")
-        msg = message.encode("ascii")
-        return hmac.new(key, msg, hashlib.sha256).hexdigest()
+        return self.sign(message.encode("utf-8"))
+
+    def sign(self, *parts: bytes) -> str:
+        """Return the signature of a message given as consecutive parts.
+
+        The parts are fed to the HMAC one after another, so the message is
+        never joined into a single buffer.
+
+        :param parts: The parts of the message to sign.
+        :return: The signature of the message.
+        """
+        state: hmac.HMAC = self.keyed().copy()
+        for part in parts:
+            state.update(part)
+        return state.hexdigest()
+
+    def keyed(self) -> hmac.HMAC:
+        """Return the HMAC state keyed with the API secret.
+
+        The key schedule is computed once and copied for every message.
+        It is rebuilt if the secret changes.
+
+        :return: An HMAC object that has not been fed any message.
+        """
+        secret: str = self.api.secret
+        if self.__keyed is None or self.__keyed[0] != secret:
+            state = hmac.new(secret.encode("ascii"), digestmod=hashlib.sha256)
+            self.__keyed = (secret, state)
+        return self.__keyed[1]
+
+    def static(self) -> dict:
+        """Return the headers that are identical for every request.
+
+        :return: The headers that do not depend on the message.
+        """
+        key: str = self.api.key
+        if self.__static is None or self.__static[0] != key:
+            headers: dict = {
+                "User-Agent": f"{__agent__}/{__version__} {__source__}",
+                "CB-ACCESS-KEY": key,
+                "CB-VERSION": "2021-08-03",
+                "Content-Type": "application/json",
+            }
+            self.__static = (key, headers)
+        return self.__static[1]
 
     def header(self, timestamp: str, message: str) -> dict:
         """Return the headers for an authenticated request.
@@ -84,11 +143,17 @@ class Auth(AuthBase):
         :param message: The message to sign.
         :return: The headers for an authenticated request.
         """
+        return self.signed(timestamp, self.signature(message))
+
+    def signed(self, timestamp: str, signature: str) -> dict:
+        """Return the headers for a request that was already signed.
+
+        :param timestamp: The timestamp of the request.
+        :param signature: The signature of the request.
+        :return: The headers for an authenticated request.
+        """
         return {
-            "User-Agent": f"{__agent__}/{__version__} {__source__}",
-            "CB-ACCESS-KEY": self.api.key,
-            "CB-ACCESS-SIGN": self.signature(message),
+            **self.static(),
+            "CB-ACCESS-SIGN": signature,
             "CB-ACCESS-TIMESTAMP": timestamp,
-            "CB-VERSION": "2021-08-03",
-            "Content-Type": "application/json",
         }
@@ -0,0 +1,261 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import json
+
+from collections import OrderedDict
+
+from threading import Lock
+
+from typing import Any
+
+from time import monotonic
+
+from requests import Response
+
+
+def get_cache_routes() -> dict[str, float]:
+    """Return the default time to live, in seconds, of cacheable routes.
+
+    Only slow changing reference data is cached. A `*` matches exactly one
+    path segment. Routes with a time to live of zero are never served from
+    memory, but are revalidated with conditional requests when the server
+    provides an `ETag` or `Last-Modified` header.
+
+    :return: Dictionary of time to live values keyed by route pattern.
+    """
+    return {
+        "/accounts": 0,
+        "/accounts/*": 0,
+        "/currencies": 3600,
+        "/currencies/*": 3600,
+        "/exchange-rates": 60,
+        "/payment-methods": 300,
+        "/payment-methods/*": 300,
+        "/products": 60,
+        "/products/*": 60,
+        "/fees": 300,
+    }
+
+
+def validators(response: Response) -> dict[str, str]:
+    """Return the conditional request headers that revalidate a response.
+
+    :param response: A cached Response object.
+    :return: `If-None-Match` and `If-Modified-Since` headers, if available.
+    """
+    headers: dict[str, str] = {}
+    if response.headers.get("ETag"):
+        headers["If-None-Match"] = response.headers["ETag"]
+    if response.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = response.headers["Last-Modified"]
+    return headers
+
+
+def freeze(
+    response: Response, errors: tuple[type, ...] = (ValueError,)
+) -> Response:
+    """Decode a response body once and reuse the payload on every `json()`.
+
+    A body that can not be decoded is left alone, so the caller that reads
+    it gets the error rather than the code sharing the response.
+
+    :param response: The Response object to cache.
+    :param errors: (optional) exception types raised for an invalid body, see `Codec.errors`.
+    :return: The same Response object.
+    """
+    try:
+        payload: Any = response.json()
+    except errors:
+        return response
+    response.json = lambda **kwargs: payload
+    return response
+
+
+def match(pattern: str, path: str) -> bool:
+    """Check if a path matches a route pattern segment by segment.
+
+    :param pattern: A route such as "/products/*".
+    :param path: A path such as "/products/BTC-USD".
+    :return: True if every segment matches, False otherwise.
+    """
+    expected: list[str] = pattern.strip("/").split("/")
+    actual: list[str] = path.strip("/").split("/")
+    if len(expected) != len(actual):
+        return False
+    return all(e in ("*", a) for e, a in zip(expected, actual))
+
+
+class Cache:
+    """A thread-safe response cache with per-route TTLs and LRU eviction.
+
+    Cached responses are shared between callers and must be treated as
+    read-only, including the payload returned by their `json()` method,
+    which is decoded only once.
+
+    Expired responses that carry validators are kept until they are
+    evicted, so they can be revalidated with a conditional request and
+    reused when the server answers 304 Not Modified.
+
+    :param routes: (optional) time to live in seconds keyed by route pattern. Defaults to `get_cache_routes()`.
+    :param maxsize: (optional) maximum number of cached responses.
+    """
+
+    def __init__(self, routes: dict[str, float] = None, maxsize: int = 256):
+        self.__routes: dict[str, float] = (
+            routes if routes is not None else get_cache_routes()
+        )
+        self.__maxsize: int = maxsize
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock: Lock = Lock()
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__revalidated: int = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def routes(self) -> dict[str, float]:
+        """Return the time to live of each cacheable route.
+
+        :return: Dictionary of time to live values keyed by route pattern.
+        """
+        return self.__routes
+
+    @property
+    def stats(self) -> dict:
+        """Return the number of cache hits, misses, revalidations and entries.
+
+        :return: A dictionary of cache statistics.
+        """
+        with self.__lock:
+            return {
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "revalidated": self.__revalidated,
+                "entries": len(self.__entries),
+            }
+
+    def ttl(self, path: str) -> float:
+        """Return the time to live of a path.
+
+        :param path: The API endpoint as passed to the messenger.
+        :return: time to live in seconds, or None if the path is not cached
+        """
+        for pattern, ttl in self.__routes.items():
+            if match(pattern, path):
+                return ttl
+        return None
+
+    @staticmethod
+    def key(path: str, data: dict = None, scope: tuple = ()) -> tuple:
+        """Return the cache key of a request.
+
+        Messengers sharing a cache must scope their keys, since the same
+        path returns another payload for another API key or version.
+
+        :param path: The API endpoint as passed to the messenger.
+        :param data: (optional) the query parameters of the request.
+        :param scope: (optional) whatever else selects the response, e.g. the API key and URL.
+        :return: A hashable key.
+        """
+        return path, json.dumps(data, sort_keys=True, default=str), scope
+
+    def get(self, key: tuple) -> Response:
+        """Return a cached response if it has not expired.
+
+        :param key: The cache key of the request.
+        :return: The cached response, or None.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] <= monotonic():
+                if entry is not None and not validators(entry[1]):
+                    del self.__entries[key]
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[1]
+
+    def stale(self, key: tuple) -> Response:
+        """Return a cached response that can be revalidated, even if expired.
+
+        :param key: The cache key of the request.
+        :return: The cached response with validators, or None.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+        if entry is None or not validators(entry[1]):
+            return None
+        return entry[1]
+
+    def revalidate(self, key: tuple, ttl: float) -> Response:
+        """Renew a stale response after the server answered 304.
+
+        :param key: The cache key of the request.
+        :param ttl: The time to live in seconds.
+        :return: The renewed response, or None if it was evicted meanwhile.
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            self.__entries[key] = (monotonic() + ttl, entry[1])
+            self.__entries.move_to_end(key)
+            self.__revalidated += 1
+            return entry[1]
+
+    def set(
+        self,
+        key: tuple,
+        response: Response,
+        ttl: float,
+        errors: tuple[type, ...] = (ValueError,),
+    ) -> None:
+        """Cache a response, evicting the least recently used one if full.
+
+        A response that can neither be served nor revalidated is skipped.
+
+        :param key: The cache key of the request.
+        :param response: The response to cache.
+        :param ttl: The time to live in seconds.
+        :param errors: (optional) exception types raised for an invalid body, see `Codec.errors`.
+        """
+        if ttl <= 0 and not validators(response):
+            return
+        freeze(response, errors)
+        with self.__lock:
+            self.__entries[key] = (monotonic() + ttl, response)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__maxsize:
+                self.__entries.popitem(last=False)
+
+    def invalidate(self, pattern: str = None) -> int:
+        """Remove cached responses so the next request refetches them.
+
+        :param pattern: (optional) a route pattern. Removes every entry if omitted.
+        :return: The number of entries removed.
+        """
+        with self.__lock:
+            keys: list[tuple] = [
+                key
+                for key in self.__entries
+                if pattern is None or match(pattern, key[0])
+            ]
+            for key in keys:
+                del self.__entries[key]
+            return len(keys)
@@ -0,0 +1,126 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import json
+
+from typing import Any
+from typing import Callable
+
+from requests import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None
+
+
+class Codec:
+    """Encode and decode JSON bodies with a pluggable implementation.
+
+    :param dumps: (optional) function serializing an object to str or bytes. Defaults to `json.dumps`.
+    :param loads: (optional) function deserializing str or bytes. Defaults to `json.loads`.
+    :param name: (optional) name of the implementation.
+    :param errors: (optional) exception types `loads` raises for an invalid body. Defaults to `ValueError`.
+    """
+
+    def __init__(
+        self,
+        dumps: Callable[[Any], Any] = None,
+        loads: Callable[[Any], Any] = None,
+        name: str = "json",
+        errors: tuple[type, ...] = (ValueError,),
+    ):
+        self.__dumps: Callable[[Any], Any] = dumps if dumps else json.dumps
+        self.__loads: Callable[[Any], Any] = loads if loads else json.loads
+        self.__name: str = name
+        self.__errors: tuple[type, ...] = errors
+
+    @property
+    def name(self) -> str:
+        """Return the name of the implementation.
+
+        :return: codec name
+        """
+        return self.__name
+
+    @property
+    def errors(self) -> tuple[type, ...]:
+        """Return the exception types raised when a body can not be decoded.
+
+        :return: decode error types
+        """
+        return self.__errors
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize a value to a UTF-8 encoded JSON body.
+
+        :param value: The object to serialize.
+        :return: The JSON body.
+        """
+        body: Any = self.__dumps(value)
+        return body if isinstance(body, bytes) else body.encode("utf-8")
+
+    def decode(self, body: Any) -> Any:
+        """Deserialize a JSON body.
+
+        :param body: The JSON body as str or bytes.
+        :return: The decoded object.
+        """
+        return self.__loads(body)
+
+    def bind(self, response: Response) -> Response:
+        """Make `response.json()` decode with this codec, at most once.
+
+        :param response: Response object returned from an API request.
+        :return: The same Response object.
+        """
+        decoded: list = []
+
+        def payload(**kwargs) -> Any:
+            if not decoded:
+                decoded.append(self.decode(response.content))
+            return decoded[0]
+
+        response.json = payload
+        return response
+
+
+def get_codec(name: str = None) -> Codec:
+    """Create and return a Codec object.
+
+    :param name: (optional) one of "json", "orjson" or "msgspec". Defaults to the fastest one installed.
+    :return: Codec object.
+    :raises ValueError: if the codec is unknown or not installed.
+    """
+    if name is None:
+        name = "orjson" if orjson else "msgspec" if msgspec else "json"
+    if "json" == name:
+        return Codec()
+    if "orjson" == name and orjson:
+        return Codec(orjson.dumps, orjson.loads, name)
+    if "msgspec" == name and msgspec:
+        # msgspec errors are not ValueErrors
+        return Codec(
+            msgspec.json.encode,
+            msgspec.json.decode,
+            name,
+            (msgspec.DecodeError,),
+        )
+    raise ValueError(f"JSON codec '{name}' is not available")
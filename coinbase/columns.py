@@ -0,0 +1,165 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from itertools import islice
+
+from typing import Any
+from typing import Iterable
+
+from coinbase.model import Amount
+from coinbase.model import Record
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+def get_schema(model: type[Record]) -> dict[str, str]:
+    """Return the column kind of every field of a record model.
+
+    Amounts become float64, timestamps int64 nanoseconds since the epoch,
+    interned enum-like strings categorical codes and anything else an
+    object column.
+
+    :param model: A Record subclass, e.g. `TransactionRecord`.
+    :return: Dictionary of column kinds keyed by field name.
+    """
+    schema: dict[str, str] = {}
+    for name in model.paths:
+        if isinstance(model.__dict__.get(name), Amount):
+            schema[name] = "amount"
+        elif "start" == name:
+            schema[name] = "epoch"
+        elif name.endswith(("_at", "_time")):
+            schema[name] = "time"
+        elif name in model.interned:
+            schema[name] = "category"
+        else:
+            schema[name] = "object"
+    return schema
+
+
+class Columns(dict):
+    """Columnar arrays keyed by field name.
+
+    Categorical columns hold integer codes into `categories[name]`.
+    """
+
+    def __init__(self, arrays: dict, categories: dict[str, list[str]]):
+        super().__init__(arrays)
+        self.categories: dict[str, list[str]] = categories
+
+    @property
+    def rows(self) -> int:
+        """Return the number of rows.
+
+        :return: length of every column
+        """
+        return len(next(iter(self.values()))) if self else 0
+
+    def decode(self, name: str) -> Any:
+        """Return a categorical column as an array of its strings.
+
+        :param name: The name of a categorical column.
+        :return: An object array of category values.
+        """
+        return numpy.array(self.categories[name], dtype=object)[self[name]]
+
+    def to_records(self) -> Any:
+        """Return the columns as a NumPy structured array.
+
+        :return: A structured array with one field per column.
+        """
+        return numpy.rec.fromarrays(list(self.values()), names=list(self))
+
+
+def _convert(kind: str, values: list, codes: dict) -> Any:
+    """Convert the values of one column of a chunk to an array.
+
+    :param kind: The column kind, see `get_schema`.
+    :param values: The raw values extracted from the chunk.
+    :param codes: The codes assigned so far to a categorical column.
+    :return: A NumPy array.
+    """
+    if "amount" == kind:
+        return numpy.array(
+            [value if value not in (None, "") else "nan" for value in values],
+            dtype=numpy.float64,
+        )
+    if "time" == kind:
+        # numpy parses naive ISO 8601, so drop the UTC designator
+        return numpy.array(
+            [
+                "NaT" if value is None else value.removesuffix("Z")
+                for value in values
+            ],
+            dtype="datetime64[ns]",
+        ).view(numpy.int64)
+    if "epoch" == kind:
+        return numpy.array(values, dtype=numpy.int64) * 1_000_000_000
+    if "category" == kind:
+        return numpy.array(
+            [codes.setdefault(value, len(codes)) for value in values],
+            dtype=numpy.int32,
+        )
+    return numpy.array(values, dtype=object)
+
+
+def to_columns(
+    items: Iterable[dict], model: type[Record], chunk: int = 1000
+) -> Columns:
+    """Build columnar NumPy arrays from a stream of API resources.
+
+    Items are consumed and converted `chunk` at a time, so a paginated
+    iterator such as `Messenger.iter_items` is never materialized as a
+    list of dictionaries.
+
+    :param items: An iterable of dictionaries returned by the API.
+    :param model: The Record subclass describing the fields to extract.
+    :param chunk: (optional) number of items converted at once.
+    :return: A Columns mapping of arrays keyed by field name.
+    :raises ImportError: if NumPy is not installed.
+    """
+    if numpy is None:
+        raise ImportError("to_columns requires numpy to be installed")
+    schema: dict[str, str] = get_schema(model)
+    codes: dict[str, dict] = {
+        name: {} for name, kind in schema.items() if "category" == kind
+    }
+    parts: dict[str, list] = {name: [] for name in schema}
+    items = iter(items)
+    while True:
+        batch: list[dict] = list(islice(items, chunk))
+        if not batch:
+            break
+        for name, kind in schema.items():
+            path: tuple[str, ...] = model.paths[name]
+            values: list = []
+            for item in batch:
+                value: Any = item
+                for key in path:
+                    value = value.get(key) if isinstance(value, dict) else None
+                values.append(value)
+            parts[name].append(_convert(kind, values, codes.get(name)))
+    arrays: dict = {
+        name: (
+            numpy.concatenate(parts[name])
+            if parts[name]
+            else _convert(kind, [], codes.get(name))
+        )
+        for name, kind in schema.items()
+    }
+    return Columns(arrays, {name: list(code) for name, code in codes.items()})
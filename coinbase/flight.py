@@ -0,0 +1,73 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from concurrent.futures import Future
+
+from threading import Lock
+
+from typing import Any
+from typing import Callable
+from typing import Hashable
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls into a single call.
+
+    The first caller for a key runs the call while every caller that
+    arrives before it finishes waits and receives the same result, or the
+    same exception. Once the call completes, the key is released and the
+    next caller starts a new call.
+    """
+
+    def __init__(self):
+        self.__lock: Lock = Lock()
+        self.__calls: dict[Hashable, Future] = {}
+        self.__shared: int = 0
+
+    @property
+    def shared(self) -> int:
+        """Return the number of callers that joined an in-flight call.
+
+        :return: number of coalesced calls
+        """
+        return self.__shared
+
+    def do(self, key: Hashable, call: Callable[[], Any]) -> Any:
+        """Run a call, or wait for the identical call already in flight.
+
+        :param key: Identifies calls that are interchangeable.
+        :param call: The function to run if no call is in flight for the key.
+        :return: The result of the call.
+        """
+        with self.__lock:
+            future: Future = self.__calls.get(key)
+            leader: bool = future is None
+            if leader:
+                future = self.__calls[key] = Future()
+            else:
+                self.__shared += 1
+        if not leader:
+            return future.result()
+        try:
+            result: Any = call()
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.__lock:
+                del self.__calls[key]
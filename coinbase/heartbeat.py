@@ -0,0 +1,123 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from threading import Event
+from threading import Thread
+
+from typing import Any
+
+from requests.exceptions import RequestException
+
+
+class Heartbeat:
+    """Keep a messenger's pooled connections warm while it is idle.
+
+    Servers and middleboxes close connections that stay idle, and the next
+    request then pays for DNS, TCP and TLS again. Every `interval` seconds
+    the heartbeat reopens the pooled connections that were closed and
+    sends a cheap probe, `/time` by default, over the most recently used
+    connection, which is the one the next request takes.
+
+    :param messenger: The Messenger whose connections are kept warm.
+    :param interval: (optional) seconds between beats.
+    :param path: (optional) the endpoint probed on each beat.
+    :param connections: (optional) the number of connections kept open. Defaults to the size of the pool.
+    """
+
+    def __init__(
+        self,
+        messenger: Any,
+        interval: float = 30.0,
+        path: str = "/time",
+        connections: int = None,
+    ):
+        self.__messenger: Any = messenger
+        self.__interval: float = interval
+        self.__path: str = path
+        self.__connections: int = connections
+        self.__stop: Event = Event()
+        self.__thread: Thread = None
+        self.__beats: int = 0
+        self.__failures: int = 0
+
+    @property
+    def interval(self) -> float:
+        """Return the number of seconds between beats.
+
+        :return: interval in seconds
+        """
+        return self.__interval
+
+    @property
+    def beats(self) -> int:
+        """Return the number of beats so far.
+
+        :return: number of beats
+        """
+        return self.__beats
+
+    @property
+    def failures(self) -> int:
+        """Return the number of probes that failed.
+
+        :return: number of failed probes
+        """
+        return self.__failures
+
+    @property
+    def alive(self) -> bool:
+        """Check if the heartbeat is running.
+
+        :return: True if the heartbeat thread is running, False otherwise.
+        """
+        return self.__thread is not None and self.__thread.is_alive()
+
+    def beat(self) -> None:
+        """Reopen closed connections and send a probe.
+
+        :return: None
+        """
+        self.__beats += 1
+        try:
+            self.__messenger.warm(self.__connections)
+            self.__messenger.get(self.__path)
+        except RequestException:
+            # the next beat or request reconnects
+            self.__failures += 1
+
+    def run(self) -> None:
+        while not self.__stop.wait(self.__interval):
+            self.beat()
+
+    def start(self) -> None:
+        """Start beating in a daemon thread.
+
+        :return: None
+        """
+        if self.alive:
+            return
+        self.__stop.clear()
+        self.__thread = Thread(target=self.run, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop beating and wait for the thread to finish.
+
+        :return: None
+        """
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
@@ -0,0 +1,242 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import hashlib
+import os
+import struct
+
+from contextlib import contextmanager
+
+from tempfile import gettempdir
+
+from threading import Lock
+
+from time import monotonic
+from time import sleep
+from time import time
+
+from typing import Iterator
+
+from coinbase import __burst__
+from coinbase import __limit__
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+class Limiter:
+    """A thread-safe token bucket used to pace API requests.
+
+    The bucket starts full and refills at `rate` tokens per second up to
+    `capacity` tokens. A request spends one token and only blocks once the
+    bucket has been drained.
+
+    :param rate: (optional) tokens added to the bucket per second.
+    :param capacity: (optional) maximum number of tokens held by the bucket.
+    """
+
+    clock = staticmethod(monotonic)
+
+    def __init__(self, rate: float = None, capacity: float = None):
+        self.__rate: float = rate if rate else 1 / __limit__
+        self.__capacity: float = capacity if capacity else __burst__
+        self.__state: list[float] = [self.__capacity, self.clock()]
+        self.__lock: Lock = Lock()
+
+    @property
+    def rate(self) -> float:
+        """Return the number of tokens added per second.
+
+        :return: refill rate in tokens per second
+        """
+        return self.__rate
+
+    @property
+    def capacity(self) -> float:
+        """Return the maximum number of tokens the bucket can hold.
+
+        :return: bucket capacity in tokens
+        """
+        return self.__capacity
+
+    @property
+    def budget(self) -> float:
+        """Return the number of tokens currently available.
+
+        A negative budget means callers are already queued waiting on tokens.
+
+        :return: available tokens
+        """
+        with self._bucket() as state:
+            self.__refill(state)
+            return state[0]
+
+    @contextmanager
+    def _bucket(self) -> Iterator[list[float]]:
+        """Hold the bucket lock and yield its mutable `[tokens, stamp]` state.
+
+        Subclasses override this to keep the state somewhere other than the
+        current process.
+
+        :return: the bucket state, written back when the context exits
+        """
+        with self.__lock:
+            yield self.__state
+
+    def __refill(self, state: list[float]) -> None:
+        now: float = self.clock()
+        elapsed: float = max(0.0, now - state[1])
+        state[0] = min(self.__capacity, state[0] + elapsed * self.__rate)
+        state[1] = now
+
+    def reserve(self, tokens: float = 1) -> float:
+        """Spend tokens from the bucket without blocking.
+
+        The bucket is allowed to go into debt so concurrent callers are
+        served in the order they reserved.
+
+        :param tokens: (optional) the number of tokens to spend.
+        :return: the number of seconds to wait before the tokens are usable.
+        """
+        with self._bucket() as state:
+            self.__refill(state)
+            state[0] -= tokens
+            if state[0] >= 0:
+                return 0.0
+            return -state[0] / self.__rate
+
+    def take(self, tokens: float = 1) -> float:
+        """Spend tokens from the bucket only if it holds them now.
+
+        Unlike `reserve`, the bucket never goes into debt, so a caller that
+        has to wait does not hold a place in line. Used by the `Scheduler`
+        to decide who is served next.
+
+        :param tokens: (optional) the number of tokens to spend.
+        :return: 0.0 if the tokens were spent, otherwise the number of seconds until they are available.
+        """
+        with self._bucket() as state:
+            self.__refill(state)
+            if state[0] >= tokens:
+                state[0] -= tokens
+                return 0.0
+            return (tokens - state[0]) / self.__rate
+
+    def penalize(self, seconds: float) -> None:
+        """Empty the bucket so no tokens are handed out for some time.
+
+        Used when the server reports that the rate limit was exceeded, so
+        every caller sharing the bucket backs off instead of only the one
+        that was rejected.
+
+        :param seconds: The number of seconds to hold back new requests.
+        """
+        with self._bucket() as state:
+            self.__refill(state)
+            state[0] = min(state[0], -seconds * self.__rate)
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Spend tokens from the bucket, blocking until they are available.
+
+        :param tokens: (optional) the number of tokens to spend.
+        :return: the number of seconds spent waiting.
+        """
+        delay: float = self.reserve(tokens)
+        if delay > 0:
+            sleep(delay)
+        return delay
+
+
+class FileLimiter(Limiter):
+    """A token bucket shared by every process on the host through a file.
+
+    The bucket state is stored in a small file guarded by an exclusive
+    `flock`, so all processes pointing at the same path draw from one
+    budget. Wall clock time is used because it is comparable between
+    processes.
+
+    :param path: Path of the file holding the bucket state.
+    :param rate: (optional) tokens added to the bucket per second.
+    :param capacity: (optional) maximum number of tokens held by the bucket.
+    """
+
+    clock = staticmethod(time)
+
+    def __init__(self, path: str, rate: float = None, capacity: float = None):
+        if fcntl is None:
+            raise OSError("FileLimiter requires fcntl file locking")
+        super().__init__(rate, capacity)
+        self.__path: str = path
+        self.__lock: Lock = Lock()
+        self.__format: struct.Struct = struct.Struct("<dd")
+
+    @property
+    def path(self) -> str:
+        """Return the path of the file holding the bucket state.
+
+        :return: path of the state file
+        """
+        return self.__path
+
+    @contextmanager
+    def _bucket(self) -> Iterator[list[float]]:
+        with self.__lock:
+            fd: int = os.open(self.__path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw: bytes = os.pread(fd, self.__format.size, 0)
+                if len(raw) == self.__format.size:
+                    state = list(self.__format.unpack(raw))
+                else:
+                    state = [self.capacity, self.clock()]
+                yield state
+                os.pwrite(fd, self.__format.pack(*state), 0)
+            finally:
+                os.close(fd)
+
+
+_limiters: dict[str, Limiter] = {}
+_file_limiters: dict[str, FileLimiter] = {}
+_limiters_lock: Lock = Lock()
+
+
+def get_limiter(key: str) -> Limiter:
+    """Return the Limiter shared by every messenger using the given API key.
+
+    :param key: The API key the rate limit applies to.
+    :return: Limiter object.
+    """
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = Limiter()
+        return _limiters[key]
+
+
+def get_file_limiter(key: str, path: str = None) -> FileLimiter:
+    """Return the FileLimiter shared by every process using the given API key.
+
+    :param key: The API key the rate limit applies to.
+    :param path: (optional) Path of the state file. Defaults to a file in the temporary directory derived from the key.
+    :return: FileLimiter object.
+    """
+    if not path:
+        digest: str = hashlib.sha256(str(key).encode("utf-8")).hexdigest()
+        path = os.path.join(gettempdir(), f"coinbase-{digest[:16]}.limit")
+    with _limiters_lock:
+        if path not in _file_limiters:
+            _file_limiters[path] = FileLimiter(path)
+        return _file_limiters[path]
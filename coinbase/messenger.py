@@ -13,13 +13,30 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+
+from contextlib import contextmanager
+
+from threading import Event
+from threading import Lock
+from threading import local
+
 from time import sleep
 
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
+from urllib.parse import urlencode
+
+from requests import HTTPError
 from requests import Response
 from requests import Session
 
 from coinbase import __agent__
-from coinbase import __limit__
 from coinbase import __source__
 from coinbase import __version__
 
@@ -28,16 +45,117 @@ from coinbase.api import AdvancedAPI
 
 from coinbase.auth import Auth
 
+from coinbase.cache import Cache
+from coinbase.cache import freeze
+from coinbase.cache import validators
+
+from coinbase.codec import Codec
+
+from coinbase.flight import SingleFlight
+
+from coinbase.heartbeat import Heartbeat
+
+from coinbase.limiter import Limiter
+from coinbase.limiter import get_limiter
+
+from coinbase.model import Record
+
+from coinbase.pool import PoolAdapter
+from coinbase.pool import Resolver
+
+from coinbase.prefetch import Prefetcher
+
+from coinbase.route import Route
+
+from coinbase.scheduler import Priority
+from coinbase.scheduler import Scheduler
+
+from coinbase.transport import Result
+from coinbase.transport import SessionTransport
+from coinbase.transport import Transport
+
+from coinbase.retry import Retry
+from coinbase.retry import get_retries
+
 
 class Messenger:
     """Class to manage HTTP request/response with authentication and session.
 
+    A messenger is safe to share between threads. The default transport
+    sends from a session per thread, and every thread draws from the same
+    connection pool, limiter and cache.
+
     :param auth: (optional) authentication instance to pass to this class
+    :param limiter: (optional) rate limiter shared with other messengers. Defaults to the limiter registered for the API key.
+    :param retries: (optional) retry policy for each HTTP method. Defaults to `get_retries()`.
+    :param adapter: (optional) connection pool adapter mounted on the session. Defaults to `PoolAdapter()`.
+    :param cache: (optional) response cache for GET requests to reference data. Disabled by default.
+    :param flight: (optional) coalesces identical concurrent GET requests. Disabled by default.
+    :param codec: (optional) JSON codec for request and response bodies. Defaults to the standard library, see `get_codec()`.
+    :param transport: (optional) HTTP layer that sends the signed requests. Defaults to a `SessionTransport` over the session.
+    :param warm: (optional) the number of connections opened ahead of the first request. The default adapter then also caches DNS lookups.
+    :param keepalive: (optional) seconds between heartbeats that keep the connections warm while idle, see `Heartbeat`. Disabled by default.
+    :param workers: (optional) the number of threads running calls passed to `submit`, `defer`, `gather` and `completed`.
+    :param scheduler: (optional) serves waiting requests by priority instead of in arrival order. Its limiter becomes the messenger's limiter. Disabled by default.
     """
 
-    def __init__(self, auth: Auth = None):
+    def __init__(
+        self,
+        auth: Auth = None,
+        limiter: Limiter = None,
+        retries: dict[str, Retry] = None,
+        adapter: PoolAdapter = None,
+        cache: Cache = None,
+        flight: SingleFlight = None,
+        codec: Codec = None,
+        transport: Transport = None,
+        warm: int = 0,
+        keepalive: float = None,
+        workers: int = 16,
+        scheduler: Scheduler = None,
+    ):
         self.__auth: Auth = auth if auth else Auth()
+        self.__adapter: PoolAdapter = (
+            adapter
+            if adapter
+            else PoolAdapter(
+                maxsize=max(10, workers, warm),
+                resolver=Resolver() if warm or keepalive else None,
+            )
+        )
         self.__session: Session = Session()
+        self.__session.mount("https://", self.__adapter)
+        self.__session.mount("http://", self.__adapter)
+        if scheduler and limiter and limiter is not scheduler.limiter:
+            raise ValueError("The scheduler must draw from the same limiter")
+        if scheduler and not limiter:
+            limiter = scheduler.limiter
+        self.__limiter: Limiter = (
+            limiter if limiter else get_limiter(self.__auth.api.key)
+        )
+        self.__scheduler: Scheduler = scheduler
+        self.__retries: dict[str, Retry] = (
+            retries if retries is not None else get_retries()
+        )
+        self.__cache: Cache = cache
+        self.__flight: SingleFlight = flight
+        self.__codec: Codec = codec if codec else Codec()
+        self.__routes: dict[tuple[str, str], Route] = {}
+        self.__transport: Transport = (
+            transport if transport else SessionTransport(self.__session)
+        )
+        self.__workers: int = workers
+        self.__executor: ThreadPoolExecutor = None
+        self.__lock: Lock = Lock()
+        self.__local: local = local()
+        self.__heartbeat: Heartbeat = None
+        if warm:
+            self.warm(warm)
+        if keepalive:
+            self.__heartbeat = Heartbeat(
+                self, keepalive, connections=warm or 1
+            )
+            self.__heartbeat.start()
 
     @property
     def auth(self) -> Auth:
@@ -57,12 +175,137 @@ class Messenger:
 
     @property
     def session(self) -> Session:
-        """Return the session instance.
+        """Return the session whose settings and adapters every thread shares.
 
         :return: session instance
         """
         return self.__session
 
+    @property
+    def adapter(self) -> PoolAdapter:
+        """Return the connection pool adapter mounted on the session.
+
+        :return: connection pool adapter
+        """
+        return self.__adapter
+
+    @property
+    def transport(self) -> Transport:
+        """Return the HTTP layer that sends the signed requests.
+
+        :return: transport instance
+        """
+        return self.__transport
+
+    @property
+    def stats(self) -> dict:
+        """Return connection reuse statistics for the transport's pools.
+
+        :return: A dictionary of pool statistics, see `get_pool_stats`.
+        """
+        return self.__transport.stats
+
+    @property
+    def heartbeat(self) -> Heartbeat:
+        """Return the heartbeat keeping the connections warm, if any.
+
+        :return: heartbeat instance or None
+        """
+        return self.__heartbeat
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool that runs deferred calls.
+
+        It is created on first use.
+
+        :return: thread pool executor
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(
+                    max_workers=self.__workers,
+                    thread_name_prefix="messenger",
+                    initializer=setattr,
+                    initargs=(self.__local, "worker", True),
+                )
+            return self.__executor
+
+    @property
+    def limiter(self) -> Limiter:
+        """Return the rate limiter instance.
+
+        :return: rate limiter instance
+        """
+        return self.__limiter
+
+    @property
+    def scheduler(self) -> Scheduler:
+        """Return the priority scheduler, if any.
+
+        :return: scheduler instance or None
+        """
+        return self.__scheduler
+
+    @property
+    def priority(self) -> Priority:
+        """Return the priority set for the current thread, if any.
+
+        :return: priority or None
+        """
+        return getattr(self.__local, "priority", None)
+
+    @contextmanager
+    def prioritize(self, priority: Priority) -> Iterator[None]:
+        """Send the requests made in this thread with the given priority.
+
+        Overrides the class the scheduler infers from each request, e.g.
+        `with messenger.prioritize(Priority.BACKFILL):` around a bulk export.
+        Calls deferred from inside the block keep the priority.
+
+        :param priority: The priority, or None to keep the current one.
+        :return: A context manager.
+        """
+        previous: Priority = self.priority
+        if priority is not None:
+            self.__local.priority = priority
+        try:
+            yield
+        finally:
+            self.__local.priority = previous
+
+    @property
+    def retries(self) -> dict[str, Retry]:
+        """Return the retry policy for each HTTP method.
+
+        :return: Dictionary of Retry objects keyed by HTTP method.
+        """
+        return self.__retries
+
+    @property
+    def cache(self) -> Cache:
+        """Return the response cache, if any.
+
+        :return: response cache instance or None
+        """
+        return self.__cache
+
+    @property
+    def flight(self) -> SingleFlight:
+        """Return the request coalescer, if any.
+
+        :return: single flight instance or None
+        """
+        return self.__flight
+
+    @property
+    def codec(self) -> Codec:
+        """Return the JSON codec.
+
+        :return: codec instance
+        """
+        return self.__codec
+
     @property
     def timeout(self) -> int:
         """Return the timeout value for HTTP request.
@@ -71,20 +314,356 @@ class Messenger:
         """
         return 30
 
-    def get(self, path: str, data: dict = None) -> Response:
+    def defer(self, call: Callable, *args, **kwargs) -> Future:
+        """Run a call on the messenger's thread pool.
+
+        A call deferred from one of the pool's own threads runs right away
+        instead, so nested calls can not wait on each other for a thread.
+
+        :param call: The function to run, e.g. `wallet.account.list`.
+        :param args: Positional arguments passed to the call.
+        :param kwargs: Keyword arguments passed to the call.
+        :return: A future holding the result of the call.
+        """
+        priority: Priority = self.priority
+
+        def run() -> Any:
+            with self.prioritize(priority):
+                return call(*args, **kwargs)
+
+        if getattr(self.__local, "worker", False):
+            future: Future = Future()
+            try:
+                future.set_result(call(*args, **kwargs))
+            except Exception as error:
+                future.set_exception(error)
+            return future
+        return self.executor.submit(run)
+
+    def submit(self, method: str, path: str, data: dict = None) -> Future:
+        """Send a request without waiting for its response.
+
+        :param method: The HTTP method of the request.
+        :param path: The API endpoint to be requested.
+        :param data: (optional) Query parameters for GET requests, the body otherwise.
+        :return: A future holding the response.
+        :raises ValueError: if the method is not supported.
+        """
+        methods: dict[str, Callable] = {
+            "GET": self.get,
+            "POST": self.post,
+            "PUT": self.put,
+            "DELETE": self.delete,
+        }
+        send: Callable = methods.get(method.upper())
+        if send is None:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        return self.defer(send, path, data)
+
+    def completed(
+        self, calls: Iterable[Callable[[], Any]]
+    ) -> Iterator[tuple[int, Any]]:
+        """Run independent calls concurrently as they complete.
+
+        Every request still goes through the limiter, so a batch is bounded
+        by the rate limit and the number of workers rather than by serial
+        round trips. Calls that have not started are cancelled if one fails
+        or the iterator is closed.
+
+        :param calls: Functions without arguments, e.g. `wallet.time.get` or a lambda.
+        :return: An iterator of `(index, result)` tuples in completion order.
+        """
+        futures: dict[Future, int] = {
+            self.defer(call): index for index, call in enumerate(calls)
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def gather(self, calls: Iterable[Callable[[], Any]]) -> list:
+        """Run independent calls concurrently and return their results.
+
+        :param calls: Functions without arguments, e.g. `wallet.time.get` or a lambda.
+        :return: A list of results in the order of the calls.
+        """
+        calls = list(calls)
+        results: list = [None] * len(calls)
+        for index, result in self.completed(calls):
+            results[index] = result
+        return results
+
+    def warm(self, connections: int = None) -> int:
+        """Open connections to the API ahead of the first request.
+
+        Resolves the host and completes the TCP and TLS handshakes now, so
+        the first requests reuse warm connections instead of paying for
+        them. Connections that are still open are left alone.
+
+        :param connections: (optional) the number of connections. Defaults to the size of the pool.
+        :return: The number of connections that were opened.
+        """
+        return self.__transport.warm(self.api.url("/time"), connections)
+
+    def limit(self, path: str) -> int:
+        """Return the largest page size accepted by an endpoint.
+
+        :param path: The API endpoint to be requested.
+        :return: page size, see `page_size`
+        """
+        return page_size(self.api, path)
+
+    def request(
+        self, method: str, path: str, refresh: bool = False, **kwargs
+    ) -> Response:
+        """Perform a rate limited request, retrying it as the policy allows.
+
+        A 429 response also penalizes the shared limiter, so every caller
+        using the same API key backs off until the server is ready again.
+
+        GET requests to routes known to the cache are answered from memory
+        until their time to live expires, without spending any rate budget.
+        Once expired, they are revalidated with `If-None-Match` or
+        `If-Modified-Since`, and a 304 reuses the cached, decoded payload.
+        With a single flight, identical concurrent GET requests share one
+        round trip and its response.
+
+        :param method: The HTTP method of the request.
+        :param path: The API endpoint to be requested.
+        :param refresh: (optional) bypass the cache and replace its entry.
+        :param kwargs: Additional arguments passed on to the session.
+        :return: The last response received.
+        """
+        if "GET" != method.upper():
+            return self.send(method, path, **kwargs)
+        ttl: float = None
+        if self.cache is not None:
+            ttl = self.cache.ttl(path)
+        if ttl is None and self.flight is None:
+            return self.send(method, path, **kwargs)
+        key: tuple = Cache.key(
+            path,
+            kwargs.get("params", kwargs.get("data")),
+            (self.api.key, self.api.url(path)),
+        )
+        if ttl is not None and not refresh:
+            response: Response = self.cache.get(key)
+            if response is not None:
+                return response
+        if self.flight is None:
+            return self.fetch(key, ttl, refresh, method, path, **kwargs)
+        # the scoped cache key keeps other API keys and versions apart, and
+        # waiting callers share the response, so decode its body only once
+        return self.flight.do(
+            key,
+            lambda: freeze(
+                self.fetch(key, ttl, refresh, method, path, **kwargs),
+                self.codec.errors,
+            ),
+        )
+
+    def fetch(
+        self,
+        key: tuple,
+        ttl: float,
+        refresh: bool,
+        method: str,
+        path: str,
+        **kwargs,
+    ) -> Response:
+        """Send a GET request and store the response in the cache.
+
+        :param key: The cache key of the request.
+        :param ttl: The time to live of the route, or None if it is not cached.
+        :param refresh: Skip revalidating a stale response.
+        :param method: The HTTP method of the request.
+        :param path: The API endpoint to be requested.
+        :param kwargs: Additional arguments passed on to the session.
+        :return: The fresh or revalidated response.
+        """
+        if ttl is None:
+            return self.send(method, path, **kwargs)
+        stale: Response = None if refresh else self.cache.stale(key)
+        if stale is not None:
+            kwargs["headers"] = {
+                **(kwargs.get("headers") or {}),
+                **validators(stale),
+            }
+        response: Response = self.send(method, path, **kwargs)
+        if 304 == response.status_code and stale is not None:
+            return self.cache.revalidate(key, ttl) or stale
+        if 200 == response.status_code:
+            self.cache.set(key, response, ttl, self.codec.errors)
+        return response
+
+    def send(
+        self,
+        method: str,
+        path: str,
+        params: dict = None,
+        data: bytes = None,
+        headers: dict = None,
+    ) -> Result:
+        """Send a request without consulting the cache.
+
+        :param method: The HTTP method of the request.
+        :param path: The API endpoint to be requested.
+        :param params: (optional) Query parameters, None values are dropped.
+        :param data: (optional) Encoded request body.
+        :param headers: (optional) Additional request headers.
+        :return: The last response received, decoded by the codec on demand.
+        """
+        return self.transmit(
+            method, self.api.path(path), params, data or b"", headers
+        )
+
+    def transmit(
+        self,
+        method: str,
+        path: str,
+        params: dict = None,
+        body: bytes = b"",
+        headers: dict = None,
+        route: Route = None,
+    ) -> Result:
+        """Sign a request for a versioned path and send it via the transport.
+
+        :param method: The HTTP method of the request.
+        :param path: The versioned API path.
+        :param params: (optional) Query parameters, None values are dropped.
+        :param body: (optional) Encoded request body.
+        :param headers: (optional) Additional request headers.
+        :param route: (optional) the compiled route of the path, which holds its URL prefix and signing method.
+        :return: The last response received, decoded by the codec on demand.
+        """
+        if params:
+            query: str = urlencode(
+                {k: v for k, v in params.items() if v is not None}, doseq=True
+            )
+            path = f"{path}?{query}" if query else path
+        url: str = route.url(path) if route else self.api.url(path)
+
+        def call() -> Result:
+            signed: dict = (
+                route.stamp(self.auth, path, body)
+                if route
+                else self.auth.stamp(method, path, body)
+            )
+            return self.transport.send(
+                method,
+                url,
+                {**signed, **headers} if headers else signed,
+                body,
+                self.timeout,
+            )
+
+        priority: Priority = self.priority
+        if priority is None and self.__scheduler is not None:
+            priority = self.__scheduler.classify(method, path)
+        return self.attempt(method, call, priority)
+
+    def attempt(
+        self,
+        method: str,
+        call: Callable[[], Result],
+        priority: Priority = None,
+    ) -> Result:
+        """Run a request under the limiter, retrying it as the policy allows.
+
+        :param method: The HTTP method, which selects the retry policy.
+        :param call: Sends the request once and returns its response.
+        :param priority: (optional) the class the scheduler serves the request as.
+        :return: The last response received, decoded by the codec on demand.
+        """
+        retry: Retry = self.retries.get(method.upper(), Retry(total=0))
+        attempt: int = 0
+        while True:
+            if self.__scheduler is not None:
+                self.__scheduler.acquire(
+                    priority if priority is not None else Priority.ACCOUNT
+                )
+            else:
+                self.limiter.acquire()
+            try:
+                response: Result = call()
+            except retry.errors:
+                if attempt >= retry.total:
+                    raise
+                sleep(retry.delay(attempt))
+                attempt += 1
+                continue
+            if not retry.retryable(response) or attempt >= retry.total:
+                return self.codec.bind(response)
+            delay: float = retry.delay(attempt, response)
+            if 429 == response.status_code:
+                # the limiter holds back this and every other request
+                self.limiter.penalize(delay)
+            else:
+                sleep(delay)
+            attempt += 1
+
+    def route(self, method: str, template: str) -> Route:
+        """Return the compiled route of an endpoint template.
+
+        Routes are compiled on first use and reused afterwards.
+
+        :param method: The HTTP method of the route.
+        :param template: The endpoint, e.g. "/accounts/{account_id}/transactions".
+        :return: The compiled route.
+        """
+        key: tuple[str, str] = (method.upper(), template)
+        route: Route = self.__routes.get(key)
+        if route is None:
+            route = self.__routes[key] = Route(self.api, method, template)
+        return route
+
+    def call(self, route: Route, data: dict = None, **values) -> Result:
+        """Send a request through a compiled route.
+
+        This is the low overhead path for hot endpoints such as order entry.
+        It skips the response cache and only fills in the route's values.
+        GET data is sent as query parameters, other data as a JSON body.
+
+        :param route: A route returned by `route`.
+        :param data: (optional) query parameters or JSON payload.
+        :param values: The value of every variable in the route template.
+        :return: The response of the request.
+        """
+        if "GET" == route.method:
+            return self.transmit(
+                route.method, route.path(**values), data, route=route
+            )
+        body: bytes = self.codec.encode(data) if data is not None else b""
+        return self.transmit(
+            route.method, route.path(**values), body=body, route=route
+        )
+
+    def body(self, data: dict = None) -> dict:
+        """Return the session arguments sending data as an encoded JSON body.
+
+        :param data: (optional) JSON payload to be sent with the request.
+        :return: Keyword arguments for the session, empty if there is no data.
+        """
+        if data is None:
+            return {}
+        return {
+            "data": self.codec.encode(data),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    def get(
+        self, path: str, data: dict = None, refresh: bool = False
+    ) -> Response:
         """Perform a GET request to the specified API path.
 
         :param path: The API endpoint to be requested.
         :param data: (optional) Query parameters to be passed with the request.
+        :param refresh: (optional) bypass the response cache and update it.
         :return: The response of the GET request.
         """
-        sleep(__limit__)
-        return self.session.get(
-            self.api.url(path),
-            params=data,
-            auth=self.auth,
-            timeout=self.timeout,
-        )
+        return self.request("GET", path, refresh, params=data)
 
     def post(self, path: str, data: dict = None) -> Response:
         """Perform a POST request to the specified API path.
@@ -93,10 +672,7 @@ class Messenger:
         :param data: (optional) JSON payload to be sent with the request.
         :return: The response of the POST request.
         """
-        sleep(__limit__)
-        return self.session.post(
-            self.api.url(path), json=data, auth=self.auth, timeout=self.timeout
-        )
+        return self.request("POST", path, **self.body(data))
 
     def put(self, path: str, data: dict = None) -> Response:
         """Perform a PUT request to the specified API path.
@@ -105,10 +681,7 @@ class Messenger:
         :param data: (optional) JSON payload to be sent with the request.
         :return: The response of the PUT request.
         """
-        sleep(__limit__)
-        return self.session.put(
-            self.api.url(path), json=data, auth=self.auth, timeout=self.timeout
-        )
+        return self.request("PUT", path, **self.body(data))
 
     def delete(self, path: str, data: dict = None) -> Response:
         """Perform a DELETE request to the specified API path.
@@ -117,22 +690,23 @@ class Messenger:
         :param data: (optional) JSON payload to be sent with the request.
         :return: The response of the DELETE request.
         """
-        sleep(__limit__)
-        return self.session.delete(
-            self.api.url(path), json=data, auth=self.auth, timeout=self.timeout
-        )
+        return self.request("DELETE", path, **self.body(data))
 
     def page(self, path: str, data: dict = None) -> list[Response]:
         """Get paginated responses from the API.
 
+        Each page is retried according to the GET policy, so a transient
+        failure resumes from the current cursor instead of restarting the
+        walk.
+
         :param path: The API endpoint to send the request to.
         :param data: Data to include in the request query parameters.
         :return: A list of Response objects.
         """
 
         responses: list[Response] = []
-        if not data:
-            data = {"limit": 25}
+        data = dict(data) if data else {}
+        data.setdefault("limit", self.limit(path))
         while True:
             response: Response = self.get(path, data)
             if 200 != response.status_code:
@@ -149,6 +723,171 @@ class Messenger:
             data["starting_after"] = page["next_starting_after"]
         return responses
 
+    def cursor(self, payload: dict) -> dict:
+        """Return the query parameters of the page that follows a payload.
+
+        :param payload: A decoded page returned by the API.
+        :return: Parameters for the next request, or None on the last page.
+        """
+        return next_page(payload)
+
+    def iter_pages(
+        self, path: str, data: dict = None, prefetch: int = 0
+    ) -> Iterator[dict]:
+        """Lazily iterate over the decoded pages of a paginated endpoint.
+
+        Unlike `page`, only the current page is held in memory and every
+        body is decoded exactly once. The caller's `data` is not modified.
+
+        With `prefetch`, a background thread requests the following pages
+        while the caller is still processing the current one, keeping at
+        most `prefetch` pages buffered.
+
+        :param path: The API endpoint to send the request to.
+        :param data: Data to include in the request query parameters.
+        :param prefetch: (optional) number of pages to read ahead, 0 disables it.
+        :return: An iterator of decoded pages.
+        :raises HTTPError: if a page still fails after it was retried.
+        """
+        if prefetch > 0:
+            pages: Prefetcher = Prefetcher(
+                self.iter_prioritized(
+                    self.iter_pages(path, data), self.priority
+                ),
+                prefetch,
+            )
+            try:
+                yield from pages
+            finally:
+                pages.close()
+            return
+        data = dict(data) if data else {}
+        data.setdefault("limit", self.limit(path))
+        while True:
+            response: Response = self.get(path, data)
+            if 200 != response.status_code:
+                raise HTTPError(
+                    f"{response.status_code} Error for {path}",
+                    response=response,
+                )
+            payload: dict = response.json()
+            if not payload:
+                return
+            following: dict = self.cursor(payload)
+            yield payload
+            if not following or all(
+                data.get(key) == value for key, value in following.items()
+            ):
+                return
+            data.update(following)
+
+    def iter_prioritized(
+        self, iterator: Iterator, priority: Priority
+    ) -> Iterator:
+        """Advance an iterator of requests with the given priority.
+
+        Keeps the priority of the caller when the iterator is advanced from
+        another thread, e.g. by a `Prefetcher`.
+
+        :param iterator: An iterator that sends requests as it advances.
+        :param priority: The priority, or None to keep the current one.
+        :return: An iterator of the same items.
+        """
+        while True:
+            with self.prioritize(priority):
+                try:
+                    item: Any = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def iter_items(
+        self,
+        path: str,
+        data: dict = None,
+        key: str = "data",
+        prefetch: int = 0,
+        until: Callable[[dict], bool] = None,
+        model: type[Record] = None,
+    ) -> Iterator[dict]:
+        """Lazily iterate over the items of a paginated endpoint.
+
+        With `until`, the walk ends at the first item the predicate matches,
+        without yielding it or requesting any further pages. See `before`
+        and `seen` for common predicates.
+
+        With `model`, each item is converted to a compact record as soon as
+        its page is decoded, so only the current page is held as dicts.
+
+        :param path: The API endpoint to send the request to.
+        :param data: Data to include in the request query parameters.
+        :param key: The key holding the list of items in each page.
+        :param prefetch: (optional) number of pages to read ahead, see `iter_pages`.
+        :param until: (optional) predicate that ends the walk when it returns True.
+        :param model: (optional) Record subclass each item is converted to.
+        :return: An iterator of items, fetched one page at a time.
+        """
+        pages: Iterator[dict] = self.iter_pages(path, data, prefetch)
+        try:
+            for payload in pages:
+                for item in payload[key]:
+                    if until and until(item):
+                        return
+                    yield model.from_dict(item) if model else item
+        finally:
+            pages.close()
+
+    def sweep(
+        self, path: str, data: dict = None, key: str = "data"
+    ) -> list[dict]:
+        """Walk a v2 listing from both ends at once and return every item.
+
+        One cursor pages through the listing newest first while another
+        pages oldest first. Both stop as soon as either reaches an item the
+        other has already seen, so a full export takes roughly half the
+        round trips in sequence. Both walkers share the messenger's limiter
+        and are served as backfill unless the caller set another priority.
+
+        :param path: The API endpoint to send the request to.
+        :param data: Data to include in the request query parameters.
+        :param key: The key holding the list of items in each page.
+        :return: All items, newest first and without duplicates.
+        """
+        priority: Priority = (
+            self.priority if self.priority is not None else Priority.BACKFILL
+        )
+        lock: Lock = Lock()
+        met: Event = Event()
+        seen: dict[str, set] = {"desc": set(), "asc": set()}
+        other: dict[str, str] = {"desc": "asc", "asc": "desc"}
+
+        def walk(order: str) -> list[dict]:
+            def meets(item: dict) -> bool:
+                with lock:
+                    if met.is_set() or item["id"] in seen[other[order]]:
+                        met.set()
+                        return True
+                    seen[order].add(item["id"])
+                    return False
+
+            query: dict = dict(data) if data else {}
+            query["order"] = order
+            with self.prioritize(priority):
+                return list(self.iter_items(path, query, key, until=meets))
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            newest = executor.submit(walk, "desc")
+            oldest = executor.submit(walk, "asc")
+            items: list[dict] = newest.result() + oldest.result()[::-1]
+
+        ids: set = set()
+        result: list[dict] = []
+        for item in items:
+            if item["id"] not in ids:
+                ids.add(item["id"])
+                result.append(item)
+        return result
+
     def close(self):
         """Close the underlying session object.
 
@@ -156,6 +895,12 @@ class Messenger:
 
         :return: None
         """
+        if self.__heartbeat is not None:
+            self.__heartbeat.stop()
+        if self.__executor is not None:
+            self.__executor.shutdown(cancel_futures=True)
+            self.__executor = None
+        self.transport.close()
         self.session.close()
 
 
@@ -165,29 +910,21 @@ class AdvancedMessenger(Messenger):
     :param Messenger: Base class for making API requests.
     """
 
-    def get(self, path: str, data: dict = None) -> Response:
-        """Get a single API response.
-
-        :param path: The API endpoint to send the request to.
-        :param data: Data to include in the request query parameters.
-        :return: A single Response object.
-        """
-        sleep(__limit__)
-        return self.session.get(
-            self.api.url(path), json=data, auth=self.auth, timeout=self.timeout
-        )
-
     def page(self, path: str, data: dict = None) -> list[Response]:
         """Get paginated responses from the API.
 
+        Each page is retried according to the GET policy, so a transient
+        failure resumes from the current cursor instead of restarting the
+        walk.
+
         :param path: The API endpoint to send the request to.
         :param data: Data to include in the request query parameters.
         :return: A list of Response objects.
         """
 
         responses: list[Response] = []
-        if not data:
-            data = {"limit": 50}
+        data = dict(data) if data else {}
+        data.setdefault("limit", self.limit(path))
         while True:
             response: Response = self.get(path, data)
             if 200 != response.status_code:
@@ -206,6 +943,14 @@ class AdvancedMessenger(Messenger):
             data["cursor"] = payload["cursor"]
         return responses
 
+    def cursor(self, payload: dict) -> dict:
+        """Return the query parameters of the page that follows a payload.
+
+        :param payload: A decoded page returned by the API.
+        :return: Parameters for the next request, or None on the last page.
+        """
+        return next_advanced_page(payload)
+
 
 class Subscriber:
     """Class for handling API requests as a subscriber.
@@ -233,19 +978,162 @@ class Subscriber:
         return 200 != response.status_code
 
 
-def get_messenger(settings: dict) -> Messenger:
+def fan_out(
+    call: Callable[[str], Any], keys: Iterable[str], workers: int = 8
+) -> Iterator[tuple[str, Any]]:
+    """Run a call for many keys on a bounded thread pool.
+
+    The calls still go through their messenger's limiter, so a fan-out is
+    bounded by the rate limit rather than by serial round trips.
+
+    :param call: The function to run for each key, e.g. `wallet.transaction.list`.
+    :param keys: The keys to run the call for, e.g. account ids.
+    :param workers: (optional) the maximum number of concurrent calls.
+    :return: An iterator of `(key, result)` tuples in completion order.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures: dict[Future, str] = {
+            executor.submit(call, key): key for key in keys
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def before(timestamp: str, key: str = "created_at") -> Callable[[dict], bool]:
+    """Return a predicate matching items created before a timestamp.
+
+    Listings are returned newest first, so `until=before(since)` stops an
+    incremental sync at the first item it has already synced.
+
+    :param timestamp: An ISO 8601 timestamp in the same format as the API, e.g. "2023-03-01T00:00:00Z".
+    :param key: (optional) the item field holding the timestamp.
+    :return: Predicate for the `until` argument of `Messenger.iter_items`.
+    """
+    return lambda item: item[key] < timestamp
+
+
+def seen(ids: set, key: str = "id") -> Callable[[dict], bool]:
+    """Return a predicate matching items whose id is already known.
+
+    :param ids: The ids synced previously.
+    :param key: (optional) the item field holding the id.
+    :return: Predicate for the `until` argument of `Messenger.iter_items`.
+    """
+    return lambda item: item[key] in ids
+
+
+def page_size(api: API, path: str) -> int:
+    """Return the largest page size accepted by an endpoint.
+
+    Used as the page size whenever the caller does not pin one, since
+    fewer, larger pages spend less of the rate limit. Advanced Trade
+    accounts accept 250 items per page, every other listing 100.
+
+    :param api: The API the endpoint belongs to.
+    :param path: The API endpoint to be requested.
+    :return: page size
+    """
+    if isinstance(api, AdvancedAPI):
+        if api.path(path) == api.path("/accounts"):
+            return 250
+    return 100
+
+
+def next_page(payload: dict) -> dict:
+    """Return the query parameters of the v2 page that follows a payload.
+
+    :param payload: A decoded page returned by the API.
+    :return: Parameters for the next request, or None on the last page.
+    """
+    if "pagination" not in payload:
+        raise KeyError("This request does not support pagination")
+    page: dict = payload["pagination"]
+    if not page["next_uri"]:
+        return None
+    return {"starting_after": page["next_starting_after"]}
+
+
+def next_advanced_page(payload: dict) -> dict:
+    """Return the query parameters of the v3 page that follows a payload.
+
+    :param payload: A decoded page returned by the API.
+    :return: Parameters for the next request, or None on the last page.
+    """
+    if "has_next" not in payload and "cursor" not in payload:
+        raise KeyError("This request does not support pagination")
+    # some endpoints, such as fills, only return a cursor
+    if not payload.get("has_next", bool(payload.get("cursor"))):
+        return None
+    return {"cursor": payload["cursor"]}
+
+
+def get_messenger(
+    settings: dict,
+    limiter: Limiter = None,
+    cache: Cache = None,
+    flight: SingleFlight = None,
+    codec: Codec = None,
+    warm: int = 0,
+    keepalive: float = None,
+    scheduler: Scheduler = None,
+) -> Messenger:
     """Create and return a Messenger object.
 
     :param settings: Dictionary containing API authentication and connection settings.
+    :param limiter: (optional) rate limiter to share, e.g. a FileLimiter shared between processes.
+    :param cache: (optional) response cache for reference data, e.g. `Cache()`.
+    :param flight: (optional) coalesces identical concurrent GET requests, e.g. `SingleFlight()`.
+    :param codec: (optional) JSON codec, e.g. `get_codec("orjson")`.
+    :param warm: (optional) the number of connections opened and DNS lookups cached ahead of the first request.
+    :param keepalive: (optional) seconds between probes that keep the connections warm while idle.
+    :param scheduler: (optional) serves latency-critical requests ahead of background ones, e.g. `Scheduler(limiter)`.
     :return: Messenger object.
     """
-    return Messenger(Auth(API(settings)))
+    return Messenger(
+        Auth(API(settings)),
+        limiter,
+        cache=cache,
+        flight=flight,
+        codec=codec,
+        warm=warm,
+        keepalive=keepalive,
+        scheduler=scheduler,
+    )
 
 
-def get_advanced_messenger(settings: dict) -> AdvancedMessenger:
+def get_advanced_messenger(
+    settings: dict,
+    limiter: Limiter = None,
+    cache: Cache = None,
+    flight: SingleFlight = None,
+    codec: Codec = None,
+    warm: int = 0,
+    keepalive: float = None,
+    scheduler: Scheduler = None,
+) -> AdvancedMessenger:
     """Create and return an AdvancedMessenger object.
 
     :param settings: Dictionary containing API authentication and connection settings.
+    :param limiter: (optional) rate limiter to share, e.g. a FileLimiter shared between processes.
+    :param cache: (optional) response cache for reference data, e.g. `Cache()`.
+    :param flight: (optional) coalesces identical concurrent GET requests, e.g. `SingleFlight()`.
+    :param codec: (optional) JSON codec, e.g. `get_codec("orjson")`.
+    :param warm: (optional) the number of connections opened and DNS lookups cached ahead of the first request.
+    :param keepalive: (optional) seconds between probes that keep the connections warm while idle.
+    :param scheduler: (optional) serves latency-critical requests ahead of background ones, e.g. `Scheduler(limiter)`.
     :return: AdvancedMessenger object.
     """
-    return AdvancedMessenger(Auth(AdvancedAPI(settings)))
+    return AdvancedMessenger(
+        Auth(AdvancedAPI(settings)),
+        limiter,
+        cache=cache,
+        flight=flight,
+        codec=codec,
+        warm=warm,
+        keepalive=keepalive,
+        scheduler=scheduler,
+    )
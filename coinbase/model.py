@@ -0,0 +1,357 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from decimal import Decimal
+
+from sys import intern
+
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+
+
+class Amount:
+    """A decimal field that is parsed from its string on first access.
+
+    The raw string is kept in a private slot named after the field and is
+    replaced by the parsed Decimal, so records that are never inspected
+    never pay for the conversion.
+    """
+
+    def __set_name__(self, owner: type, name: str):
+        self.__slot: str = f"_{name}"
+
+    def __get__(self, record: "Record", owner: type = None) -> Decimal:
+        if record is None:
+            return self
+        value: Any = getattr(record, self.__slot)
+        if value is not None and not isinstance(value, Decimal):
+            # unset amounts, e.g. the average price of an open order, are ""
+            value = Decimal(value) if value != "" else None
+            setattr(record, self.__slot, value)
+        return value
+
+
+class Record:
+    """Base class for compact, read-only views of API resources.
+
+    Subclasses declare their `__slots__`, the path of each field within
+    the decoded payload and the fields holding enum-like strings, which
+    are interned so every record shares a single copy of them. Decimal
+    fields are declared with `Amount` and stored under a `_` prefixed slot.
+    """
+
+    __slots__ = ()
+
+    paths: dict[str, tuple[str, ...]] = {}
+    interned: frozenset[str] = frozenset()
+    fields: tuple[tuple[str, str, tuple[str, ...], bool], ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.fields = tuple(
+            (
+                name,
+                (
+                    f"_{name}"
+                    if isinstance(cls.__dict__.get(name), Amount)
+                    else name
+                ),
+                path,
+                name in cls.interned,
+            )
+            for name, path in cls.paths.items()
+        )
+
+    @classmethod
+    def from_dict(cls, item: dict) -> "Record":
+        """Create a record from a decoded API resource.
+
+        :param item: A dictionary returned by the API.
+        :return: A record holding the fields of the resource.
+        """
+        record: Record = object.__new__(cls)
+        for _, slot, path, interned in cls.fields:
+            value: Any = item
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if interned and isinstance(value, str):
+                value = intern(value)
+            setattr(record, slot, value)
+        return record
+
+    @classmethod
+    def from_items(cls, items: Iterable[dict]) -> Iterator["Record"]:
+        """Lazily create records from decoded API resources.
+
+        :param items: An iterable of dictionaries returned by the API.
+        :return: An iterator of records.
+        """
+        return map(cls.from_dict, items)
+
+    def to_dict(self) -> dict:
+        """Return the fields of the record as a flat dictionary.
+
+        :return: A dictionary keyed by field name.
+        """
+        return {name: getattr(self, name) for name, *_ in self.fields}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields: str = ", ".join(
+            f"{name}={getattr(self, name)!r}" for name, *_ in self.fields
+        )
+        return f"{type(self).__name__}({fields})"
+
+
+class AccountRecord(Record):
+    """A wallet account."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "primary",
+        "type",
+        "currency",
+        "_balance",
+        "created_at",
+        "updated_at",
+    )
+
+    balance = Amount()
+
+    paths = {
+        "id": ("id",),
+        "name": ("name",),
+        "primary": ("primary",),
+        "type": ("type",),
+        "currency": ("balance", "currency"),
+        "balance": ("balance", "amount"),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    }
+    interned = frozenset({"type", "currency"})
+
+
+class TransactionRecord(Record):
+    """A wallet transaction."""
+
+    __slots__ = (
+        "id",
+        "type",
+        "status",
+        "_amount",
+        "currency",
+        "_native_amount",
+        "native_currency",
+        "description",
+        "created_at",
+        "updated_at",
+    )
+
+    amount = Amount()
+    native_amount = Amount()
+
+    paths = {
+        "id": ("id",),
+        "type": ("type",),
+        "status": ("status",),
+        "amount": ("amount", "amount"),
+        "currency": ("amount", "currency"),
+        "native_amount": ("native_amount", "amount"),
+        "native_currency": ("native_amount", "currency"),
+        "description": ("description",),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    }
+    interned = frozenset({"type", "status", "currency", "native_currency"})
+
+
+class TradeRecord(Record):
+    """A wallet buy or sell."""
+
+    __slots__ = (
+        "id",
+        "resource",
+        "status",
+        "_amount",
+        "currency",
+        "_total",
+        "_subtotal",
+        "_fee",
+        "native_currency",
+        "_unit_price",
+        "committed",
+        "created_at",
+        "updated_at",
+    )
+
+    amount = Amount()
+    total = Amount()
+    subtotal = Amount()
+    fee = Amount()
+    unit_price = Amount()
+
+    paths = {
+        "id": ("id",),
+        "resource": ("resource",),
+        "status": ("status",),
+        "amount": ("amount", "amount"),
+        "currency": ("amount", "currency"),
+        "total": ("total", "amount"),
+        "subtotal": ("subtotal", "amount"),
+        "fee": ("fee", "amount"),
+        "native_currency": ("total", "currency"),
+        "unit_price": ("unit_price", "amount"),
+        "committed": ("committed",),
+        "created_at": ("created_at",),
+        "updated_at": ("updated_at",),
+    }
+    interned = frozenset({"resource", "status", "currency", "native_currency"})
+
+
+class OrderRecord(Record):
+    """An advanced trade order."""
+
+    __slots__ = (
+        "order_id",
+        "product_id",
+        "side",
+        "status",
+        "order_type",
+        "_filled_size",
+        "_average_filled_price",
+        "_filled_value",
+        "_total_fees",
+        "created_time",
+    )
+
+    filled_size = Amount()
+    average_filled_price = Amount()
+    filled_value = Amount()
+    total_fees = Amount()
+
+    paths = {
+        "order_id": ("order_id",),
+        "product_id": ("product_id",),
+        "side": ("side",),
+        "status": ("status",),
+        "order_type": ("order_type",),
+        "filled_size": ("filled_size",),
+        "average_filled_price": ("average_filled_price",),
+        "filled_value": ("filled_value",),
+        "total_fees": ("total_fees",),
+        "created_time": ("created_time",),
+    }
+    interned = frozenset({"product_id", "side", "status", "order_type"})
+
+
+class FillRecord(Record):
+    """An advanced trade fill."""
+
+    __slots__ = (
+        "entry_id",
+        "trade_id",
+        "order_id",
+        "product_id",
+        "side",
+        "_price",
+        "_size",
+        "_commission",
+        "liquidity_indicator",
+        "trade_time",
+    )
+
+    price = Amount()
+    size = Amount()
+    commission = Amount()
+
+    paths = {
+        "entry_id": ("entry_id",),
+        "trade_id": ("trade_id",),
+        "order_id": ("order_id",),
+        "product_id": ("product_id",),
+        "side": ("side",),
+        "price": ("price",),
+        "size": ("size",),
+        "commission": ("commission",),
+        "liquidity_indicator": ("liquidity_indicator",),
+        "trade_time": ("trade_time",),
+    }
+    interned = frozenset({"product_id", "side", "liquidity_indicator"})
+
+
+class ProductRecord(Record):
+    """An advanced trade product."""
+
+    __slots__ = (
+        "product_id",
+        "base_currency_id",
+        "quote_currency_id",
+        "_price",
+        "_base_increment",
+        "_quote_increment",
+        "_base_min_size",
+        "_base_max_size",
+        "status",
+        "product_type",
+    )
+
+    price = Amount()
+    base_increment = Amount()
+    quote_increment = Amount()
+    base_min_size = Amount()
+    base_max_size = Amount()
+
+    paths = {
+        "product_id": ("product_id",),
+        "base_currency_id": ("base_currency_id",),
+        "quote_currency_id": ("quote_currency_id",),
+        "price": ("price",),
+        "base_increment": ("base_increment",),
+        "quote_increment": ("quote_increment",),
+        "base_min_size": ("base_min_size",),
+        "base_max_size": ("base_max_size",),
+        "status": ("status",),
+        "product_type": ("product_type",),
+    }
+    interned = frozenset(
+        {"base_currency_id", "quote_currency_id", "status", "product_type"}
+    )
+
+
+class CandleRecord(Record):
+    """An advanced trade candle."""
+
+    __slots__ = ("start", "_low", "_high", "_open", "_close", "_volume")
+
+    low = Amount()
+    high = Amount()
+    open = Amount()
+    close = Amount()
+    volume = Amount()
+
+    paths = {
+        "start": ("start",),
+        "low": ("low",),
+        "high": ("high",),
+        "open": ("open",),
+        "close": ("close",),
+        "volume": ("volume",),
+    }
@@ -0,0 +1,339 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import socket
+
+from queue import Empty
+
+from threading import Lock
+
+from time import monotonic
+
+from requests.adapters import HTTPAdapter
+
+from requests.models import PreparedRequest
+
+from urllib3 import HTTPConnectionPool
+from urllib3 import HTTPSConnectionPool
+from urllib3 import PoolManager
+
+from urllib3.connection import HTTPConnection
+from urllib3.connection import HTTPSConnection
+
+from urllib3.exceptions import HTTPError
+from urllib3.exceptions import NewConnectionError
+
+from urllib3.util.connection import is_connection_dropped
+
+
+def get_socket_options(nodelay: bool = True, keepalive: bool = True) -> list:
+    """Return the socket options applied to pooled connections.
+
+    :param nodelay: (optional) disable Nagle's algorithm so small signed requests are sent immediately.
+    :param keepalive: (optional) send TCP keep-alive probes so idle pooled connections are not silently dropped.
+    :return: A list of `(level, option, value)` tuples.
+    """
+    options: list = [
+        option
+        for option in HTTPConnection.default_socket_options
+        if option[:2] != (socket.IPPROTO_TCP, socket.TCP_NODELAY)
+    ]
+    options.append((socket.IPPROTO_TCP, socket.TCP_NODELAY, int(nodelay)))
+    if keepalive:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # idle seconds before the first probe, where the platform supports it
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15))
+    return options
+
+
+def get_pool_stats(manager: PoolManager) -> dict:
+    """Return connection reuse statistics for every pool of a manager.
+
+    :param manager: A urllib3 pool manager, or None for empty statistics.
+    :return: A dictionary with the number of pools, connections opened, requests sent, and requests that reused a warm connection.
+    """
+    connections: int = 0
+    requests: int = 0
+    count: int = 0
+    pools = manager.pools if manager is not None else {}
+    for key in pools.keys():
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        count += 1
+        connections += pool.num_connections
+        requests += pool.num_requests
+    return {
+        "pools": count,
+        "connections": connections,
+        "requests": requests,
+        "reused": max(0, requests - connections),
+    }
+
+
+class Resolver:
+    """Cache the addresses of the hosts new connections are opened to.
+
+    Every new pooled connection otherwise asks the system resolver again,
+    which costs a round trip to a DNS server whenever its own cache missed.
+
+    :param ttl: (optional) seconds an address is reused before it is looked up again.
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        self.__ttl: float = ttl
+        self.__lock: Lock = Lock()
+        self.__entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    @property
+    def ttl(self) -> float:
+        """Return the number of seconds an address is reused.
+
+        :return: time to live in seconds
+        """
+        return self.__ttl
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """Return the addresses of a host, looking them up if not cached.
+
+        :param host: The host name.
+        :param port: The port that will be connected to.
+        :return: A list of addresses in the order the resolver returned them.
+        :raises OSError: if the host can not be resolved.
+        """
+        now: float = monotonic()
+        with self.__lock:
+            entry = self.__entries.get((host, port))
+        if entry is not None and now < entry[0]:
+            return entry[1]
+        addresses: list[str] = []
+        for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+            if info[4][0] not in addresses:
+                addresses.append(info[4][0])
+        with self.__lock:
+            self.__entries[(host, port)] = (now + self.__ttl, addresses)
+        return addresses
+
+    def forget(self, host: str = None) -> None:
+        """Drop the cached addresses of a host, or of every host.
+
+        :param host: (optional) The host name. Defaults to every host.
+        :return: None
+        """
+        with self.__lock:
+            for key in list(self.__entries):
+                if host is None or key[0] == host:
+                    del self.__entries[key]
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__entries)
+
+
+class ResolvingConnection:
+    """Mixin for urllib3 connections that connect through a Resolver.
+
+    Only the TCP connection uses the cached address, the host name is still
+    sent in the `Host` header and used to verify the TLS certificate.
+    """
+
+    resolver: Resolver = None
+
+    def _new_conn(self) -> socket.socket:
+        host: str = self._dns_host
+        try:
+            addresses: list[str] = self.resolver.resolve(host, self.port)
+        except OSError:
+            # let urllib3 report the lookup failure
+            return super()._new_conn()
+        error: NewConnectionError = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except NewConnectionError as failure:
+                error = failure
+            finally:
+                self._dns_host = host
+        # the host may have moved, look it up again next time
+        self.resolver.forget(host)
+        raise error
+
+
+def get_pool_classes(resolver: Resolver) -> dict[str, type]:
+    """Return urllib3 pool classes whose connections use a resolver.
+
+    :param resolver: The resolver new connections look their host up with.
+    :return: Dictionary of connection pool classes keyed by scheme.
+    """
+    http: type = type(
+        "HTTPConnection",
+        (ResolvingConnection, HTTPConnection),
+        {"resolver": resolver},
+    )
+    https: type = type(
+        "HTTPSConnection",
+        (ResolvingConnection, HTTPSConnection),
+        {"resolver": resolver},
+    )
+    return {
+        "http": type(
+            "HTTPConnectionPool",
+            (HTTPConnectionPool,),
+            {"ConnectionCls": http},
+        ),
+        "https": type(
+            "HTTPSConnectionPool",
+            (HTTPSConnectionPool,),
+            {"ConnectionCls": https},
+        ),
+    }
+
+
+def warm_pool(pool: HTTPConnectionPool, count: int) -> int:
+    """Open connections in a pool ahead of the requests that will use them.
+
+    Only idle slots are warmed. Connections that are still open are left
+    alone and connections the server has closed are replaced, so warming
+    again after an idle period only pays for what was lost. Connections in
+    use are never duplicated, since the pool could not keep the extras.
+    Failures are not raised; the first request reports them and is
+    retried as usual.
+
+    :param pool: A urllib3 connection pool.
+    :param count: The number of connections to hold open, at most the size of the pool.
+    :return: The number of connections that were opened.
+    """
+    if pool.pool is None:
+        return 0
+    connections: list = []
+    while len(connections) < count:
+        try:
+            connections.append(pool.pool.get_nowait())
+        except Empty:
+            break
+    opened: int = 0
+    try:
+        for index, connection in enumerate(connections):
+            if connection is None:
+                connection = connections[index] = pool._new_conn()
+            if is_connection_dropped(connection):
+                connection.close()
+                connection.connect()
+                opened += 1
+    except (OSError, HTTPError):
+        pass
+    finally:
+        for connection in connections:
+            pool._put_conn(connection)
+    return opened
+
+
+class PoolAdapter(HTTPAdapter):
+    """HTTP adapter with a configurable connection pool.
+
+    A messenger used from a thread pool should have a `maxsize` at least as
+    large as the number of threads, otherwise connections are discarded and
+    later requests pay for a new TCP and TLS handshake.
+
+    :param connections: (optional) the number of per-host pools to cache.
+    :param maxsize: (optional) the maximum number of connections kept per host.
+    :param block: (optional) wait for a free connection instead of opening a throwaway one.
+    :param socket_options: (optional) socket options for new connections. Defaults to `get_socket_options()`.
+    :param resolver: (optional) caches the addresses new connections are opened to. Disabled by default.
+    """
+
+    def __init__(
+        self,
+        connections: int = 10,
+        maxsize: int = 10,
+        block: bool = False,
+        socket_options: list = None,
+        resolver: Resolver = None,
+    ):
+        self.__socket_options: list = (
+            socket_options
+            if socket_options is not None
+            else get_socket_options()
+        )
+        self.__resolver: Resolver = resolver
+        super().__init__(
+            pool_connections=connections,
+            pool_maxsize=maxsize,
+            pool_block=block,
+        )
+
+    @property
+    def socket_options(self) -> list:
+        """Return the socket options applied to new connections.
+
+        :return: A list of `(level, option, value)` tuples.
+        """
+        return self.__socket_options
+
+    @property
+    def resolver(self) -> Resolver:
+        """Return the resolver new connections use, if any.
+
+        :return: resolver instance or None
+        """
+        return self.__resolver
+
+    @property
+    def stats(self) -> dict:
+        """Return connection reuse statistics for every cached pool.
+
+        :return: A dictionary with the number of pools, connections opened, requests sent, and requests that reused a warm connection.
+        """
+        return get_pool_stats(self.poolmanager)
+
+    def init_poolmanager(
+        self, connections: int, maxsize: int, block: bool = False, **kwargs
+    ) -> None:
+        kwargs.setdefault("socket_options", self.socket_options)
+        super().init_poolmanager(connections, maxsize, block, **kwargs)
+        if self.resolver is not None:
+            self.poolmanager.pool_classes_by_scheme = get_pool_classes(
+                self.resolver
+            )
+
+    def warm(
+        self, url: str, count: int = None, verify: bool = True, cert=None
+    ) -> int:
+        """Open pooled connections to the host of a URL.
+
+        :param url: A URL on the host to connect to.
+        :param count: (optional) the number of connections. Defaults to the size of the pool.
+        :param verify: (optional) the session's TLS verification setting, which selects the pool.
+        :param cert: (optional) the session's client certificate, which selects the pool.
+        :return: The number of connections that were opened.
+        """
+        # look the pool up the way send does, or another one is warmed
+        if hasattr(self, "get_connection_with_tls_context"):
+            request: PreparedRequest = PreparedRequest()
+            request.prepare(method="GET", url=url)
+            pool = self.get_connection_with_tls_context(
+                request, verify, None, cert
+            )
+        else:
+            pool = self.get_connection(url)
+        return warm_pool(pool, count if count else self._pool_maxsize)
+
+    def proxy_manager_for(self, proxy: str, **kwargs):
+        kwargs.setdefault("socket_options", self.socket_options)
+        return super().proxy_manager_for(proxy, **kwargs)
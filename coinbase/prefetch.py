@@ -0,0 +1,87 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from queue import Full
+from queue import Queue
+
+from threading import Event
+from threading import Thread
+
+from typing import Any
+from typing import Iterable
+
+
+class Prefetcher:
+    """Iterate over an iterable while a background thread reads ahead.
+
+    The thread keeps up to `depth` items buffered, so the next page is
+    already being fetched while the consumer processes the current one.
+    Errors raised by the iterable are re-raised in the consumer.
+
+    :param iterable: The iterable to read ahead, e.g. `Messenger.iter_pages`.
+    :param depth: (optional) maximum number of items buffered ahead of the consumer.
+    """
+
+    def __init__(self, iterable: Iterable, depth: int = 1):
+        self.__queue: Queue = Queue(maxsize=max(1, depth))
+        self.__stop: Event = Event()
+        self.__done: bool = False
+        self.__thread: Thread = Thread(
+            target=self.__run, args=(iterable,), daemon=True
+        )
+        self.__thread.start()
+
+    def __iter__(self) -> "Prefetcher":
+        return self
+
+    def __next__(self) -> Any:
+        # the thread has exited, nothing will be put on the queue again
+        if self.__done:
+            raise StopIteration
+        more, value = self.__queue.get()
+        if more:
+            return value
+        self.__done = True
+        self.__stop.set()
+        if value is not None:
+            raise value
+        raise StopIteration
+
+    def __run(self, iterable: Iterable) -> None:
+        try:
+            for item in iterable:
+                if not self.__put((True, item)):
+                    return
+        except Exception as error:
+            self.__put((False, error))
+        else:
+            self.__put((False, None))
+
+    def __put(self, entry: tuple) -> bool:
+        while not self.__stop.is_set():
+            try:
+                self.__queue.put(entry, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def close(self) -> None:
+        """Stop reading ahead. Items already buffered are discarded.
+
+        :return: None
+        """
+        self.__done = True
+        self.__stop.set()
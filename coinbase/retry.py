@@ -0,0 +1,160 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from email.utils import parsedate_to_datetime
+
+from random import uniform
+
+from time import time
+
+from requests import Response
+
+from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectTimeout
+from requests.exceptions import Timeout
+
+
+class Retry:
+    """Exponential backoff policy for failed API requests.
+
+    The n-th retry waits a random time between zero and
+    `min(cap, backoff * 2 ** n)` seconds, unless the server says how long to
+    wait through a `Retry-After` or rate limit reset header.
+
+    :param total: (optional) maximum number of retries.
+    :param backoff: (optional) base delay in seconds.
+    :param cap: (optional) maximum delay in seconds.
+    :param statuses: (optional) status codes that are retried.
+    :param errors: (optional) exception types that are retried.
+    :param jitter: (optional) randomize the delay to spread out retries.
+    """
+
+    def __init__(
+        self,
+        total: int = 3,
+        backoff: float = 0.5,
+        cap: float = 30.0,
+        statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        errors: tuple[type, ...] = (ConnectionError, Timeout),
+        jitter: bool = True,
+    ):
+        self.__total: int = total
+        self.__backoff: float = backoff
+        self.__cap: float = cap
+        self.__statuses: tuple[int, ...] = statuses
+        self.__errors: tuple[type, ...] = errors
+        self.__jitter: bool = jitter
+
+    @property
+    def total(self) -> int:
+        """Return the maximum number of retries.
+
+        :return: maximum number of retries
+        """
+        return self.__total
+
+    @property
+    def statuses(self) -> tuple[int, ...]:
+        """Return the status codes that are retried.
+
+        :return: retryable status codes
+        """
+        return self.__statuses
+
+    @property
+    def errors(self) -> tuple[type, ...]:
+        """Return the exception types that are retried.
+
+        :return: retryable exception types
+        """
+        return self.__errors
+
+    def retryable(self, response: Response) -> bool:
+        """Check if a response should be retried.
+
+        :param response: Response object returned from an API request.
+        :return: True if the status code is retryable, False otherwise.
+        """
+        return response.status_code in self.__statuses
+
+    def delay(self, attempt: int, response: Response = None) -> float:
+        """Return the number of seconds to wait before the next attempt.
+
+        :param attempt: The zero based number of the retry.
+        :param response: (optional) The response that failed.
+        :return: delay in seconds
+        """
+        after: float = self.after(response) if response is not None else None
+        if after is not None:
+            return min(self.__cap, after)
+        delay: float = min(self.__cap, self.__backoff * 2**attempt)
+        return uniform(0, delay) if self.__jitter else delay
+
+    @staticmethod
+    def after(response: Response) -> float:
+        """Return the delay the server asked for, if any.
+
+        `Retry-After` may hold seconds or an HTTP date. Rate limit reset
+        headers may hold seconds or a unix timestamp and are only honoured
+        once the remaining budget reported by the server is spent.
+
+        :param response: Response object returned from an API request.
+        :return: delay in seconds, or None if the server did not ask for one
+        """
+        headers = response.headers
+        value: str = headers.get("Retry-After")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    date = parsedate_to_datetime(value)
+                except (TypeError, ValueError):
+                    return None
+                return max(0.0, date.timestamp() - time())
+        for prefix in ("X-RateLimit", "CB-RateLimit", "RateLimit"):
+            remaining: str = headers.get(f"{prefix}-Remaining")
+            reset: str = headers.get(f"{prefix}-Reset")
+            if reset is None or remaining not in ("0", None):
+                continue
+            try:
+                seconds: float = float(reset)
+            except ValueError:
+                return None
+            # values beyond a day are timestamps rather than deltas
+            if seconds > 86400:
+                seconds -= time()
+            return max(0.0, seconds)
+        return None
+
+
+def get_retries() -> dict[str, Retry]:
+    """Return the default retry policy for each HTTP method.
+
+    Idempotent requests are retried on rate limits, server errors and
+    connection failures. POST requests create resources such as orders and
+    transfers, so they are only retried when the server rejected them
+    without processing them: on a 429 or when the connection was never
+    established.
+
+    :return: Dictionary of Retry objects keyed by HTTP method.
+    """
+    idempotent: Retry = Retry()
+    return {
+        "GET": idempotent,
+        "PUT": idempotent,
+        "DELETE": idempotent,
+        "POST": Retry(statuses=(429,), errors=(ConnectTimeout,)),
+    }
@@ -0,0 +1,99 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from string import Formatter
+
+from time import time
+
+from urllib.parse import quote
+
+from coinbase.api import API
+
+from coinbase.auth import Auth
+
+
+class Route:
+    """An endpoint template compiled once and filled in per request.
+
+    The template is versioned and split into literal and variable parts up
+    front, and the URL prefix and the method are prepared for signing, so
+    a request only substitutes its values and signs them.
+
+    :param api: API instance the route belongs to.
+    :param method: The HTTP method of the route.
+    :param template: The endpoint, e.g. "/accounts/{account_id}/transactions".
+    """
+
+    def __init__(self, api: API, method: str, template: str):
+        self.__method: str = method.upper()
+        self.__signed: bytes = self.__method.encode("ascii")
+        self.__template: str = template
+        self.__rest: str = api.rest.rstrip("/")
+        self.__parts: tuple[tuple[str, str], ...] = tuple(
+            (literal, field)
+            for literal, field, _, _ in Formatter().parse(api.path(template))
+        )
+
+    @property
+    def method(self) -> str:
+        """Return the HTTP method of the route.
+
+        :return: HTTP method
+        """
+        return self.__method
+
+    @property
+    def template(self) -> str:
+        """Return the unversioned endpoint template.
+
+        :return: endpoint template
+        """
+        return self.__template
+
+    def path(self, **values) -> str:
+        """Return the versioned path with the variables filled in.
+
+        :param values: The value of every variable in the template.
+        :return: The versioned API path.
+        """
+        return "".join(
+            literal + (quote(str(values[field]), safe="") if field else "")
+            for literal, field in self.__parts
+        )
+
+    def url(self, path: str) -> str:
+        """Return the URL of a path returned by `path`.
+
+        :param path: The versioned path, including the query if any.
+        :return: The URL of the request.
+        """
+        return self.__rest + path
+
+    def stamp(self, auth: Auth, path: str, body: bytes = b"") -> dict:
+        """Return the headers that sign a request for this route made now.
+
+        :param auth: The authentication instance signing the request.
+        :param path: The versioned path, including the query if any.
+        :param body: (optional) The encoded request body.
+        :return: The headers for an authenticated request.
+        """
+        timestamp: str = str(int(time()))
+        signature: str = auth.sign(
+            timestamp.encode("ascii"),
+            self.__signed,
+            path.encode("ascii"),
+            body,
+        )
+        return auth.signed(timestamp, signature)
@@ -0,0 +1,222 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from collections import deque
+
+from enum import IntEnum
+
+from math import exp
+
+from threading import Condition
+
+from time import monotonic
+
+from coinbase.limiter import Limiter
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+
+    TRADING = 0
+    ACCOUNT = 1
+    MARKET = 2
+    BACKFILL = 3
+
+
+def get_shares() -> dict[Priority, float]:
+    """Return the default share of the rate budget of each class.
+
+    :return: Dictionary of budget shares keyed by priority.
+    """
+    return {
+        Priority.TRADING: 0.4,
+        Priority.ACCOUNT: 0.3,
+        Priority.MARKET: 0.2,
+        Priority.BACKFILL: 0.1,
+    }
+
+
+class Scheduler:
+    """Hand out a limiter's tokens to waiting requests by priority.
+
+    Requests wait in one queue per class. Whenever a token is available it
+    goes to the most urgent waiting class, unless that class has recently
+    used more than its share of the tokens handed out among the waiting
+    classes, in which case the next class within its share goes first.
+    A request that has waited longer than `patience` seconds is served
+    next regardless, so background classes are never starved.
+
+    :param limiter: The token bucket the tokens are drawn from.
+    :param shares: (optional) share of the budget of each class. Defaults to `get_shares()`.
+    :param patience: (optional) seconds a request waits before it is served ahead of its turn.
+    :param window: (optional) seconds over which recent usage decays.
+    """
+
+    def __init__(
+        self,
+        limiter: Limiter,
+        shares: dict[Priority, float] = None,
+        patience: float = 5.0,
+        window: float = 10.0,
+    ):
+        self.__limiter: Limiter = limiter
+        self.__shares: dict[Priority, float] = (
+            shares if shares else get_shares()
+        )
+        self.__patience: float = patience
+        self.__window: float = window
+        self.__condition: Condition = Condition()
+        self.__queues: dict[Priority, deque] = {p: deque() for p in Priority}
+        self.__usage: dict[Priority, float] = {p: 0.0 for p in Priority}
+        self.__granted: dict[Priority, int] = {p: 0 for p in Priority}
+        self.__stamp: float = monotonic()
+        self.__turn: list = None
+
+    @property
+    def limiter(self) -> Limiter:
+        """Return the token bucket the tokens are drawn from.
+
+        :return: rate limiter instance
+        """
+        return self.__limiter
+
+    @property
+    def shares(self) -> dict[Priority, float]:
+        """Return the share of the budget of each class.
+
+        :return: Dictionary of budget shares keyed by priority.
+        """
+        return self.__shares
+
+    @property
+    def patience(self) -> float:
+        """Return the seconds a request waits before it is served anyway.
+
+        :return: patience in seconds
+        """
+        return self.__patience
+
+    @property
+    def stats(self) -> dict:
+        """Return the number of tokens granted to and requests waiting in each class.
+
+        :return: A dictionary with `granted` and `waiting` counts keyed by priority name.
+        """
+        with self.__condition:
+            return {
+                "granted": {p.name: self.__granted[p] for p in Priority},
+                "waiting": {p.name: len(self.__queues[p]) for p in Priority},
+            }
+
+    def classify(self, method: str, path: str) -> Priority:
+        """Return the class of a request made without an explicit priority.
+
+        Requests that place, change or cancel orders and trades are trading
+        requests, reference and market data are market requests, and
+        everything else reads account state. Backfill is never inferred;
+        bulk jobs opt in with `Messenger.prioritize`.
+
+        :param method: The HTTP method of the request.
+        :param path: The versioned API path, without the query.
+        :return: The priority of the request.
+        """
+        segments: set = set(path.split("?")[0].strip("/").split("/"))
+        if "GET" != method.upper() and segments & {
+            "orders",
+            "buys",
+            "sells",
+            "trades",
+            "convert",
+        }:
+            return Priority.TRADING
+        if segments & {
+            "best_bid_ask",
+            "candles",
+            "currencies",
+            "exchange-rates",
+            "market",
+            "prices",
+            "product_book",
+            "products",
+            "ticker",
+            "time",
+        }:
+            return Priority.MARKET
+        return Priority.ACCOUNT
+
+    def __decay(self, now: float) -> None:
+        factor: float = exp(-(now - self.__stamp) / self.__window)
+        for priority in Priority:
+            self.__usage[priority] *= factor
+        self.__stamp = now
+
+    def __select(self) -> Priority:
+        waiting: list[Priority] = [p for p in Priority if self.__queues[p]]
+        if not waiting:
+            return None
+        now: float = monotonic()
+        oldest: Priority = min(waiting, key=lambda p: self.__queues[p][0][0])
+        if now - self.__queues[oldest][0][0] >= self.__patience:
+            return oldest
+        self.__decay(now)
+        used: float = sum(self.__usage[p] for p in waiting)
+        shares: float = sum(self.__shares.get(p, 0.0) for p in waiting)
+        for priority in waiting:
+            if used <= 0 or shares <= 0:
+                return priority
+            share: float = self.__shares.get(priority, 0.0) / shares
+            if self.__usage[priority] / used <= share:
+                return priority
+        return waiting[0]
+
+    def acquire(self, priority: Priority = Priority.ACCOUNT) -> float:
+        """Wait for a token as a request of the given class.
+
+        :param priority: (optional) the class of the request.
+        :return: the number of seconds spent waiting.
+        """
+        start: float = monotonic()
+        ticket: list = [start]
+        queue: deque = self.__queues[Priority(priority)]
+        with self.__condition:
+            queue.append(ticket)
+            try:
+                while True:
+                    selected: Priority = self.__select()
+                    head: list = self.__queues[selected][0]
+                    if head is not self.__turn:
+                        # wake the request whose turn it is now
+                        self.__turn = head
+                        self.__condition.notify_all()
+                    if head is not ticket:
+                        self.__condition.wait()
+                        continue
+                    delay: float = self.__limiter.take()
+                    if delay > 0:
+                        self.__condition.wait(delay)
+                        continue
+                    queue.popleft()
+                    self.__usage[selected] += 1
+                    self.__granted[selected] += 1
+                    return monotonic() - start
+            finally:
+                # a request that gave up leaves the queue
+                for index, item in enumerate(queue):
+                    if item is ticket:
+                        del queue[index]
+                        break
+                if self.__turn is ticket:
+                    self.__turn = None
+                self.__condition.notify_all()
@@ -16,16 +16,18 @@
 import base64
 import hashlib
 import hmac
-import json
 from dataclasses import dataclass, field
 from time import time
 
 from websocket import WebSocket, create_connection, enableTrace
 
+from coinbase.codec import Codec
+
 
 class Token:
     def __init__(self, wss: WSS = None):
         self.__wss = wss if wss else WSS()
+        self.__keyed: tuple[str, hmac.HMAC] = None
 
     def __call__(self) -> dict:
         timestamp = str(time())
@@ -36,10 +38,17 @@ class Token:
     def wss(self) -> WSS:
         return self.__wss
 
+    def keyed(self) -> hmac.HMAC:
+        secret = self.wss.secret
+        if self.__keyed is None or self.__keyed[0] != secret:
+            key = base64.b64decode(secret)
+            self.__keyed = (secret, hmac.new(key, digestmod=hashlib.sha256))
+        return self.__keyed[1]
+
     def signature(self, timestamp: str) -> bytes:
-        key = base64.b64decode(self.wss.secret)
         msg = f"{timestamp}GET/users/self/verify".encode("ascii")
-        sig = hmac.new(key, msg, hashlib.sha256)
+        sig = self.keyed().copy()
+        sig.update(msg)
         digest = sig.digest()
         b64signature = base64.b64encode(digest)
         return b64signature.decode("utf-8")
@@ -54,9 +63,10 @@ class Token:
 
 
 class Stream:
-    def __init__(self, token: Token = None):
+    def __init__(self, token: Token = None, codec: Codec = None):
         self.__token: Token = token if token else Token()
         self.__wss: WSS = self.__token.wss
+        self.__codec: Codec = codec if codec else Codec()
         self.socket: WebSocket = None
 
     @property
@@ -67,6 +77,10 @@ class Stream:
     def wss(self) -> WSS:
         return self.__wss
 
+    @property
+    def codec(self) -> Codec:
+        return self.__codec
+
     @property
     def auth(self) -> bool:
         return self.wss.key and self.wss.secret and self.wss.passphrase
@@ -87,13 +101,13 @@ class Stream:
 
     def send(self, message: dict) -> None:
         if self.connected:
-            self.socket.send(json.dumps(message))
+            self.socket.send(self.codec.encode(message))
 
     def receive(self) -> dict:
         if self.connected:
             payload = self.socket.recv()
             if payload:
-                return json.loads(payload)
+                return self.codec.decode(payload)
         return dict()
 
     def disconnect(self) -> bool:
@@ -110,5 +124,5 @@ def get_message() -> dict:
     }
 
 
-def get_stream(settings: dict = None) -> Stream:
-    return Stream(Token(WSS(settings)))
+def get_stream(settings: dict = None, codec: Codec = None) -> Stream:
+    return Stream(Token(WSS(settings)), codec)
@@ -0,0 +1,505 @@
+# teleprint-me/coinbase - Another Unofficial Python Wrapper for Coinbase
+# Copyright (C) 2021 Austin Berrio
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import asyncio
+import json
+
+from threading import Thread
+from threading import local
+
+from typing import Any
+from typing import Union
+
+from urllib.parse import urlsplit
+
+from requests import Response
+from requests import Session
+
+from requests.exceptions import ConnectionError
+from requests.exceptions import ConnectTimeout
+from requests.exceptions import HTTPError
+from requests.exceptions import ReadTimeout
+
+from requests.models import PreparedRequest
+
+from requests.structures import CaseInsensitiveDict
+
+from requests.utils import select_proxy
+
+from urllib3 import PoolManager
+
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.exceptions import HTTPError as TransportError
+from urllib3.exceptions import NewConnectionError
+from urllib3.exceptions import ReadTimeoutError
+
+from coinbase.pool import Resolver
+from coinbase.pool import get_pool_classes
+from coinbase.pool import get_pool_stats
+from coinbase.pool import get_socket_options
+from coinbase.pool import warm_pool
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+class Reply:
+    """A lightweight HTTP response holding the status, headers and body.
+
+    Provides the parts of `requests.Response` the client relies on, so
+    subscribers, retries and the cache handle it the same way.
+
+    :param status_code: The HTTP status code.
+    :param headers: The case-insensitive response headers.
+    :param content: The response body.
+    :param url: (optional) The URL that was requested.
+    :param reason: (optional) The HTTP reason phrase.
+    """
+
+    __slots__ = ("status_code", "headers", "content", "url", "reason", "json")
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Any,
+        content: bytes,
+        url: str = "",
+        reason: str = "",
+    ):
+        self.status_code: int = status_code
+        self.headers: Any = headers
+        self.content: bytes = content
+        self.url: str = url
+        self.reason: str = reason
+        # replaced by the messenger's codec, see `Codec.bind`
+        self.json = lambda **kwargs: json.loads(content)
+
+    @property
+    def ok(self) -> bool:
+        """Check if the status code is below 400.
+
+        :return: True if the request succeeded, False otherwise.
+        """
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        """Return the body decoded as UTF-8.
+
+        :return: The response body as text.
+        """
+        return self.content.decode("utf-8", "replace")
+
+    def raise_for_status(self) -> None:
+        """Raise an HTTPError if the status code is 400 or above.
+
+        :raises HTTPError: if the request failed.
+        """
+        if not self.ok:
+            raise HTTPError(
+                f"{self.status_code} {self.reason} for {self.url}",
+                response=self,
+            )
+
+
+Result = Union[Response, Reply]
+
+
+class Transport:
+    """The HTTP layer that sends the requests signed by a Messenger.
+
+    Subclasses implement `send` and may override `stats` and `close`.
+    Connection failures must be raised as `requests` exceptions so the
+    retry policies apply to every transport.
+    """
+
+    @property
+    def stats(self) -> dict:
+        """Return connection reuse statistics.
+
+        :return: A dictionary of pool statistics, see `get_pool_stats`.
+        """
+        return {}
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: bytes,
+        timeout: float,
+    ) -> Result:
+        """Send a request and return its response.
+
+        :param method: The HTTP method of the request.
+        :param url: The full URL, including the query string.
+        :param headers: The request headers, including the signature.
+        :param body: The encoded request body, empty if there is none.
+        :param timeout: The timeout in seconds.
+        :return: The response.
+        """
+        raise NotImplementedError
+
+    def warm(self, url: str, count: int = None) -> int:
+        """Open connections to the host of a URL ahead of the first request.
+
+        Transports that can not open connections on their own ignore it.
+
+        :param url: A URL on the host to connect to.
+        :param count: (optional) the number of connections. Defaults to the size of the pool.
+        :return: The number of connections that were opened.
+        """
+        return 0
+
+    def close(self) -> None:
+        """Release the connections held by the transport.
+
+        :return: None
+        """
+
+
+class SessionTransport(Transport):
+    """Send requests through a `requests` session and its adapters.
+
+    Requests are assembled directly instead of through
+    `Session.request`, and environment proxies are resolved once per host.
+
+    `requests` does not promise that a Session is thread-safe; sending
+    stores cookies and runs hooks on it. Each thread therefore sends
+    through its own session. These sessions share the settings of
+    `session` and its adapters, and with them a single connection pool.
+
+    :param session: (optional) The session whose settings and adapters every thread uses.
+    """
+
+    def __init__(self, session: Session = None):
+        self.__session: Session = session if session else Session()
+        self.__proxies: dict[str, dict] = {}
+        self.__local: local = local()
+
+    @property
+    def session(self) -> Session:
+        """Return the session whose settings and adapters are shared.
+
+        :return: session instance
+        """
+        return self.__session
+
+    def local(self) -> Session:
+        """Return the session used by the current thread.
+
+        :return: session instance
+        """
+        session: Session = getattr(self.__local, "session", None)
+        if session is None:
+            shared: Session = self.__session
+            session = Session()
+            # release the default adapters, the shared ones replace them
+            session.close()
+            for name in (
+                "adapters",
+                "auth",
+                "cert",
+                "headers",
+                "hooks",
+                "max_redirects",
+                "params",
+                "proxies",
+                "stream",
+                "trust_env",
+                "verify",
+            ):
+                setattr(session, name, getattr(shared, name))
+            self.__local.session = session
+        return session
+
+    @property
+    def stats(self) -> dict:
+        """Return connection reuse statistics of the session's adapters.
+
+        :return: A dictionary of pool statistics, see `get_pool_stats`.
+        """
+        adapters: dict = {
+            id(adapter): adapter
+            for adapter in self.__session.adapters.values()
+            if hasattr(adapter, "stats")
+        }
+        totals: dict = get_pool_stats(None)
+        for adapter in adapters.values():
+            for key, value in adapter.stats.items():
+                totals[key] += value
+        return totals
+
+    def proxies(self, url: str) -> dict:
+        """Return the proxies for the host of a URL.
+
+        :param url: The URL of the request.
+        :return: Dictionary of proxies keyed by scheme.
+        """
+        parts = urlsplit(url)
+        origin: str = f"{parts.scheme}://{parts.netloc}"
+        proxies: dict = self.__proxies.get(origin)
+        if proxies is None:
+            settings: dict = self.__session.merge_environment_settings(
+                origin, {}, None, None, None
+            )
+            proxies = self.__proxies[origin] = settings["proxies"]
+        return proxies
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: bytes,
+        timeout: float,
+    ) -> Response:
+        request: PreparedRequest = PreparedRequest()
+        request.method = method.upper()
+        request.url = url
+        request.headers = CaseInsensitiveDict(self.__session.headers)
+        request.headers.update(headers)
+        if body:
+            request.headers["Content-Length"] = str(len(body))
+            request.body = body
+        elif request.method not in ("GET", "HEAD"):
+            request.headers["Content-Length"] = "0"
+        session: Session = self.local()
+        # redirects are followed as before and store cookies on the request
+        request.prepare_cookies(session.cookies)
+        return session.send(
+            request, timeout=timeout, proxies=self.proxies(url)
+        )
+
+    def warm(self, url: str, count: int = None) -> int:
+        # connections through a proxy are opened by the proxy manager
+        if select_proxy(url, self.proxies(url)):
+            return 0
+        adapter = self.__session.get_adapter(url)
+        if not hasattr(adapter, "warm"):
+            return 0
+        return adapter.warm(
+            url, count, self.__session.verify, self.__session.cert
+        )
+
+    def close(self) -> None:
+        self.__session.close()
+
+
+class Urllib3Transport(Transport):
+    """Send requests straight through a urllib3 pool manager.
+
+    Skips the adapter, hook, cookie and redirect layers of `requests` and
+    returns a `Reply` instead of a `requests.Response`.
+
+    :param maxsize: (optional) the maximum number of connections kept per host.
+    :param block: (optional) wait for a free connection instead of opening a throwaway one.
+    :param socket_options: (optional) socket options for new connections. Defaults to `get_socket_options()`.
+    :param resolver: (optional) caches the addresses new connections are opened to. Disabled by default.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10,
+        block: bool = False,
+        socket_options: list = None,
+        resolver: Resolver = None,
+    ):
+        self.__maxsize: int = maxsize
+        self.__manager: PoolManager = PoolManager(
+            maxsize=maxsize,
+            block=block,
+            retries=False,
+            socket_options=(
+                socket_options
+                if socket_options is not None
+                else get_socket_options()
+            ),
+        )
+        if resolver is not None:
+            self.__manager.pool_classes_by_scheme = get_pool_classes(resolver)
+
+    @property
+    def manager(self) -> PoolManager:
+        """Return the urllib3 pool manager.
+
+        :return: pool manager instance
+        """
+        return self.__manager
+
+    @property
+    def stats(self) -> dict:
+        return get_pool_stats(self.__manager)
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: bytes,
+        timeout: float,
+    ) -> Reply:
+        try:
+            response = self.__manager.request(
+                method,
+                url,
+                body=body or None,
+                headers=headers,
+                timeout=timeout,
+                redirect=False,
+            )
+        # mirror how requests translates urllib3 errors
+        except NewConnectionError as error:
+            raise ConnectionError(error) from error
+        except ConnectTimeoutError as error:
+            raise ConnectTimeout(error) from error
+        except ReadTimeoutError as error:
+            raise ReadTimeout(error) from error
+        except TransportError as error:
+            raise ConnectionError(error) from error
+        return Reply(
+            response.status,
+            response.headers,
+            response.data,
+            url,
+            response.reason or "",
+        )
+
+    def warm(self, url: str, count: int = None) -> int:
+        pool = self.__manager.connection_from_url(url)
+        return warm_pool(pool, count if count else self.__maxsize)
+
+    def close(self) -> None:
+        self.__manager.clear()
+
+
+class HttpxTransport(Transport):
+    """Send requests through an httpx client, optionally over HTTP/2.
+
+    With HTTP/2 every concurrent request to a host is multiplexed over a
+    single connection instead of opening one connection per request in
+    flight. Requires the `http2` extra.
+
+    The synchronous httpx client drives a shared HTTP/2 connection from
+    every calling thread, which can put frames on the wire out of order.
+    Requests are therefore sent by an asynchronous client on an event loop
+    owned by the transport, and calling threads wait for their response.
+
+    :param http2: (optional) negotiate HTTP/2 with the server.
+    :param http1: (optional) allow HTTP/1.1. Disable it to speak HTTP/2 to a cleartext server with prior knowledge.
+    :param connections: (optional) the maximum number of connections.
+    """
+
+    def __init__(
+        self, http2: bool = True, http1: bool = True, connections: int = 10
+    ):
+        if httpx is None:
+            raise ImportError("HttpxTransport requires httpx to be installed")
+        self.__client = httpx.AsyncClient(
+            http1=http1,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=connections,
+            ),
+        )
+        self.__loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.__thread: Thread = Thread(
+            target=self.__loop.run_forever, daemon=True
+        )
+        self.__thread.start()
+        self.__requests: int = 0
+
+    @property
+    def client(self) -> Any:
+        """Return the asynchronous httpx client running on the event loop.
+
+        :return: httpx client instance
+        """
+        return self.__client
+
+    @property
+    def stats(self) -> dict:
+        """Return the number of open connections and requests sent.
+
+        :return: A dictionary of connection statistics.
+        """
+        # httpx does not expose its pool, read it defensively
+        pool = getattr(self.__client._transport, "_pool", None)
+        connections: list = list(getattr(pool, "connections", []))
+        return {
+            "pools": 1,
+            "connections": len(connections),
+            "requests": self.__requests,
+            "reused": max(0, self.__requests - len(connections)),
+        }
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: bytes,
+        timeout: float,
+    ) -> Any:
+        response = await self.__client.request(
+            method,
+            url,
+            content=body or None,
+            headers=headers,
+            timeout=timeout,
+        )
+        # only the event loop thread counts, no lock is needed
+        self.__requests += 1
+        return response
+
+    def send(
+        self,
+        method: str,
+        url: str,
+        headers: dict,
+        body: bytes,
+        timeout: float,
+    ) -> Reply:
+        future = asyncio.run_coroutine_threadsafe(
+            self.request(method, url, headers, body, timeout), self.__loop
+        )
+        try:
+            response = future.result()
+        except httpx.ConnectTimeout as error:
+            raise ConnectTimeout(error) from error
+        except httpx.TimeoutException as error:
+            raise ReadTimeout(error) from error
+        except httpx.TransportError as error:
+            raise ConnectionError(error) from error
+        return Reply(
+            response.status_code,
+            response.headers,
+            response.content,
+            url,
+            response.reason_phrase,
+        )
+
+    def close(self) -> None:
+        if self.__loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.__client.aclose(), self.__loop
+        ).result()
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
@@ -13,12 +13,83 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+
 from coinbase.api import API
 
 from coinbase.auth import Auth
 
+from coinbase.columns import Columns
+from coinbase.columns import to_columns
+
 from coinbase.messenger import Messenger
 from coinbase.messenger import Subscriber
+from coinbase.messenger import fan_out
+
+from coinbase.model import AccountRecord
+from coinbase.model import TradeRecord
+from coinbase.model import TransactionRecord
+
+from coinbase.scheduler import Priority
+
+
+class AccountSubscriber(Subscriber):
+    """Base class for resources that are listed per account.
+
+    Adds bulk methods that run `list` for many accounts concurrently, and
+    `sweep`, which exports one account's listing from both ends at once.
+    Subclasses name the listed resource in `resource`.
+
+    :param Subscriber: The subscriber class to inherit from.
+    :param messenger: Messenger object used to make API requests.
+    """
+
+    resource: str = ""
+
+    def iter_many(
+        self, account_ids: Iterable[str], data: dict = None, workers: int = 8
+    ) -> Iterator[tuple[str, list[dict]]]:
+        """List the resource for many accounts concurrently.
+
+        :param account_ids: The IDs of the accounts to list.
+        :param data: (optional) Query parameters applied to every account.
+        :param workers: (optional) the maximum number of accounts listed at once.
+        :return: An iterator of `(account_id, items)` tuples in completion order.
+        """
+        # the listings run on other threads, keep the caller's priority
+        priority: Priority = self.messenger.priority
+
+        def listing(account_id: str) -> list[dict]:
+            with self.messenger.prioritize(priority):
+                return self.list(account_id, data)
+
+        return fan_out(listing, account_ids, workers)
+
+    def list_many(
+        self, account_ids: Iterable[str], data: dict = None, workers: int = 8
+    ) -> dict[str, list[dict]]:
+        """List the resource for many accounts concurrently.
+
+        :param account_ids: The IDs of the accounts to list.
+        :param data: (optional) Query parameters applied to every account.
+        :param workers: (optional) the maximum number of accounts listed at once.
+        :return: A dictionary of items keyed by account ID.
+        """
+        return dict(self.iter_many(account_ids, data, workers))
+
+    def sweep(self, account_id: str, data: dict = None) -> list[dict]:
+        """List the resource for an account, walking it from both ends.
+
+        :param account_id: The ID of the account to list.
+        :param data: (optional) Query parameters, e.g. the page size.
+        :return: All items, newest first, see `Messenger.sweep`.
+        """
+        return self.messenger.sweep(
+            f"/accounts/{account_id}/{self.resource}", data
+        )
 
 
 class User(Subscriber):
@@ -66,14 +137,34 @@ class Account(Subscriber):
     :param messenger: Messenger object used to make API requests.
     """
 
-    def list(self, data: dict = None) -> list[dict]:
+    def list(self, data: dict = None, typed: bool = False) -> list:
         """Get a list of all accounts.
 
         :param data: Additional data to include in the request query parameters.
+        :param typed: (optional) return compact records instead of dictionaries, see `AccountRecord`.
         :return: A list of dictionaries representing the accounts.
         """
-        pages = self.messenger.page("/accounts", data)
-        return [result for page in pages for result in page.json()["data"]]
+        return list(self.iter(data, typed=typed))
+
+    def iter(
+        self,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+        typed: bool = False,
+    ) -> Iterator:
+        """Lazily iterate over all accounts, one page at a time.
+
+        :param data: Additional data to include in the request query parameters.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :param typed: (optional) return compact records instead of dictionaries, see `AccountRecord`.
+        :return: An iterator of dictionaries representing the accounts.
+        """
+        return self.messenger.iter_items(
+            "/accounts",
+            data,
+            until=until,
+            model=AccountRecord if typed else None,
+        )
 
     def get(self, account_id: str) -> dict:
         """Get a specific account.
@@ -101,13 +192,15 @@ class Account(Subscriber):
         return self.messenger.delete(f"/accounts/{account_id}").json()
 
 
-class Address(Subscriber):
+class Address(AccountSubscriber):
     """Interact with the Coinbase addresses API endpoints.
 
-    :param Subscriber: The subscriber class to inherit from.
+    :param AccountSubscriber: The subscriber class to inherit from.
     :param messenger: Messenger object used to make API requests.
     """
 
+    resource = "addresses"
+
     def list(self, account_id: str, data: dict = None) -> list[dict]:
         """Get a list of addresses for a given account.
 
@@ -115,8 +208,24 @@ class Address(Subscriber):
         :param data: Optional parameters for the API request.
         :return: List of dictionaries representing addresses.
         """
-        pages = self.messenger.page(f"/accounts/{account_id}/addresses", data)
-        return [result for page in pages for result in page.json()["data"]]
+        return list(self.iter(account_id, data))
+
+    def iter(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+    ) -> Iterator[dict]:
+        """Lazily iterate over the addresses for a given account.
+
+        :param account_id: The ID of the account to retrieve addresses for.
+        :param data: Optional parameters for the API request.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :return: Iterator of dictionaries representing addresses.
+        """
+        return self.messenger.iter_items(
+            f"/accounts/{account_id}/addresses", data, until=until
+        )
 
     def get(self, account_id: str, address_id: str) -> dict:
         """Get a specific address for a given account.
@@ -139,10 +248,28 @@ class Address(Subscriber):
         :param data: Optional parameters for the API request.
         :return: List of dictionaries representing transactions.
         """
-        pages = self.messenger.page(
-            f"/accounts/{account_id}/addresses/{address_id}/transactions", data
+        return list(self.iter_transactions(account_id, address_id, data))
+
+    def iter_transactions(
+        self,
+        account_id: str,
+        address_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+    ) -> Iterator[dict]:
+        """Lazily iterate over the transactions for a given address.
+
+        :param account_id: The ID of the account the address belongs to.
+        :param address_id: The ID of the address to retrieve transactions for.
+        :param data: Optional parameters for the API request.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :return: Iterator of dictionaries representing transactions.
+        """
+        return self.messenger.iter_items(
+            f"/accounts/{account_id}/addresses/{address_id}/transactions",
+            data,
+            until=until,
         )
-        return [tx for page in pages for tx in page.json()["data"]]
 
     def create(self, account_id: str, data: dict) -> dict:
         """Create a new address for a given account.
@@ -156,25 +283,69 @@ class Address(Subscriber):
         ).json()
 
 
-class Transaction(Subscriber):
+class Transaction(AccountSubscriber):
     """Interact with the Coinbase transaction API endpoints.
 
-    :param Subscriber: The subscriber class to inherit from.
+    :param AccountSubscriber: The subscriber class to inherit from.
     :param messenger: Messenger object used to make API requests.
     """
 
-    def list(self, account_id: str, data: dict = None) -> list[dict]:
+    resource = "transactions"
+
+    def list(
+        self, account_id: str, data: dict = None, typed: bool = False
+    ) -> list:
         """List all transactions for an account.
 
         :param account_id: Coinbase account id.
         :param data: Dictionary of query parameters.
+        :param typed: (optional) return compact records instead of dictionaries, see `TransactionRecord`.
 
         :return: List of transactions.
         """
-        pages = self.messenger.page(
-            f"/accounts/{account_id}/transactions", data
+        return list(self.iter(account_id, data, typed=typed))
+
+    def iter(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+        typed: bool = False,
+    ) -> Iterator:
+        """Lazily iterate over the transactions for an account.
+
+        :param account_id: Coinbase account id.
+        :param data: Dictionary of query parameters.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :param typed: (optional) return compact records instead of dictionaries, see `TransactionRecord`.
+
+        :return: Iterator of transactions.
+        """
+        return self.messenger.iter_items(
+            f"/accounts/{account_id}/transactions",
+            data,
+            until=until,
+            model=TransactionRecord if typed else None,
+        )
+
+    def columns(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+    ) -> Columns:
+        """Build columnar NumPy arrays of the transactions for an account.
+
+        Each page is converted as it streams in, see `to_columns`.
+
+        :param account_id: Coinbase account id.
+        :param data: (optional) Dictionary of query parameters.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :return: Columns of TransactionRecord fields keyed by name.
+        """
+        return to_columns(
+            self.iter(account_id, data, until), TransactionRecord
         )
-        return [tx for page in pages for tx in page.json()["data"]]
 
     def get(self, account_id: str, transaction_id: str) -> dict:
         """Get a transaction for a specific account.
@@ -237,22 +408,65 @@ class Transaction(Subscriber):
         ).json()
 
 
-class Buy(Subscriber):
+class Buy(AccountSubscriber):
     """Class for handling buy related API requests.
 
-    :param Subscriber: The subscriber class to inherit from.
+    :param AccountSubscriber: The subscriber class to inherit from.
     :param self.messenger: Messenger object used to make API requests.
     """
 
-    def list(self, account_id: str, data: dict = None) -> list[dict]:
+    resource = "buys"
+
+    def list(
+        self, account_id: str, data: dict = None, typed: bool = False
+    ) -> list:
         """Get a list of buys associated with an account.
 
         :param account_id: The id of the account to get buys for.
         :param data: (optional) Additional data to send with the API request.
+        :param typed: (optional) return compact records instead of dictionaries, see `TradeRecord`.
         :return: List of buy orders.
         """
-        pages = self.messenger.page(f"/accounts/{account_id}/buys", data)
-        return [result for page in pages for result in page.json()["data"]]
+        return list(self.iter(account_id, data, typed=typed))
+
+    def iter(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+        typed: bool = False,
+    ) -> Iterator:
+        """Lazily iterate over the buys associated with an account.
+
+        :param account_id: The id of the account to get buys for.
+        :param data: (optional) Additional data to send with the API request.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :param typed: (optional) return compact records instead of dictionaries, see `TradeRecord`.
+        :return: Iterator of buy orders.
+        """
+        return self.messenger.iter_items(
+            f"/accounts/{account_id}/buys",
+            data,
+            until=until,
+            model=TradeRecord if typed else None,
+        )
+
+    def columns(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+    ) -> Columns:
+        """Build columnar NumPy arrays of the buys for an account.
+
+        Each page is converted as it streams in, see `to_columns`.
+
+        :param account_id: The id of the account to get buys for.
+        :param data: (optional) Dictionary of query parameters.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :return: Columns of TradeRecord fields keyed by name.
+        """
+        return to_columns(self.iter(account_id, data, until), TradeRecord)
 
     def get(self, account_id: str, buy_id: str) -> dict:
         """Get a specific buy order for an account.
@@ -286,22 +500,65 @@ class Buy(Subscriber):
         ).json()
 
 
-class Sell(Subscriber):
+class Sell(AccountSubscriber):
     """Interact with the Coinbase sell API endpoints.
 
-    :param Subscriber: The base subscriber class
+    :param AccountSubscriber: The base subscriber class
     :param self.messenger: An instance of Messenger to send API requests
     """
 
-    def list(self, account_id: str, data: dict = None) -> list[dict]:
+    resource = "sells"
+
+    def list(
+        self, account_id: str, data: dict = None, typed: bool = False
+    ) -> list:
         """List all sells for an account.
 
         :param account_id: The identifier for the account.
         :param data: Query parameters for the request.
+        :param typed: (optional) return compact records instead of dictionaries, see `TradeRecord`.
         :return: A list of dictionaries containing information about each sell.
         """
-        pages = self.messenger.page(f"/accounts/{account_id}/sells", data)
-        return [result for page in pages for result in page.json()["data"]]
+        return list(self.iter(account_id, data, typed=typed))
+
+    def iter(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+        typed: bool = False,
+    ) -> Iterator:
+        """Lazily iterate over the sells for an account.
+
+        :param account_id: The identifier for the account.
+        :param data: Query parameters for the request.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :param typed: (optional) return compact records instead of dictionaries, see `TradeRecord`.
+        :return: An iterator of dictionaries containing information about each sell.
+        """
+        return self.messenger.iter_items(
+            f"/accounts/{account_id}/sells",
+            data,
+            until=until,
+            model=TradeRecord if typed else None,
+        )
+
+    def columns(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+    ) -> Columns:
+        """Build columnar NumPy arrays of the sells for an account.
+
+        Each page is converted as it streams in, see `to_columns`.
+
+        :param account_id: The identifier for the account.
+        :param data: (optional) Dictionary of query parameters.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :return: Columns of TradeRecord fields keyed by name.
+        """
+        return to_columns(self.iter(account_id, data, until), TradeRecord)
 
     def get(self, account_id: str, sell_id: str) -> dict:
         """Get information about a specific sell.
@@ -337,15 +594,17 @@ class Sell(Subscriber):
         ).json()
 
 
-class Deposit(Subscriber):
+class Deposit(AccountSubscriber):
     """Manage account deposits for an authenticated user.
 
-    :param Subscriber: The base subscriber class
+    :param AccountSubscriber: The base subscriber class
     :param self.messenger: An instance of Messenger to send API requests
 
     :return: JSON data returned from API requests.
     """
 
+    resource = "deposits"
+
     def list(self, account_id: str, data: dict = None) -> list[dict]:
         """Get a list of deposits for a given account.
 
@@ -354,8 +613,25 @@ class Deposit(Subscriber):
 
         :return: List of dictionaries representing each deposit.
         """
-        pages = self.messenger.page(f"/accounts/{account_id}/deposits", data)
-        return [deposit for page in pages for deposit in page.json()["data"]]
+        return list(self.iter(account_id, data))
+
+    def iter(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+    ) -> Iterator[dict]:
+        """Lazily iterate over the deposits for a given account.
+
+        :param account_id: ID of the account to retrieve deposits for.
+        :param data: (Optional) Query parameters to pass to the API request.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+
+        :return: Iterator of dictionaries representing each deposit.
+        """
+        return self.messenger.iter_items(
+            f"/accounts/{account_id}/deposits", data, until=until
+        )
 
     def get(self, account_id: str, deposit_id: str) -> dict:
         """Get details for a specific deposit.
@@ -394,13 +670,15 @@ class Deposit(Subscriber):
         ).json()
 
 
-class Withdraw(Subscriber):
+class Withdraw(AccountSubscriber):
     """Interact with the Coinbase Pro withdrawals API endpoints.
 
-    :param Subscriber: The subscriber class to inherit from.
+    :param AccountSubscriber: The subscriber class to inherit from.
     :param messenger: Messenger object used to make API requests.
     """
 
+    resource = "withdrawals"
+
     def list(self, account_id: str, data: dict = None) -> list[dict]:
         """List withdrawal history for an account.
 
@@ -408,10 +686,24 @@ class Withdraw(Subscriber):
         :param data: Additional data to pass to the API request.
         :return: A list of withdrawal records.
         """
-        pages = self.messenger.page(
-            f"/accounts/{account_id}/withdrawals", data
+        return list(self.iter(account_id, data))
+
+    def iter(
+        self,
+        account_id: str,
+        data: dict = None,
+        until: Callable[[dict], bool] = None,
+    ) -> Iterator[dict]:
+        """Lazily iterate over the withdrawal history for an account.
+
+        :param account_id: The ID of the account to list withdrawals for.
+        :param data: Additional data to pass to the API request.
+        :param until: (optional) predicate that ends the walk, see `Messenger.iter_items`.
+        :return: An iterator of withdrawal records.
+        """
+        return self.messenger.iter_items(
+            f"/accounts/{account_id}/withdrawals", data, until=until
         )
-        return [result for page in pages for result in page.json()["data"]]
 
     def get(self, account_id: str, withdrawal_id: str) -> dict:
         """Get a single withdrawal record for an account.
@@ -638,6 +930,27 @@ class Wallet:
         instance = cls(self.messenger)
         setattr(self, name, instance)
 
+    def gather(self, calls: Iterable[Callable[[], Any]]) -> list:
+        """Run independent calls concurrently and return their results.
+
+        For example, `wallet.gather([wallet.account.list, wallet.time.get])`
+        takes about as long as the slowest call rather than their sum.
+
+        :param calls: Functions without arguments, e.g. bound subscriber methods or lambdas.
+        :return: A list of results in the order of the calls.
+        """
+        return self.messenger.gather(calls)
+
+    def completed(
+        self, calls: Iterable[Callable[[], Any]]
+    ) -> Iterator[tuple[int, Any]]:
+        """Run independent calls concurrently as they complete.
+
+        :param calls: Functions without arguments, e.g. bound subscriber methods or lambdas.
+        :return: An iterator of `(index, result)` tuples in completion order.
+        """
+        return self.messenger.completed(calls)
+
 
 def get_wallet(settings: dict) -> Wallet:
     """Return a Wallet object for handling API requests.
@@ -0,0 +1,249 @@
+import json
+import socket
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from threading import Lock
+from threading import Thread
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+try:
+    from h2.config import H2Configuration
+    from h2.connection import H2Connection
+    from h2.events import DataReceived
+    from h2.events import RequestReceived
+    from h2.events import StreamEnded
+except ImportError:
+    H2Connection = None
+
+
+def paginated(items, per_page=None, cursor="starting_after", key="data"):
+    """Return a route serving a listing one page at a time.
+
+    `items` is a list, or a function returning the list for a request, e.g.
+    one per account. Pages hold `per_page` items, or as many as the request
+    asks for with `limit`.
+
+    With the `starting_after` cursor, pages look like v2 listings: `items`
+    are newest first unless the request asks for `order=asc`, and the
+    next page starts after the item whose `id` is the cursor. With the
+    `cursor` cursor, pages look like v3 listings under `key`, with
+    `has_next` and an opaque cursor.
+    """
+
+    def ident(item):
+        return str(item["id"] if isinstance(item, dict) else item)
+
+    def route(request):
+        query = request["query"]
+        listing = list(items(request) if callable(items) else items)
+        size = per_page or int(query.get("limit", len(listing) or 1))
+        if "cursor" == cursor:
+            start = int(query.get("cursor") or 0)
+            end = start + size
+            more = end < len(listing)
+            payload = {key: listing[start:end], "has_next": more}
+            payload["cursor"] = str(end) if more else ""
+            return 200, {}, payload
+        if "asc" == query.get("order"):
+            listing.reverse()
+        ids = [ident(item) for item in listing]
+        start = 0
+        if "starting_after" in query:
+            start = ids.index(query["starting_after"]) + 1
+        end = start + size
+        after = ids[end - 1] if end < len(listing) else None
+        pagination = {
+            "next_uri": f"/next/{after}" if after else None,
+            "next_starting_after": after,
+        }
+        return 200, {}, {"pagination": pagination, "data": listing[start:end]}
+
+    return route
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, avoid delayed ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def respond(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        request = {
+            "method": self.command,
+            "target": self.path,
+            "path": url.path,
+            "query": dict(parse_qsl(url.query)),
+            "headers": dict(self.headers),
+            "body": body,
+        }
+        self.server.record(request)
+        status, headers, payload = self.server.route(request)
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = respond
+
+
+class Server(ThreadingHTTPServer):
+    """A local stand-in for the Coinbase REST API.
+
+    `route` receives a dictionary describing each request and returns a
+    `(status, headers, payload)` tuple.
+    """
+
+    daemon_threads = True
+    # threaded tests open many connections at once, a full backlog drops
+    # their SYN and the client waits a second before it retries
+    request_queue_size = 128
+
+    def __init__(self, route):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.route = route
+        self.requests = []
+        self.lock = Lock()
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+
+    def record(self, request: dict) -> None:
+        with self.lock:
+            self.requests.append(request)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def settings(self) -> dict:
+        return {"key": "key", "secret": "secret", "rest": self.url}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+
+
+class H2Server:
+    """A cleartext HTTP/2 stand-in for the Coinbase REST API.
+
+    Clients must speak HTTP/2 with prior knowledge. Each stream is answered
+    on its own thread so slow routes do not hold up the others, and
+    `connections` counts the TCP connections that were accepted.
+    """
+
+    def __init__(self, route):
+        self.route = route
+        self.requests = []
+        self.connections = 0
+        self.lock = Lock()
+        self.socket = socket.create_server(("127.0.0.1", 0))
+        self.thread = Thread(target=self.serve, daemon=True)
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.socket.accept()
+            except OSError:
+                return
+            with self.lock:
+                self.connections += 1
+            Thread(target=self.handle, args=(conn,), daemon=True).start()
+
+    def handle(self, conn):
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        config = H2Configuration(client_side=False, header_encoding="utf-8")
+        h2 = H2Connection(config=config)
+        lock = Lock()
+        streams = {}
+        with lock:
+            h2.initiate_connection()
+            conn.sendall(h2.data_to_send())
+        while True:
+            try:
+                data = conn.recv(65535)
+            except OSError:
+                break
+            if not data:
+                break
+            with lock:
+                events = h2.receive_data(data)
+                for event in events:
+                    if isinstance(event, RequestReceived):
+                        streams[event.stream_id] = [dict(event.headers), b""]
+                    elif isinstance(event, DataReceived):
+                        streams[event.stream_id][1] += event.data
+                        h2.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id
+                        )
+                    elif isinstance(event, StreamEnded):
+                        headers, body = streams.pop(event.stream_id)
+                        Thread(
+                            target=self.respond,
+                            args=(
+                                conn,
+                                h2,
+                                lock,
+                                event.stream_id,
+                                headers,
+                                body,
+                            ),
+                            daemon=True,
+                        ).start()
+                conn.sendall(h2.data_to_send())
+        conn.close()
+
+    def respond(self, conn, h2, lock, stream_id, headers, body):
+        url = urlsplit(headers[":path"])
+        request = {
+            "method": headers[":method"],
+            "path": url.path,
+            "query": dict(parse_qsl(url.query)),
+            "headers": {k: v for k, v in headers.items() if k[0] != ":"},
+            "body": body,
+        }
+        with self.lock:
+            self.requests.append(request)
+        status, extra, payload = self.route(request)
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode("utf-8")
+        fields = [(":status", str(status))]
+        fields.extend((key.lower(), value) for key, value in extra.items())
+        fields.append(("content-type", "application/json"))
+        fields.append(("content-length", str(len(payload))))
+        with lock:
+            h2.send_headers(stream_id, fields)
+            h2.send_data(stream_id, payload, end_stream=True)
+            try:
+                conn.sendall(h2.data_to_send())
+            except OSError:
+                pass
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.socket.getsockname()[1]}"
+
+    @property
+    def settings(self) -> dict:
+        return {"key": "key", "secret": "secret", "rest": self.url}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.socket.close()
@@ -0,0 +1,330 @@
+import asyncio
+import hashlib
+import hmac
+import threading
+import pytest
+
+from decimal import Decimal
+
+from requests import HTTPError
+
+httpx = pytest.importorskip("httpx")
+
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.api import API
+from coinbase.api import AdvancedAPI
+from coinbase.auth import Auth
+from coinbase.limiter import FileLimiter
+from coinbase.limiter import Limiter
+from coinbase.model import OrderRecord
+from coinbase.model import TransactionRecord
+from coinbase.wallet import Transaction
+
+from coinbase.aio.advanced import AsyncAdvancedTrade
+from coinbase.aio.messenger import AsyncAdvancedMessenger
+from coinbase.aio.messenger import AsyncMessenger
+from coinbase.aio.messenger import gather
+from coinbase.aio.messenger import get_async_messenger
+from coinbase.aio.wallet import AsyncWallet
+from coinbase.aio.wallet import get_async_wallet
+
+listing = paginated([{"id": "a"}, {"id": "b"}], 1)
+
+
+class TestAsyncMessenger:
+    def test_signature(self):
+        def route(request):
+            return 200, {}, {"data": {"path": request["path"]}}
+
+        async def main(server):
+            async with get_async_messenger(server.settings) as messenger:
+                response = await messenger.post("/orders", {"size": "1"})
+            return response
+
+        with Server(route) as server:
+            response = asyncio.run(main(server))
+        assert 200 == response.status_code
+        request = server.requests[0]
+        headers = request["headers"]
+        message = (
+            headers["CB-ACCESS-TIMESTAMP"]
+            + "POST/v2/orders"
+            + request["body"].decode("utf-8")
+        )
+        signature = hmac.new(
+            b"secret", message.encode("ascii"), hashlib.sha256
+        ).hexdigest()
+        assert signature == headers["CB-ACCESS-SIGN"]
+        assert "key" == headers["CB-ACCESS-KEY"]
+
+    def test_page(self):
+        async def main(server):
+            messenger = AsyncMessenger(Auth(API(server.settings)), Limiter())
+            ids = []
+            async for response in messenger.page("/accounts"):
+                ids += [item["id"] for item in response.json()["data"]]
+            await messenger.close()
+            return ids
+
+        with Server(listing) as server:
+            assert ["a", "b"] == asyncio.run(main(server))
+
+    def test_retry(self):
+        statuses = [503, 200]
+
+        def route(request):
+            return statuses.pop(0), {"Retry-After": "0"}, {}
+
+        async def main(server):
+            messenger = AsyncMessenger(Auth(API(server.settings)), Limiter())
+            response = await messenger.get("/time")
+            await messenger.close()
+            return response
+
+        with Server(route) as server:
+            assert 200 == asyncio.run(main(server)).status_code
+        assert 2 == len(server.requests)
+
+    def test_advanced_get_sends_query(self):
+        with Server(lambda request: (200, {}, {})) as server:
+
+            async def main():
+                messenger = AsyncAdvancedMessenger(
+                    Auth(API(server.settings)), Limiter()
+                )
+                await messenger.get("/products", {"limit": 1})
+                await messenger.close()
+
+            asyncio.run(main())
+        assert {"limit": "1"} == server.requests[0]["query"]
+        assert b"" == server.requests[0]["body"]
+
+    def test_page_copies_data(self):
+        async def main(messenger, path, data):
+            async for _ in messenger.page(path, data):
+                pass
+            await messenger.close()
+
+        data = {"order": "asc"}
+        with Server(listing) as server:
+            messenger = AsyncMessenger(Auth(API(server.settings)), Limiter())
+            asyncio.run(main(messenger, "/accounts", data))
+        assert {"order": "asc"} == data
+        assert [
+            {"order": "asc", "limit": "100"},
+            {"order": "asc", "limit": "100", "starting_after": "b"},
+        ] == [request["query"] for request in server.requests]
+
+    def test_advanced_page(self):
+        async def main(messenger):
+            pages = []
+            for path in ("/accounts", "/products", "/fills"):
+                async for response in messenger.page(path, None):
+                    pages.append(response.json()["data"])
+            await messenger.close()
+            return pages
+
+        def route(request):
+            if request["path"].endswith("/fills"):
+                return 200, {}, {"data": ["f"], "cursor": ""}
+            return paginated(["a", "b"], 1, "cursor")(request)
+
+        with Server(route) as server:
+            messenger = AsyncAdvancedMessenger(
+                Auth(AdvancedAPI(server.settings)), Limiter()
+            )
+            pages = asyncio.run(main(messenger))
+        assert [["a"], ["b"], ["a"], ["b"], ["f"]] == pages
+        limits = [request["query"]["limit"] for request in server.requests]
+        assert ["250", "250", "100", "100", "100"] == limits
+
+    def test_file_limiter_runs_off_the_event_loop(self, tmp_path):
+        threads = []
+
+        class Recording(FileLimiter):
+            def reserve(self, tokens: float = 1) -> float:
+                threads.append(threading.current_thread())
+                return super().reserve(tokens)
+
+        async def main(server):
+            limiter = Recording(str(tmp_path / "bucket"))
+            messenger = AsyncMessenger(Auth(API(server.settings)), limiter)
+            await messenger.get("/time")
+            await messenger.close()
+
+        with Server(lambda request: (200, {}, {})) as server:
+            asyncio.run(main(server))
+        assert 1 == len(threads)
+        assert threading.main_thread() is not threads[0]
+
+
+class TestAsyncWallet:
+    def test_list(self):
+        async def main(server):
+            wallet = get_async_wallet(server.settings)
+            accounts = await wallet.account.list()
+            await wallet.messenger.close()
+            return accounts
+
+        with Server(listing) as server:
+            assert [{"id": "a"}, {"id": "b"}] == asyncio.run(main(server))
+
+    def test_mirrors_sync_subscribers(self):
+        async def main(server):
+            wallet = get_async_wallet(server.settings)
+            records = await wallet.transaction.list("1", None, True)
+            sold = await wallet.sell.commit("1", "s")
+            await wallet.messenger.close()
+            assert Transaction.list.__doc__ == wallet.transaction.list.__doc__
+            return records, sold
+
+        with Server(listing) as server:
+            records, sold = asyncio.run(main(server))
+        assert ["a", "b"] == [record.id for record in records]
+        assert all(isinstance(r, TransactionRecord) for r in records)
+        assert [{"id": "a"}] == sold["data"]
+        assert ("POST", "/v2/accounts/1/sells/s/commit") == (
+            server.requests[-1]["method"],
+            server.requests[-1]["path"],
+        )
+
+    def test_failed_page_raises(self):
+        async def main(server):
+            wallet = get_async_wallet(server.settings)
+            try:
+                await wallet.account.list()
+            finally:
+                await wallet.messenger.close()
+
+        with Server(lambda request: (401, {}, {"errors": []})) as server:
+            with pytest.raises(HTTPError) as error:
+                asyncio.run(main(server))
+        assert 401 == error.value.response.status_code
+
+    def test_gather(self):
+        def route(request):
+            return 200, {}, {"data": {"path": request["path"]}}
+
+        async def main(server):
+            limiter = Limiter(rate=1000, capacity=100)
+            wallet = AsyncWallet(
+                AsyncMessenger(Auth(API(server.settings)), limiter)
+            )
+            pairs = ["BTC-USD", "ETH-USD", "SOL-USD"]
+            results = await wallet.gather(
+                *(wallet.price.spot(pair) for pair in pairs), limit=2
+            )
+            await wallet.messenger.close()
+            return results
+
+        with Server(route) as server:
+            results = asyncio.run(main(server))
+        assert [
+            "/v2/prices/BTC-USD/spot",
+            "/v2/prices/ETH-USD/spot",
+            "/v2/prices/SOL-USD/spot",
+        ] == [result["data"]["path"] for result in results]
+
+    def test_trade(self):
+        def route(request):
+            return 200, {}, {"path": request["path"]}
+
+        async def main(server):
+            trade = AsyncAdvancedTrade(
+                AsyncMessenger(Auth(API(server.settings)), Limiter())
+            )
+            result = await trade.product.get("BTC-USD")
+            await trade.messenger.close()
+            return result
+
+        with Server(route) as server:
+            assert {"path": "/v2/products/BTC-USD"} == asyncio.run(
+                main(server)
+            )
+
+
+class TestAsyncAdvancedTrade:
+    def test_orders_use_compiled_routes(self, monkeypatch):
+        def route(request):
+            return 200, {}, {"path": request["path"]}
+
+        async def main(server):
+            trade = AsyncAdvancedTrade(
+                AsyncAdvancedMessenger(
+                    Auth(AdvancedAPI(server.settings)), Limiter()
+                )
+            )
+            # a compiled route never versions its path through the API
+            monkeypatch.setattr(trade.messenger.api, "url", None)
+            results = [
+                await trade.order.post({"side": "BUY"}),
+                await trade.order.get("a/b"),
+                await trade.order.cancel("c"),
+            ]
+            await trade.messenger.close()
+            return results
+
+        with Server(route) as server:
+            results = asyncio.run(main(server))
+        assert [
+            "/api/v3/brokerage/orders",
+            "/api/v3/brokerage/orders/a%2Fb",
+            "/api/v3/brokerage/orders/c",
+        ] == [result["path"] for result in results]
+        assert ["POST", "GET", "DELETE"] == [
+            request["method"] for request in server.requests
+        ]
+        assert b'{"side":"BUY"}' == server.requests[0]["body"].replace(
+            b" ", b""
+        )
+
+    def test_mirrors_sync_subscribers(self):
+        orders = [{"order_id": str(i)} for i in range(5)]
+        candles = {"candles": [{"start": "1", "low": "2"}]}
+
+        def route(request):
+            if request["path"].endswith("/candles"):
+                return 200, {}, candles
+            if request["path"].endswith("/crypto"):
+                return 200, {}, {"id": "w"}
+            return paginated(orders, 2, "cursor", "orders")(request)
+
+        async def main(server):
+            trade = AsyncAdvancedTrade(
+                AsyncAdvancedMessenger(
+                    Auth(AdvancedAPI(server.settings)), Limiter()
+                )
+            )
+            records = await trade.order.iter(
+                None, lambda order: "3" == order["order_id"], True
+            )
+            candle = await trade.product.candles("BTC-USD", typed=True)
+            withdrawal = await trade.transfer.withdraw_to_address({})
+            await trade.messenger.close()
+            return records, candle, withdrawal
+
+        with Server(route) as server:
+            records, candle, withdrawal = asyncio.run(main(server))
+        assert ["0", "1", "2"] == [record.order_id for record in records]
+        assert all(isinstance(r, OrderRecord) for r in records)
+        assert [Decimal("2")] == [record.low for record in candle]
+        assert {"id": "w"} == withdrawal
+
+
+def test_gather_limit():
+    running = 0
+    peak = 0
+
+    async def call(value):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return value
+
+    results = asyncio.run(gather(*(call(n) for n in range(10)), limit=3))
+    assert list(range(10)) == results
+    assert 3 == peak
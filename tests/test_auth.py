@@ -1,3 +1,6 @@
+import hashlib
+import hmac
+import json
 import pytest
 import requests
 
@@ -8,6 +11,11 @@ from coinbase.api import AdvancedAPI
 from coinbase.api import WebSocketAPI
 
 from coinbase.auth import Auth
+from coinbase.codec import Codec
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+
+from tests.server import Server
 
 
 class TestAuth:
@@ -83,3 +91,55 @@ class TestAdvancedAuth:
 
         payload = response.json()
         assert "product_id" in payload and "price" in payload
+
+
+class TestSigning:
+    def test_signature(self):
+        auth = Auth(API({"key": "key", "secret": "secret"}))
+        message = "1680000000GET/v2/accounts"
+        expected = hmac.new(
+            b"secret", message.encode("ascii"), hashlib.sha256
+        ).hexdigest()
+        assert expected == auth.signature(message)
+        assert expected == auth.signature(message)
+        assert auth.keyed() is auth.keyed()
+
+    def test_secret_change(self):
+        api = API({"key": "key", "secret": "secret"})
+        auth = Auth(api)
+        auth.signature("message")
+        api.settings["secret"] = "other"
+        expected = hmac.new(b"other", b"message", hashlib.sha256).hexdigest()
+        assert expected == auth.signature("message")
+
+    def test_static_header(self):
+        auth = Auth(API({"key": "key", "secret": "secret"}))
+        assert auth.static() is auth.static()
+        header = auth.header("1680000000", "message")
+        assert "key" == header["CB-ACCESS-KEY"]
+        assert "1680000000" == header["CB-ACCESS-TIMESTAMP"]
+        assert "CB-ACCESS-SIGN" not in auth.static()
+
+    def test_sign_parts(self):
+        auth = Auth(API({"key": "key", "secret": "secret"}))
+        assert auth.signature("abc") == auth.sign(b"a", b"bc")
+        assert auth.signature("é") == auth.sign("é".encode("utf-8"))
+
+    def test_signs_body_as_sent(self):
+        with Server(lambda request: (200, {}, {})) as server:
+            codec = Codec(lambda value: json.dumps(value, ensure_ascii=False))
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), {}, codec=codec
+            )
+            messenger.post("/transactions", {"description": "café ☕"})
+        request = server.requests[0]
+        assert "café ☕".encode("utf-8") in request["body"]
+        message = b"".join(
+            (
+                request["headers"]["CB-ACCESS-TIMESTAMP"].encode("ascii"),
+                b"POST/v2/transactions",
+                request["body"],
+            )
+        )
+        expected = hmac.new(b"secret", message, hashlib.sha256).hexdigest()
+        assert expected == request["headers"]["CB-ACCESS-SIGN"]
@@ -0,0 +1,216 @@
+from time import sleep
+
+from requests import Response
+
+from tests.server import Server
+
+from coinbase.api import API
+from coinbase.api import AdvancedAPI
+from coinbase.auth import Auth
+from coinbase.cache import Cache
+from coinbase.cache import match
+from coinbase.cache import validators
+from coinbase.limiter import Limiter
+from coinbase.messenger import AdvancedMessenger
+from coinbase.messenger import Messenger
+from coinbase.wallet import Wallet
+
+
+def response(status: int = 200, headers: dict = None) -> Response:
+    result = Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    result._content = b'{"data": []}'
+    return result
+
+
+class TestCache:
+    def test_match(self):
+        assert match("/products", "/products")
+        assert match("/products/*", "/products/BTC-USD")
+        assert not match("/products/*", "/products/BTC-USD/ticker")
+        assert not match("/products/*", "/products")
+
+    def test_ttl(self):
+        cache = Cache()
+        assert cache.ttl("/currencies") > 0
+        assert cache.ttl("/products/BTC-USD") > 0
+        assert cache.ttl("/products/BTC-USD/book") is None
+        assert 0 == cache.ttl("/accounts")
+        assert cache.ttl("/accounts/1/transactions") is None
+
+    def test_key(self):
+        assert Cache.key("/a", {"x": 1, "y": 2}) == Cache.key(
+            "/a", {"y": 2, "x": 1}
+        )
+        assert Cache.key("/a") != Cache.key("/a", {"x": 1})
+
+    def test_expires(self):
+        cache = Cache({"/a": 0.05})
+        key = cache.key("/a")
+        cache.set(key, response(), 0.05)
+        assert cache.get(key) is not None
+        sleep(0.06)
+        assert cache.get(key) is None
+        assert 0 == len(cache)
+        assert 1 == cache.stats["hits"]
+        assert 1 == cache.stats["misses"]
+
+    def test_evicts_least_recently_used(self):
+        cache = Cache(maxsize=2)
+        for path in ("/a", "/b"):
+            cache.set(cache.key(path), response(), 60)
+        cache.get(cache.key("/a"))
+        cache.set(cache.key("/c"), response(), 60)
+        assert 2 == len(cache)
+        assert cache.get(cache.key("/b")) is None
+        assert cache.get(cache.key("/a")) is not None
+
+    def test_invalidate(self):
+        cache = Cache()
+        for path in ("/products", "/products/BTC-USD", "/currencies"):
+            cache.set(cache.key(path), response(), 60)
+        assert 1 == cache.invalidate("/products/*")
+        assert 2 == len(cache)
+        assert 2 == cache.invalidate()
+        assert 0 == len(cache)
+
+    def test_validators(self):
+        headers = {"ETag": '"abc"', "Last-Modified": "Mon, 01 Jan 2024"}
+        assert {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        } == validators(response(200, headers))
+        assert {} == validators(response())
+
+    def test_keeps_stale_entries_with_validators(self):
+        cache = Cache()
+        key = cache.key("/accounts")
+        cache.set(key, response(), 0)
+        assert 0 == len(cache)
+        cache.set(key, response(200, {"ETag": '"abc"'}), 0)
+        assert cache.get(key) is None
+        assert cache.stale(key) is not None
+        assert cache.revalidate(key, 60) is cache.get(key)
+        assert 1 == cache.stats["revalidated"]
+
+    def test_decodes_once(self):
+        cache = Cache()
+        key = cache.key("/currencies")
+        cache.set(key, response(), 60)
+        assert cache.get(key).json() is cache.get(key).json()
+
+
+def reference(request):
+    return 200, {}, {"data": [request["path"]]}
+
+
+class TestMessengerCache:
+    def test_serves_reference_data_from_memory(self):
+        with Server(reference) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), cache=Cache()
+            )
+            wallet = Wallet(messenger)
+            for _ in range(3):
+                assert wallet.currency.get()["data"]
+                assert wallet.exchange.rates()
+            messenger.get("/currencies", refresh=True)
+            messenger.cache.invalidate("/exchange-rates")
+            wallet.exchange.rates()
+        paths = [request["path"] for request in server.requests]
+        assert 2 == paths.count("/v2/currencies")
+        assert 2 == paths.count("/v2/exchange-rates")
+
+    def test_keys_on_parameters(self):
+        with Server(reference) as server:
+            messenger = AdvancedMessenger(
+                Auth(AdvancedAPI(server.settings)), Limiter(), cache=Cache()
+            )
+            messenger.get("/products", {"limit": 1})
+            messenger.get("/products", {"limit": 2})
+            messenger.get("/products", {"limit": 1})
+        assert 2 == len(server.requests)
+
+    def test_shared_between_keys_and_versions(self):
+        with Server(reference) as server:
+            cache = Cache()
+            other = {**server.settings, "key": "other"}
+            first = Messenger(
+                Auth(API(server.settings)), Limiter(), cache=cache
+            )
+            second = Messenger(Auth(API(other)), Limiter(), cache=cache)
+            advanced = AdvancedMessenger(
+                Auth(AdvancedAPI(server.settings)), Limiter(), cache=cache
+            )
+            for _ in range(2):
+                first.get("/payment-methods")
+                second.get("/payment-methods")
+            v2 = first.get("/currencies").json()["data"]
+            v3 = advanced.get("/currencies").json()["data"]
+        assert ["/v2/currencies"] == v2
+        assert ["/api/v3/brokerage/currencies"] == v3
+        keys = [r["headers"]["CB-ACCESS-KEY"] for r in server.requests[:2]]
+        assert ["key", "other"] == keys
+        assert 4 == len(server.requests)
+
+    def test_skips_errors_and_other_routes(self):
+        with Server(lambda request: (404, {}, {})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), {}, cache=Cache()
+            )
+            messenger.get("/currencies")
+            messenger.get("/currencies")
+            messenger.post("/currencies")
+        assert 3 == len(server.requests)
+
+    def test_disabled_by_default(self):
+        with Server(reference) as server:
+            messenger = Messenger(Auth(API(server.settings)), Limiter())
+            messenger.get("/currencies")
+            messenger.get("/currencies")
+        assert messenger.cache is None
+        assert 2 == len(server.requests)
+
+
+class TestMessengerRevalidation:
+    def test_not_modified_reuses_payload(self):
+        def route(request):
+            if '"v1"' == request["headers"].get("If-None-Match"):
+                return 304, {"ETag": '"v1"'}, b""
+            return 200, {"ETag": '"v1"'}, {"data": [{"id": "a"}]}
+
+        with Server(route) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), cache=Cache()
+            )
+            first = messenger.get("/accounts").json()
+            second = messenger.get("/accounts")
+            assert 200 == second.status_code
+            assert first is second.json()
+            assert 1 == messenger.cache.stats["revalidated"]
+        assert [None, '"v1"'] == [
+            request["headers"].get("If-None-Match")
+            for request in server.requests
+        ]
+
+    def test_modified_replaces_entry(self):
+        versions = [1, 2]
+
+        def route(request):
+            version = versions[0] if len(versions) == 1 else versions.pop(0)
+            modified = f"Mon, 0{version} Jan 2024 00:00:00 GMT"
+            return 200, {"Last-Modified": modified}, {"data": [version]}
+
+        with Server(route) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), cache=Cache()
+            )
+            assert [1] == messenger.get("/accounts").json()["data"]
+            assert [2] == messenger.get("/accounts").json()["data"]
+            messenger.get("/accounts", refresh=True)
+        conditions = [
+            request["headers"].get("If-Modified-Since")
+            for request in server.requests
+        ]
+        assert [None, "Mon, 01 Jan 2024 00:00:00 GMT", None] == conditions
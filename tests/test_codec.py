@@ -0,0 +1,115 @@
+import json
+import pytest
+
+from requests import Response
+
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.api import API
+from coinbase.auth import Auth
+from coinbase.cache import Cache
+from coinbase.codec import Codec
+from coinbase.codec import get_codec
+from coinbase.flight import SingleFlight
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+
+
+class Counter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, body):
+        self.count += 1
+        return json.loads(body)
+
+
+class TestCodec:
+    @pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+    def test_round_trip(self, name):
+        try:
+            codec = get_codec(name)
+        except ValueError:
+            pytest.skip(f"{name} is not installed")
+        assert name == codec.name
+        value = {"data": [{"id": "a", "amount": "1.5"}], "limit": 25}
+        body = codec.encode(value)
+        assert isinstance(body, bytes)
+        assert value == codec.decode(body)
+
+    def test_default(self):
+        assert "json" == Codec().name
+        assert get_codec().name in ("json", "orjson", "msgspec")
+
+    def test_unknown(self):
+        with pytest.raises(ValueError):
+            get_codec("yaml")
+
+    def test_bind_decodes_once(self):
+        loads = Counter()
+        response = Response()
+        response._content = b'{"data": []}'
+        Codec(loads=loads).bind(response)
+        assert response.json() is response.json()
+        assert 1 == loads.count
+
+
+class Malformed(Exception):
+    pass
+
+
+def strict(body):
+    try:
+        return json.loads(body)
+    except ValueError as error:
+        raise Malformed(str(error))
+
+
+paginate = paginated([{"id": str(n)} for n in range(3)], 1)
+
+
+class TestMessengerCodec:
+    def test_encodes_body(self):
+        def dumps(value):
+            return json.dumps(value, separators=(",", ":"))
+
+        with Server(lambda request: (200, {}, {})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), codec=Codec(dumps)
+            )
+            messenger.post("/orders", {"size": "1", "side": "buy"})
+            messenger.delete("/orders")
+        assert b'{"size":"1","side":"buy"}' == server.requests[0]["body"]
+        assert "application/json" == server.requests[0]["headers"].get(
+            "Content-Type"
+        )
+        assert b"" == server.requests[1]["body"]
+
+    def test_decodes_each_page_once(self):
+        loads = Counter()
+        with Server(paginate) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), codec=Codec(loads=loads)
+            )
+            pages = messenger.page("/accounts")
+            items = [item for page in pages for item in page.json()["data"]]
+            assert ["0", "1", "2"] == [item["id"] for item in items]
+            assert 3 == loads.count
+            assert 3 == len(list(messenger.iter_items("/accounts")))
+            assert 6 == loads.count
+
+    def test_shared_invalid_body(self):
+        codec = Codec(loads=strict, errors=(Malformed,))
+        with Server(lambda request: (200, {}, b"<html>")) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(),
+                cache=Cache(),
+                flight=SingleFlight(),
+                codec=codec,
+            )
+            response = messenger.get("/currencies")
+            assert 200 == response.status_code
+            with pytest.raises(Malformed):
+                response.json()
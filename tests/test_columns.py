@@ -0,0 +1,91 @@
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.advanced import AdvancedTrade
+from coinbase.columns import get_schema
+from coinbase.columns import to_columns
+from coinbase.limiter import Limiter
+from coinbase.messenger import get_advanced_messenger
+from coinbase.messenger import get_messenger
+from coinbase.model import CandleRecord
+from coinbase.model import FillRecord
+from coinbase.model import TransactionRecord
+from coinbase.wallet import Wallet
+
+
+def transaction(index: int) -> dict:
+    return {
+        "id": f"tx-{index}",
+        "type": ["send", "buy"][index % 2],
+        "status": "completed",
+        "amount": {"amount": f"{index}.5", "currency": "BTC"},
+        "created_at": f"2023-03-01T00:00:{index:02d}Z",
+    }
+
+
+class TestColumns:
+    def test_schema(self):
+        schema = get_schema(TransactionRecord)
+        assert "amount" == schema["amount"]
+        assert "time" == schema["created_at"]
+        assert "category" == schema["type"]
+        assert "object" == schema["id"]
+        assert "epoch" == get_schema(CandleRecord)["start"]
+
+    def test_to_columns(self):
+        items = (transaction(index) for index in range(5))
+        columns = to_columns(items, TransactionRecord, chunk=2)
+        assert 5 == columns.rows
+        assert numpy.float64 == columns["amount"].dtype
+        assert [0.5, 1.5, 2.5, 3.5, 4.5] == columns["amount"].tolist()
+        assert numpy.isnan(columns["native_amount"]).all()
+        assert numpy.int32 == columns["type"].dtype
+        assert ["send", "buy"] == columns.categories["type"]
+        assert ["send", "buy", "send"] == columns.decode("type")[:3].tolist()
+        created = columns["created_at"]
+        assert numpy.int64 == created.dtype
+        assert 1_000_000_000 == created[1] - created[0]
+        assert 1677628800 * 1_000_000_000 == created[0]
+        assert "tx-4" == columns.to_records()[4].id
+
+    def test_empty_amount(self):
+        items = [transaction(1), transaction(2)]
+        items[1]["amount"]["amount"] = ""
+        columns = to_columns(items, TransactionRecord)
+        assert 1.5 == columns["amount"][0]
+        assert numpy.isnan(columns["amount"][1])
+
+    def test_empty(self):
+        columns = to_columns(iter([]), FillRecord)
+        assert 0 == columns.rows
+        assert set(FillRecord.paths) == set(columns)
+
+
+class TestSubscriberColumns:
+    def test_transactions_stream_pages(self):
+        listing = paginated([transaction(index) for index in range(6)], 2)
+        with Server(listing) as server:
+            wallet = Wallet(get_messenger(server.settings, Limiter()))
+            columns = wallet.transaction.columns("a")
+        assert 6 == columns.rows
+        assert 3 == len(server.requests)
+
+    def test_candles(self):
+        candles = [
+            {"start": "1677628800", "low": "1", "high": "2", "close": "1.5"}
+        ]
+
+        def route(request):
+            return 200, {}, {"candles": candles}
+
+        with Server(route) as server:
+            trade = AdvancedTrade(
+                get_advanced_messenger(server.settings, Limiter())
+            )
+            columns = trade.product.candle_columns("BTC-USD")
+        assert [1677628800 * 1_000_000_000] == columns["start"].tolist()
+        assert [1.5] == columns["close"].tolist()
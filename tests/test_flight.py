@@ -0,0 +1,153 @@
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from time import sleep
+
+from tests.server import Server
+
+from coinbase.api import API
+from coinbase.api import AdvancedAPI
+from coinbase.auth import Auth
+from coinbase.cache import Cache
+from coinbase.flight import SingleFlight
+from coinbase.limiter import Limiter
+from coinbase.messenger import AdvancedMessenger
+from coinbase.messenger import Messenger
+from coinbase.wallet import Wallet
+
+
+class TestSingleFlight:
+    def test_shares_result(self):
+        flight = SingleFlight()
+        started = Event()
+        release = Event()
+        calls = []
+
+        def call():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return object()
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(flight.do, "key", call)
+            started.wait()
+            followers = [
+                executor.submit(flight.do, "key", call) for _ in range(4)
+            ]
+            while flight.shared < 4:
+                sleep(0.01)
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+        assert 1 == len(calls)
+        assert all(result is results[0] for result in results)
+
+    def test_shares_exception(self):
+        flight = SingleFlight()
+        started = Event()
+        release = Event()
+
+        def call():
+            started.set()
+            release.wait()
+            raise ValueError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", call)
+            started.wait()
+            follower = executor.submit(flight.do, "key", call)
+            while flight.shared < 1:
+                sleep(0.01)
+            release.set()
+            for future in (leader, follower):
+                with pytest.raises(ValueError):
+                    future.result()
+
+    def test_releases_key(self):
+        flight = SingleFlight()
+        assert 1 == flight.do("key", lambda: 1)
+        assert 2 == flight.do("key", lambda: 2)
+        assert 0 == flight.shared
+
+
+def slow(request):
+    sleep(0.2)
+    return 200, {}, {"data": {"amount": "1", "path": request["path"]}}
+
+
+class TestMessengerFlight:
+    def test_coalesces_identical_gets(self):
+        with Server(slow) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), flight=SingleFlight()
+            )
+            wallet = Wallet(messenger)
+            with ThreadPoolExecutor(max_workers=20) as executor:
+                spots = list(
+                    executor.map(
+                        lambda _: wallet.price.spot("BTC-USD"), range(20)
+                    )
+                )
+        assert 1 == len(server.requests)
+        assert all(spot is spots[0] for spot in spots)
+        assert 19 == messenger.flight.shared
+
+    def test_distinct_requests_are_not_coalesced(self):
+        with Server(slow) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), flight=SingleFlight()
+            )
+            pairs = ["BTC-USD", "ETH-USD", "BTC-USD", "ETH-USD"]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(Wallet(messenger).price.spot, pairs))
+                list(executor.map(lambda _: messenger.post("/time"), range(3)))
+        assert 2 == sum("GET" == r["method"] for r in server.requests)
+        assert 3 == sum("POST" == r["method"] for r in server.requests)
+
+    def test_keys_and_versions_are_not_coalesced(self):
+        with Server(slow) as server:
+            flight = SingleFlight()
+            other = {**server.settings, "key": "other"}
+            messengers = [
+                Messenger(
+                    Auth(API(server.settings)), Limiter(), flight=flight
+                ),
+                Messenger(Auth(API(other)), Limiter(), flight=flight),
+                AdvancedMessenger(
+                    Auth(AdvancedAPI(server.settings)),
+                    Limiter(),
+                    flight=flight,
+                ),
+            ]
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                payloads = list(
+                    executor.map(
+                        lambda messenger: messenger.get("/time").json(),
+                        messengers,
+                    )
+                )
+        assert 3 == len(server.requests)
+        assert 0 == flight.shared
+        assert ["/v2/time", "/v2/time", "/api/v3/brokerage/time"] == [
+            payload["data"]["path"] for payload in payloads
+        ]
+        keys = {r["headers"]["CB-ACCESS-KEY"] for r in server.requests}
+        assert {"key", "other"} == keys
+
+    def test_refills_cache_once(self):
+        with Server(slow) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(),
+                cache=Cache(),
+                flight=SingleFlight(),
+            )
+            with ThreadPoolExecutor(max_workers=10) as executor:
+                list(
+                    executor.map(
+                        lambda _: messenger.get("/currencies"), range(10)
+                    )
+                )
+            messenger.get("/currencies")
+        assert 1 == len(server.requests)
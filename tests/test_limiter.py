@@ -0,0 +1,115 @@
+import pytest
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+
+from coinbase import __burst__
+from coinbase import __limit__
+
+from coinbase.limiter import FileLimiter
+from coinbase.limiter import Limiter
+from coinbase.limiter import get_file_limiter
+from coinbase.limiter import get_limiter
+
+from coinbase.messenger import Messenger
+from coinbase.messenger import get_advanced_messenger
+
+
+class TestLimiter:
+    def test_defaults(self):
+        limiter = Limiter()
+        assert limiter.rate == pytest.approx(1 / __limit__)
+        assert limiter.capacity == __burst__
+        assert limiter.budget == pytest.approx(__burst__)
+
+    def test_burst(self):
+        limiter = Limiter(rate=1, capacity=5)
+        start = monotonic()
+        for _ in range(5):
+            assert 0.0 == limiter.acquire()
+        assert monotonic() - start < 0.1
+        assert limiter.budget < 1
+
+    def test_blocks_when_empty(self):
+        limiter = Limiter(rate=20, capacity=1)
+        limiter.acquire()
+        start = monotonic()
+        delay = limiter.acquire()
+        assert delay > 0
+        assert monotonic() - start >= 0.04
+
+    def test_reserve(self):
+        limiter = Limiter(rate=10, capacity=2)
+        assert 0.0 == limiter.reserve()
+        assert 0.0 == limiter.reserve()
+        assert limiter.reserve() == pytest.approx(0.1, abs=0.01)
+        assert limiter.budget < 0
+
+    def test_take(self):
+        limiter = Limiter(rate=10, capacity=1)
+        assert 0.0 == limiter.take()
+        assert limiter.take() == pytest.approx(0.1, abs=0.01)
+        # waiting callers do not go into debt
+        assert limiter.budget >= 0
+
+    def test_threads(self):
+        limiter = Limiter(rate=50, capacity=10)
+        start = monotonic()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: limiter.acquire(), range(20)))
+        # 10 tokens burst, the remaining 10 are paced at 50 per second
+        assert monotonic() - start >= 0.18
+
+
+def drain(path: str, count: int) -> None:
+    limiter = FileLimiter(path, rate=20, capacity=5)
+    for _ in range(count):
+        limiter.acquire()
+
+
+class TestFileLimiter:
+    def test_state(self, tmp_path):
+        path = str(tmp_path / "bucket")
+        first = FileLimiter(path, rate=1, capacity=4)
+        second = FileLimiter(path, rate=1, capacity=4)
+        first.acquire()
+        first.acquire()
+        assert second.budget == pytest.approx(2, abs=0.1)
+        second.acquire()
+        assert first.budget == pytest.approx(1, abs=0.1)
+
+    def test_processes(self, tmp_path):
+        path = str(tmp_path / "bucket")
+        FileLimiter(path, rate=20, capacity=5).budget
+        start = monotonic()
+        with ProcessPoolExecutor(max_workers=3) as executor:
+            list(executor.map(drain, [path] * 3, [10] * 3))
+        # 5 tokens burst, the remaining 25 are paced at 20 per second
+        assert monotonic() - start >= 1.2
+
+    def test_get_file_limiter(self, tmp_path):
+        path = str(tmp_path / "bucket")
+        limiter = get_file_limiter("key", path)
+        assert isinstance(limiter, FileLimiter)
+        assert limiter is get_file_limiter("other", path)
+        assert limiter.path == path
+        assert get_file_limiter("key") is get_file_limiter("key")
+        assert get_file_limiter("key") is not get_limiter("key")
+
+    def test_messenger(self, tmp_path):
+        limiter = get_file_limiter("key", str(tmp_path / "bucket"))
+        messenger = get_advanced_messenger({}, limiter)
+        assert messenger.limiter is limiter
+
+
+def test_get_limiter():
+    assert get_limiter("a") is get_limiter("a")
+    assert get_limiter("a") is not get_limiter("b")
+
+
+def test_messenger_limiter(auth):
+    limiter = Limiter()
+    assert Messenger(auth, limiter).limiter is limiter
+    assert Messenger(auth).limiter is Messenger(auth).limiter
+    assert Messenger(auth).limiter is get_limiter(auth.api.key)
@@ -1,15 +1,39 @@
+import hashlib
+import hmac
+import json
 import pytest
 
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic
+from time import sleep
+from typing import Iterator
+
+from requests import HTTPError
 from requests import Response
 from requests import Session
 
+from tests.server import Server
+from tests.server import paginated
 from tests.teardown import Teardown
 
+from coinbase.limiter import Limiter
+
 from coinbase.messenger import API
 from coinbase.messenger import Auth
 from coinbase.messenger import Messenger
 from coinbase.messenger import AdvancedMessenger
 from coinbase.messenger import Subscriber
+from coinbase.messenger import before
+from coinbase.messenger import get_advanced_messenger
+from coinbase.messenger import get_messenger
+from coinbase.messenger import seen
+
+from coinbase.pool import PoolAdapter
+
+from coinbase.advanced import AdvancedTrade
+
+from coinbase.wallet import Wallet
 
 
 class TestMessenger(Teardown):
@@ -139,3 +163,265 @@ def test_subscriber(messenger):
     assert hasattr(dummy, "error")
 
     assert callable(dummy.error)
+
+
+accounts = paginated(
+    [{"id": f"{page}{n}"} for page in "abc" for n in range(2)], 2
+)
+advanced_accounts = paginated(
+    [{"uuid": "a"}, {"uuid": "b"}], 1, "cursor", "accounts"
+)
+
+
+class TestMessengerIteration:
+    def test_iter_pages(self):
+        with Server(accounts) as server:
+            messenger = get_messenger(server.settings, Limiter())
+            data = {"limit": 2}
+            pages = messenger.iter_pages("/accounts", data)
+            assert isinstance(pages, Iterator)
+            assert 0 == len(server.requests)
+            payloads = list(pages)
+        assert 3 == len(payloads)
+        assert {"limit": 2} == data
+        assert [None, "a1", "b1"] == [
+            request["query"].get("starting_after")
+            for request in server.requests
+        ]
+
+    def test_iter_items(self):
+        with Server(accounts) as server:
+            messenger = get_messenger(server.settings, Limiter())
+            items = messenger.iter_items("/accounts")
+            assert {"id": "a0"} == next(items)
+            assert 1 == len(server.requests)
+            rest = list(items)
+        assert ["a1", "b0", "b1", "c0", "c1"] == [item["id"] for item in rest]
+
+    def test_iter_error(self):
+        with Server(lambda request: (404, {}, {})) as server:
+            messenger = get_messenger(server.settings, Limiter())
+            with pytest.raises(HTTPError):
+                list(messenger.iter_items("/accounts"))
+
+    def test_advanced_iter_items(self):
+        with Server(advanced_accounts) as server:
+            messenger = get_advanced_messenger(server.settings, Limiter())
+            items = list(messenger.iter_items("/accounts", key="accounts"))
+        # the last page is yielded as well
+        assert ["a", "b"] == [item["uuid"] for item in items]
+        assert [{"limit": "250"}, {"limit": "250", "cursor": "1"}] == [
+            request["query"] for request in server.requests
+        ]
+        assert {b""} == {request["body"] for request in server.requests}
+
+
+class TestMessengerPlanning:
+    def test_limit(self, messenger: Messenger):
+        assert 100 == messenger.limit("/accounts/abc/transactions")
+
+    def test_advanced_limit(self, advanced_messenger: AdvancedMessenger):
+        assert 250 == advanced_messenger.limit("/accounts")
+        assert 100 == advanced_messenger.limit("/orders")
+
+    def test_default_page_size(self):
+        with Server(accounts) as server:
+            messenger = get_messenger(server.settings, Limiter())
+            list(messenger.iter_pages("/accounts", {"order": "asc"}))
+            list(messenger.iter_pages("/accounts", {"limit": 2}))
+        limits = [request["query"]["limit"] for request in server.requests]
+        assert ["100", "100", "100", "2", "2", "2"] == limits
+
+    def test_until(self):
+        with Server(accounts) as server:
+            messenger = get_messenger(server.settings, Limiter())
+            items = messenger.iter_items(
+                "/accounts", until=lambda item: item["id"] == "b1"
+            )
+            assert ["a0", "a1", "b0"] == [item["id"] for item in items]
+        # the third page is never requested
+        assert 2 == len(server.requests)
+
+    def test_seen(self):
+        with Server(accounts) as server:
+            messenger = get_messenger(server.settings, Limiter())
+            items = messenger.iter_items("/accounts", until=seen({"a1"}))
+            assert ["a0"] == [item["id"] for item in items]
+        assert 1 == len(server.requests)
+
+
+def test_before():
+    predicate = before("2023-03-01T00:00:00Z")
+    assert predicate({"created_at": "2023-02-28T23:59:59Z"})
+    assert not predicate({"created_at": "2023-03-01T00:00:00Z"})
+    assert before("2023", "updated_at")({"updated_at": "2022-12-31"})
+
+
+listing = paginated([{"id": str(n)} for n in reversed(range(47))])
+
+
+def test_sweep():
+    with Server(listing) as server:
+        messenger = get_messenger(server.settings, Limiter())
+        items = messenger.sweep("/accounts/abc/transactions", {"limit": 5})
+    assert [str(n) for n in reversed(range(47))] == [
+        item["id"] for item in items
+    ]
+    orders = [request["query"]["order"] for request in server.requests]
+    # a serial walk takes 10 pages; each end only walks about half of it
+    assert orders.count("desc") <= 7 and orders.count("asc") <= 7
+    assert len(orders) <= 12
+
+
+def test_subscriber_sweep():
+    with Server(listing) as server:
+        wallet = Wallet(get_messenger(server.settings, Limiter()))
+        items = wallet.deposit.sweep("abc", {"limit": 10})
+    assert 47 == len(items)
+    assert {"/v2/accounts/abc/deposits"} == {
+        request["path"] for request in server.requests
+    }
+
+
+transactions = paginated(
+    lambda request: [{"id": request["path"].split("/")[3]}]
+)
+
+
+def verified(request):
+    headers = request["headers"]
+    message = (
+        headers["CB-ACCESS-TIMESTAMP"]
+        + request["method"]
+        + request["target"]
+        + request["body"].decode("utf-8")
+    )
+    digest = hmac.new(b"secret", message.encode("utf-8"), hashlib.sha256)
+    if not hmac.compare_digest(digest.hexdigest(), headers["CB-ACCESS-SIGN"]):
+        return 401, {}, {"errors": [{"id": "authentication_error"}]}
+    path = request["path"]
+    if "/v2/accounts" == path:
+        return accounts(request)
+    if path.endswith("/transactions"):
+        return transactions(request)
+    body = json.loads(request["body"] or b"{}")
+    return 200, {}, {"data": {"path": path, "body": body}}
+
+
+class TestThreadSafety:
+    def test_stress(self):
+        sessions = set()
+
+        def task(n):
+            sessions.add(id(messenger.transport.local()))
+            kind = n % 4
+            if 0 == kind:
+                ids = [item["id"] for item in wallet.account.list()]
+                return ["a0", "a1", "b0", "b1", "c0", "c1"] == ids
+            if 1 == kind:
+                items = wallet.transaction.list(f"account{n}")
+                return [{"id": f"account{n}"}] == items
+            if 2 == kind:
+                data = wallet.account.get(f"account{n}")["data"]
+                return f"/v2/accounts/account{n}" == data["path"]
+            data = wallet.account.update(f"account{n}", {"name": n})["data"]
+            return {"name": n} == data["body"]
+
+        with Server(verified) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(rate=10000, capacity=1000),
+                adapter=PoolAdapter(maxsize=8, block=True),
+            )
+            wallet = Wallet(messenger)
+            with ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(executor.map(task, range(400)))
+            stats = messenger.stats
+            messenger.close()
+        assert all(results)
+        # account listings take three pages, everything else takes one
+        assert 600 == len(server.requests) == stats["requests"]
+        assert stats["connections"] <= 8
+        assert 1 < len(sessions) <= 16
+        assert messenger.transport.local() is not messenger.session
+        assert messenger.transport.local().adapters is (
+            messenger.session.adapters
+        )
+
+
+def slow(request):
+    sleep(0.1)
+    if "missing" in request["path"]:
+        return 404, {}, {"errors": [{"id": "not_found"}]}
+    return 200, {}, {"data": {"path": request["path"]}}
+
+
+class TestSubmit:
+    def test_submit(self):
+        with Server(slow) as server:
+            messenger = get_messenger(server.settings, Limiter())
+            future = messenger.submit("put", "/accounts/a", {"name": "b"})
+            assert isinstance(future, Future)
+            assert 200 == future.result().status_code
+            with pytest.raises(ValueError):
+                messenger.submit("PATCH", "/accounts/a")
+            messenger.close()
+        assert "PUT" == server.requests[0]["method"]
+        assert b'{"name": "b"}' == server.requests[0]["body"]
+
+    def test_gather(self):
+        with Server(slow) as server:
+            wallet = Wallet(get_messenger(server.settings, Limiter()))
+            calls = [
+                lambda n=n: wallet.account.get(f"a{n}") for n in range(20)
+            ]
+            start = monotonic()
+            results = wallet.gather(calls)
+            elapsed = monotonic() - start
+            wallet.messenger.close()
+        assert [f"/v2/accounts/a{n}" for n in range(20)] == [
+            result["data"]["path"] for result in results
+        ]
+        # 20 round trips of 0.1 seconds on 16 workers
+        assert elapsed < 0.5
+
+    def test_completed(self):
+        def route(request):
+            sleep(0.2 if request["path"].endswith("a0") else 0.0)
+            return 200, {}, {"data": {"path": request["path"]}}
+
+        with Server(route) as server:
+            trade = AdvancedTrade(
+                get_advanced_messenger(server.settings, Limiter())
+            )
+            calls = [lambda n=n: trade.account.get(f"a{n}") for n in range(3)]
+            indices = [index for index, _ in trade.completed(calls)]
+            trade.messenger.close()
+        assert 0 == indices[-1]
+        assert [0, 1, 2] == sorted(indices)
+
+    def test_error(self):
+        with Server(slow) as server:
+            wallet = Wallet(get_messenger(server.settings, Limiter()))
+            with pytest.raises(HTTPError):
+                wallet.gather(
+                    [
+                        wallet.time.get,
+                        lambda: wallet.transaction.list("missing"),
+                    ]
+                )
+            wallet.messenger.close()
+
+    def test_nested(self):
+        with Server(slow) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), workers=1
+            )
+            wallet = Wallet(messenger)
+
+            def both():
+                return wallet.gather([wallet.time.get, wallet.time.get])
+
+            results = wallet.gather([both])
+            messenger.close()
+        assert 2 == len(results[0])
@@ -0,0 +1,125 @@
+import tracemalloc
+
+from decimal import Decimal
+
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.advanced import AdvancedTrade
+from coinbase.limiter import Limiter
+from coinbase.messenger import get_advanced_messenger
+from coinbase.messenger import get_messenger
+from coinbase.model import CandleRecord
+from coinbase.model import FillRecord
+from coinbase.model import OrderRecord
+from coinbase.model import ProductRecord
+from coinbase.model import TransactionRecord
+from coinbase.wallet import Wallet
+
+
+def transaction(index: int) -> dict:
+    return {
+        "id": f"tx-{index}",
+        "type": "".join(["se", "nd"]),
+        "status": "".join(["comp", "leted"]),
+        "amount": {"amount": f"-0.{index:08d}", "currency": "BTC"},
+        "native_amount": {"amount": f"-{index}.00", "currency": "USD"},
+        "description": None,
+        "created_at": "2023-03-01T12:34:56Z",
+        "updated_at": "2023-03-01T12:35:10Z",
+        "resource": "transaction",
+        "resource_path": f"/v2/accounts/a/transactions/tx-{index}",
+    }
+
+
+class TestRecord:
+    def test_from_dict(self):
+        record = TransactionRecord.from_dict(transaction(7))
+        assert "tx-7" == record.id
+        assert "send" == record.type
+        assert "BTC" == record.currency
+        assert Decimal("-0.00000007") == record.amount
+        assert Decimal("-7.00") == record.native_amount
+        assert record.description is None
+        assert not hasattr(record, "__dict__")
+
+    def test_lazy_decimal(self):
+        record = FillRecord.from_dict({"price": "21000.5", "size": "0.1"})
+        assert "21000.5" == record._price
+        assert Decimal("21000.5") == record.price
+        assert isinstance(record._price, Decimal)
+        assert record.commission is None
+
+    def test_empty_amount(self):
+        record = OrderRecord.from_dict(
+            {"order_id": "a", "average_filled_price": "", "filled_size": "0"}
+        )
+        assert record.average_filled_price is None
+        assert Decimal("0") == record.filled_size
+        assert "average_filled_price=None" in repr(record)
+
+    def test_interns_enum_strings(self):
+        first, second = map(
+            TransactionRecord.from_dict, map(transaction, (1, 2))
+        )
+        assert first.type is second.type
+        assert first.status is second.status
+
+    def test_to_dict(self):
+        record = CandleRecord.from_dict({"start": "1", "close": "2.5"})
+        assert {
+            "start": "1",
+            "low": None,
+            "high": None,
+            "open": None,
+            "close": Decimal("2.5"),
+            "volume": None,
+        } == record.to_dict()
+        assert record == CandleRecord.from_dict({"start": "1", "close": "2.5"})
+        assert "CandleRecord(start='1'" in repr(record)
+
+    def test_memory(self):
+        items = [transaction(index) for index in range(2000)]
+        tracemalloc.start()
+        dicts = [dict(item, amount=dict(item["amount"])) for item in items]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        tracemalloc.start()
+        records = list(TransactionRecord.from_items(items))
+        compact = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert len(dicts) == len(records)
+        assert compact * 2 < size
+
+
+class TestTyped:
+    def test_wallet_transactions(self):
+        with Server(paginated([transaction(1)])) as server:
+            wallet = Wallet(get_messenger(server.settings, Limiter()))
+            records = wallet.transaction.list("a", typed=True)
+            assert [transaction(1)] == wallet.transaction.list("a")
+        assert isinstance(records[0], TransactionRecord)
+        assert Decimal("-0.00000001") == records[0].amount
+
+    def test_advanced_products(self):
+        product = {"product_id": "BTC-USD", "price": "21000.01"}
+
+        def route(request):
+            if request["path"].endswith("/products"):
+                return 200, {}, {"products": [product], "num_products": 1}
+            if request["path"].endswith("/candles"):
+                return 200, {}, {"candles": [{"start": "1", "low": "2"}]}
+            return 200, {}, product
+
+        with Server(route) as server:
+            trade = AdvancedTrade(
+                get_advanced_messenger(server.settings, Limiter())
+            )
+            products = trade.product.list(typed=True)
+            assert [ProductRecord.from_dict(product)] == products
+            assert (
+                Decimal("21000.01")
+                == trade.product.get("BTC-USD", typed=True).price
+            )
+            candles = trade.product.candles("BTC-USD", typed=True)
+            assert Decimal("2") == candles[0].low
@@ -0,0 +1,174 @@
+import socket
+
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+
+from requests.adapters import HTTPAdapter
+
+from tests.server import Server
+
+from coinbase.api import API
+from coinbase.auth import Auth
+from coinbase.heartbeat import Heartbeat
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+from coinbase.messenger import get_advanced_messenger
+from coinbase.pool import PoolAdapter
+from coinbase.pool import Resolver
+from coinbase.pool import get_socket_options
+
+
+def test_socket_options():
+    options = get_socket_options()
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+
+    options = get_socket_options(nodelay=False, keepalive=False)
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 0) in options
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) not in options
+
+
+class TestPoolAdapter:
+    def test_type(self):
+        adapter = PoolAdapter(connections=2, maxsize=32, block=True)
+        assert isinstance(adapter, HTTPAdapter)
+        assert 32 == adapter.poolmanager.connection_pool_kw["maxsize"]
+        assert adapter.poolmanager.connection_pool_kw["block"]
+        assert (
+            adapter.socket_options
+            == adapter.poolmanager.connection_pool_kw["socket_options"]
+        )
+
+    def test_messenger(self, auth):
+        adapter = PoolAdapter()
+        messenger = Messenger(auth, adapter=adapter)
+        assert messenger.adapter is adapter
+        assert messenger.session.get_adapter("https://api.coinbase.com") is (
+            adapter
+        )
+
+    def test_reuse(self):
+        with Server(lambda request: (200, {}, {"data": {}})) as server:
+            limiter = Limiter(rate=1000, capacity=100)
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                limiter,
+                adapter=PoolAdapter(maxsize=4, block=True),
+            )
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: messenger.get("/time"), range(40)))
+            stats = messenger.stats
+            messenger.close()
+        assert 1 == stats["pools"]
+        assert 40 == stats["requests"]
+        assert stats["connections"] <= 4
+        assert stats["reused"] >= 36
+
+
+class TestResolver:
+    def test_cache(self, monkeypatch):
+        lookups = []
+        getaddrinfo = socket.getaddrinfo
+
+        def counting(host, *args, **kwargs):
+            lookups.append(host)
+            return getaddrinfo(host, *args, **kwargs)
+
+        monkeypatch.setattr(socket, "getaddrinfo", counting)
+        resolver = Resolver(ttl=60)
+        assert "127.0.0.1" in resolver.resolve("localhost", 80)
+        assert resolver.resolve("localhost", 80) is resolver.resolve(
+            "localhost", 80
+        )
+        assert ["localhost"] == lookups
+        assert 1 == len(resolver)
+        resolver.forget("localhost")
+        assert 0 == len(resolver)
+        expired = Resolver(ttl=0)
+        expired.resolve("localhost", 80)
+        expired.resolve("localhost", 80)
+        assert 3 == len(lookups)
+
+    def test_connections(self, monkeypatch):
+        lookups = []
+        getaddrinfo = socket.getaddrinfo
+
+        def counting(host, *args, **kwargs):
+            if "localhost" == host:
+                lookups.append(host)
+            return getaddrinfo(host, *args, **kwargs)
+
+        monkeypatch.setattr(socket, "getaddrinfo", counting)
+        with Server(lambda request: (200, {}, {"data": {}})) as server:
+            settings = dict(server.settings)
+            settings["rest"] = server.url.replace("127.0.0.1", "localhost")
+            adapter = PoolAdapter(maxsize=3, resolver=Resolver())
+            messenger = Messenger(
+                Auth(API(settings)), Limiter(), adapter=adapter
+            )
+            assert 3 == messenger.warm()
+            assert 200 == messenger.get("/time").status_code
+            assert "localhost" == server.requests[0]["headers"]["Host"][:9]
+            messenger.close()
+        assert ["localhost"] == lookups
+
+
+class TestWarm:
+    def test_warm(self):
+        with Server(lambda request: (200, {}, {"data": {}})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), warm=3
+            )
+            assert isinstance(messenger.adapter.resolver, Resolver)
+            assert 3 == messenger.stats["connections"]
+            assert 0 == messenger.warm(3)
+            messenger.get("/time")
+            stats = messenger.stats
+            messenger.close()
+        assert 3 == stats["connections"]
+        assert 1 == stats["requests"]
+
+    def test_leaves_connections_in_use(self):
+        with Server(lambda request: (200, {}, {"data": {}})) as server:
+            adapter = PoolAdapter(maxsize=2)
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), adapter=adapter
+            )
+            assert 2 == messenger.warm()
+            pools = adapter.poolmanager.pools
+            pool = pools.get(next(iter(pools.keys())))
+            busy = [pool._get_conn(), pool._get_conn()]
+            assert 0 == messenger.warm()
+            for connection in busy:
+                pool._put_conn(connection)
+            assert 0 == messenger.warm()
+            stats = messenger.stats
+            messenger.close()
+        assert 2 == stats["connections"]
+
+    def test_unreachable(self):
+        messenger = Messenger(
+            Auth(API({"rest": "http://127.0.0.1:9", "secret": "s"})),
+            Limiter(),
+            warm=2,
+        )
+        assert 0 == messenger.warm()
+
+    def test_keepalive(self):
+        with Server(lambda request: (200, {}, {"data": {}})) as server:
+            messenger = get_advanced_messenger(
+                server.settings, Limiter(), warm=2, keepalive=0.05
+            )
+            heartbeat = messenger.heartbeat
+            assert isinstance(heartbeat, Heartbeat)
+            sleep(0.3)
+            assert heartbeat.alive
+            messenger.close()
+            assert not heartbeat.alive
+            count = len(server.requests)
+            sleep(0.1)
+        assert 2 <= count == len(server.requests)
+        assert 0 == heartbeat.failures
+        assert {"/api/v3/brokerage/time"} == {
+            request["path"] for request in server.requests
+        }
@@ -0,0 +1,77 @@
+import pytest
+
+from time import monotonic
+from time import sleep
+
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.limiter import Limiter
+from coinbase.messenger import get_messenger
+from coinbase.prefetch import Prefetcher
+
+
+class TestPrefetcher:
+    def test_order(self):
+        assert list(range(10)) == list(Prefetcher(range(10), 3))
+
+    def test_error(self):
+        def failing():
+            yield 1
+            raise ValueError("boom")
+
+        pages = Prefetcher(failing())
+        assert 1 == next(pages)
+        with pytest.raises(ValueError):
+            next(pages)
+        with pytest.raises(StopIteration):
+            next(pages)
+
+    def test_exhausted(self):
+        pages = Prefetcher(range(2))
+        assert [0, 1] == list(pages)
+        with pytest.raises(StopIteration):
+            next(pages)
+        closed = Prefetcher(range(10))
+        closed.close()
+        assert [] == list(closed)
+
+    def test_depth(self):
+        produced = []
+
+        def counting():
+            for n in range(100):
+                produced.append(n)
+                yield n
+
+        pages = Prefetcher(counting(), 2)
+        assert 0 == next(pages)
+        sleep(0.1)
+        # one consumed, two buffered and one waiting to be buffered
+        assert len(produced) <= 4
+        pages.close()
+
+
+def test_iter_pages_prefetch():
+    listing = paginated(range(5), 1)
+
+    def route(request):
+        sleep(0.1)
+        return listing(request)
+
+    def consume(prefetch: int) -> tuple[list, float]:
+        start = monotonic()
+        items = []
+        for page in messenger.iter_pages("/accounts", prefetch=prefetch):
+            sleep(0.1)
+            items += page["data"]
+        return items, monotonic() - start
+
+    with Server(route) as server:
+        messenger = get_messenger(server.settings, Limiter())
+        serial, serial_time = consume(0)
+        ahead, ahead_time = consume(2)
+    assert [0, 1, 2, 3, 4] == serial == ahead
+    # serial: 5 * (0.1 + 0.1), prefetched: overlaps fetching and processing
+    assert serial_time >= 1.0
+    assert ahead_time < 0.85
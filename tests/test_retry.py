@@ -0,0 +1,142 @@
+import pytest
+
+from email.utils import formatdate
+from time import time
+
+from requests import Response
+
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.api import API
+from coinbase.auth import Auth
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+from coinbase.retry import Retry
+from coinbase.retry import get_retries
+
+
+def response(status: int, headers: dict = None) -> Response:
+    result = Response()
+    result.status_code = status
+    result.headers.update(headers or {})
+    return result
+
+
+def fast() -> dict[str, Retry]:
+    retries = get_retries()
+    return {
+        method: Retry(
+            total=3, backoff=0.01, statuses=retry.statuses, errors=retry.errors
+        )
+        for method, retry in retries.items()
+    }
+
+
+class TestRetry:
+    def test_retryable(self):
+        retry = Retry()
+        assert retry.retryable(response(429))
+        assert retry.retryable(response(503))
+        assert not retry.retryable(response(404))
+
+    def test_backoff(self):
+        retry = Retry(backoff=1, cap=5, jitter=False)
+        assert [retry.delay(n) for n in range(4)] == [1, 2, 4, 5]
+        jittered = Retry(backoff=1, cap=5)
+        assert all(0 <= jittered.delay(3) <= 5 for _ in range(20))
+
+    def test_retry_after(self):
+        retry = Retry(cap=60)
+        assert 7 == retry.delay(0, response(429, {"Retry-After": "7"}))
+        date = formatdate(time() + 10, usegmt=True)
+        delay = retry.delay(0, response(429, {"Retry-After": date}))
+        assert 8 <= delay <= 10
+
+    def test_rate_limit_headers(self):
+        headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "3"}
+        assert 3 == Retry.after(response(429, headers))
+        headers["X-RateLimit-Reset"] = str(time() + 5)
+        assert 4 <= Retry.after(response(429, headers)) <= 5
+        headers["X-RateLimit-Remaining"] = "10"
+        assert Retry.after(response(429, headers)) is None
+
+    def test_policies(self):
+        retries = get_retries()
+        assert retries["GET"].retryable(response(500))
+        assert not retries["POST"].retryable(response(500))
+        assert retries["POST"].retryable(response(429))
+
+
+class TestMessengerRetry:
+    def test_get_retries_server_errors(self):
+        statuses = [503, 502, 200]
+
+        def route(request):
+            return statuses.pop(0), {}, {"data": {}}
+
+        with Server(route) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), fast()
+            )
+            assert 200 == messenger.get("/time").status_code
+        assert 3 == len(server.requests)
+
+    def test_post_is_not_retried_on_server_error(self):
+        with Server(lambda request: (500, {}, {})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), fast()
+            )
+            assert 500 == messenger.post("/orders", {"a": 1}).status_code
+        assert 1 == len(server.requests)
+
+    def test_gives_up(self):
+        with Server(lambda request: (503, {}, {})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), fast()
+            )
+            assert 503 == messenger.get("/time").status_code
+        assert 4 == len(server.requests)
+
+    def test_429_penalizes_limiter(self):
+        statuses = [429, 200]
+
+        def route(request):
+            return statuses.pop(0), {"Retry-After": "0.2"}, {}
+
+        with Server(route) as server:
+            limiter = Limiter(rate=100, capacity=10)
+            messenger = Messenger(Auth(API(server.settings)), limiter, fast())
+            assert 200 == messenger.post("/orders").status_code
+            assert limiter.budget < 10
+        assert 2 == len(server.requests)
+
+    def test_page_resumes_from_cursor(self):
+        failures = {"a": 1}
+        listing = paginated(["a", "b", "c"], 1)
+
+        def route(request):
+            cursor = request["query"].get("starting_after")
+            if failures.get(cursor):
+                failures[cursor] -= 1
+                return 429, {"Retry-After": "0"}, {}
+            return listing(request)
+
+        with Server(route) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), fast()
+            )
+            pages = messenger.page("/accounts")
+        assert ["a", "b", "c"] == [
+            item for page in pages for item in page.json()["data"]
+        ]
+        cursors = [r["query"].get("starting_after") for r in server.requests]
+        assert [None, "a", "a", "b"] == cursors
+
+
+@pytest.mark.parametrize("method", ["get", "post", "put", "delete"])
+def test_without_retries(method):
+    with Server(lambda request: (503, {}, {})) as server:
+        messenger = Messenger(Auth(API(server.settings)), Limiter(), {})
+        assert 503 == getattr(messenger, method)("/time").status_code
+    assert 1 == len(server.requests)
@@ -0,0 +1,132 @@
+import hashlib
+import hmac
+
+from tests.server import Server
+
+from coinbase.advanced import AdvancedTrade
+from coinbase.api import API
+from coinbase.api import AdvancedAPI
+from coinbase.auth import Auth
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+from coinbase.messenger import get_advanced_messenger
+from coinbase.retry import Retry
+from coinbase.route import Route
+
+
+def verify(request: dict) -> bool:
+    headers = request["headers"]
+    path = request["path"]
+    if request["query"]:
+        path = f"{path}?" + "&".join(
+            f"{key}={value}" for key, value in request["query"].items()
+        )
+    message = b"".join(
+        (
+            headers["CB-ACCESS-TIMESTAMP"].encode("ascii"),
+            request["method"].encode("ascii"),
+            path.encode("ascii"),
+            request["body"],
+        )
+    )
+    expected = hmac.new(b"secret", message, hashlib.sha256).hexdigest()
+    return expected == headers["CB-ACCESS-SIGN"]
+
+
+class TestRoute:
+    def test_path(self):
+        api = API({"rest": "https://example.com"})
+        route = Route(api, "get", "/accounts/{account_id}/transactions")
+        assert "GET" == route.method
+        assert "/accounts/{account_id}/transactions" == route.template
+        assert "/v2/accounts/a%2Fb/transactions" == route.path(
+            account_id="a/b"
+        )
+        advanced = Route(AdvancedAPI({}), "POST", "/orders")
+        assert "/api/v3/brokerage/orders" == advanced.path()
+
+    def test_url_and_stamp(self):
+        api = AdvancedAPI({"key": "key", "secret": "secret"})
+        auth = Auth(api)
+        route = Route(api, "post", "/orders")
+        path = route.path()
+        assert api.url(path) == route.url(path)
+        headers = route.stamp(auth, path, b"{}")
+        message = (
+            headers["CB-ACCESS-TIMESTAMP"].encode("ascii")
+            + b"POST/api/v3/brokerage/orders{}"
+        )
+        expected = hmac.new(b"secret", message, hashlib.sha256).hexdigest()
+        assert expected == headers["CB-ACCESS-SIGN"]
+
+    def test_stamp(self):
+        auth = Auth(API({"key": "key", "secret": "secret"}))
+        headers = auth.stamp("post", "/v2/accounts/a/transactions", b"{}")
+        message = (
+            headers["CB-ACCESS-TIMESTAMP"].encode("ascii")
+            + b"POST/v2/accounts/a/transactions{}"
+        )
+        expected = hmac.new(b"secret", message, hashlib.sha256).hexdigest()
+        assert expected == headers["CB-ACCESS-SIGN"]
+        assert "key" == headers["CB-ACCESS-KEY"]
+
+
+class TestMessengerCall:
+    def test_call(self):
+        with Server(lambda request: (200, {}, {"ok": True})) as server:
+            messenger = Messenger(Auth(API(server.settings)), Limiter())
+            route = messenger.route("POST", "/accounts/{account_id}/buys")
+            assert route is messenger.route(
+                "post", "/accounts/{account_id}/buys"
+            )
+            assert {"ok": True} == messenger.call(
+                route, {"amount": "1"}, account_id="abc"
+            ).json()
+            messenger.call(messenger.route("GET", "/accounts"), {"limit": 5})
+            messenger.call(messenger.route("DELETE", "/orders"))
+        post, get, delete = server.requests
+        assert "/v2/accounts/abc/buys" == post["path"]
+        assert b'{"amount": "1"}' == post["body"]
+        assert {"limit": "5"} == get["query"]
+        assert b"" == get["body"]
+        assert "0" == delete["headers"]["Content-Length"]
+        assert all(map(verify, server.requests))
+
+    def test_call_uses_compiled_url(self, monkeypatch):
+        with Server(lambda request: (200, {}, {})) as server:
+            messenger = Messenger(Auth(API(server.settings)), Limiter())
+            route = messenger.route("GET", "/accounts/{account_id}")
+            monkeypatch.setattr(messenger.api, "url", None)
+            messenger.call(route, {"limit": 1}, account_id="abc")
+        assert "/v2/accounts/abc?limit=1" == server.requests[0]["target"]
+        assert all(map(verify, server.requests))
+
+    def test_call_retries(self):
+        statuses = [503, 200]
+
+        def route(request):
+            return statuses.pop(0), {}, {}
+
+        with Server(route) as server:
+            retries = {"GET": Retry(backoff=0.01)}
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), retries
+            )
+            response = messenger.call(messenger.route("GET", "/time"))
+        assert 200 == response.status_code
+        assert 2 == len(server.requests)
+
+    def test_orders(self):
+        with Server(lambda request: (200, {}, {"success": True})) as server:
+            trade = AdvancedTrade(
+                get_advanced_messenger(server.settings, Limiter())
+            )
+            assert trade.order.post({"product_id": "BTC-USD"})["success"]
+            trade.order.get("abc")
+            trade.order.cancel("abc")
+        assert [
+            ("POST", "/api/v3/brokerage/orders"),
+            ("GET", "/api/v3/brokerage/orders/abc"),
+            ("DELETE", "/api/v3/brokerage/orders/abc"),
+        ] == [(r["method"], r["path"]) for r in server.requests]
+        assert all(map(verify, server.requests))
@@ -0,0 +1,169 @@
+import pytest
+
+from threading import Lock
+from threading import Thread
+from time import sleep
+
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.api import API
+from coinbase.auth import Auth
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+from coinbase.messenger import get_advanced_messenger
+from coinbase.scheduler import Priority
+from coinbase.scheduler import Scheduler
+from coinbase.scheduler import get_shares
+from coinbase.wallet import Wallet
+
+
+def arrived(scheduler: Scheduler) -> int:
+    stats = scheduler.stats
+    return sum(stats["waiting"].values()) + sum(stats["granted"].values())
+
+
+def queue(scheduler: Scheduler, priorities: list) -> tuple[list, list]:
+    """Queue requests on an empty bucket and record the order of grants."""
+    lock = Lock()
+    order = []
+
+    def acquire(priority):
+        scheduler.acquire(priority)
+        with lock:
+            order.append(priority)
+
+    threads = []
+    for priority in priorities:
+        thread = Thread(target=acquire, args=(priority,))
+        thread.start()
+        threads.append(thread)
+        # keep the arrival order deterministic
+        while arrived(scheduler) < len(threads):
+            sleep(0.001)
+    return threads, order
+
+
+def drained(rate: float) -> Limiter:
+    limiter = Limiter(rate=rate, capacity=1)
+    limiter.acquire()
+    return limiter
+
+
+class TestScheduler:
+    def test_shares(self):
+        shares = get_shares()
+        assert 1 == pytest.approx(sum(shares.values()))
+        assert list(shares) == sorted(Priority)
+
+    def test_classify(self):
+        scheduler = Scheduler(Limiter())
+        assert Priority.TRADING == scheduler.classify(
+            "POST", "/api/v3/brokerage/orders"
+        )
+        assert Priority.TRADING == scheduler.classify(
+            "POST", "/api/v3/brokerage/orders/batch_cancel"
+        )
+        assert Priority.ACCOUNT == scheduler.classify(
+            "GET", "/api/v3/brokerage/orders/historical/batch?limit=1"
+        )
+        assert Priority.MARKET == scheduler.classify(
+            "GET", "/api/v3/brokerage/products/BTC-USD/candles"
+        )
+        assert Priority.MARKET == scheduler.classify(
+            "GET", "/v2/prices/BTC-USD/spot"
+        )
+        assert Priority.ACCOUNT == scheduler.classify(
+            "GET", "/v2/accounts/abc/transactions"
+        )
+
+    def test_jumps_queue(self):
+        scheduler = Scheduler(drained(20))
+        priorities = [Priority.BACKFILL] * 10 + [Priority.TRADING]
+        threads, order = queue(scheduler, priorities)
+        for thread in threads:
+            thread.join()
+        assert order.index(Priority.TRADING) <= 1
+        assert {"TRADING": 1, "BACKFILL": 10} == {
+            name: count
+            for name, count in scheduler.stats["granted"].items()
+            if count
+        }
+
+    def test_budget_shares(self):
+        scheduler = Scheduler(drained(100))
+        priorities = [Priority.TRADING] * 20 + [Priority.BACKFILL] * 5
+        threads, order = queue(scheduler, priorities)
+        for thread in threads:
+            thread.join()
+        # trading may take about four of every five tokens while both wait
+        assert 2 <= order[:15].count(Priority.BACKFILL)
+        assert Priority.TRADING == order[0]
+
+    def test_starvation(self):
+        shares = {Priority.TRADING: 1.0, Priority.BACKFILL: 0.0}
+        scheduler = Scheduler(drained(50), shares, patience=0.1)
+        priorities = [Priority.BACKFILL] + [Priority.TRADING] * 30
+        threads, order = queue(scheduler, priorities)
+        for thread in threads:
+            thread.join()
+        assert order.index(Priority.BACKFILL) < 20
+
+
+class TestMessengerScheduler:
+    def test_limiter(self):
+        limiter = Limiter()
+        scheduler = Scheduler(limiter)
+        api = API({"key": "k", "secret": "s"})
+        assert Messenger(Auth(api), scheduler=scheduler).limiter is limiter
+        with pytest.raises(ValueError):
+            Messenger(Auth(api), Limiter(), scheduler=scheduler)
+
+    def test_priorities(self):
+        listing = paginated([{"id": 1}])
+
+        def route(request):
+            if request["path"].endswith("/accounts"):
+                return listing(request)
+            return 200, {}, {}
+
+        with Server(route) as server:
+            scheduler = Scheduler(Limiter(rate=1000, capacity=100))
+            messenger = get_advanced_messenger(
+                server.settings, scheduler=scheduler
+            )
+            messenger.post("/orders", {"side": "BUY"})
+            messenger.get("/products/BTC-USD")
+            messenger.get("/accounts/abc")
+            with messenger.prioritize(Priority.BACKFILL):
+                messenger.get("/orders/historical/fills")
+                messenger.gather([lambda: messenger.get("/accounts/abc")])
+                assert Priority.BACKFILL == messenger.priority
+            assert messenger.priority is None
+            messenger.close()
+
+            messenger = Messenger(
+                Auth(API(server.settings)), scheduler=scheduler
+            )
+            messenger.sweep("/accounts")
+            messenger.close()
+        assert {
+            "TRADING": 1,
+            "ACCOUNT": 1,
+            "MARKET": 1,
+            "BACKFILL": 4,
+        } == scheduler.stats["granted"]
+
+    def test_fan_out_keeps_priority(self):
+        with Server(paginated([{"id": 1}])) as server:
+            scheduler = Scheduler(Limiter(rate=1000, capacity=100))
+            messenger = Messenger(
+                Auth(API(server.settings)), scheduler=scheduler
+            )
+            wallet = Wallet(messenger)
+            with messenger.prioritize(Priority.BACKFILL):
+                results = wallet.transaction.list_many(["a", "b", "c"])
+            messenger.close()
+        assert 3 == len(results)
+        assert 3 == scheduler.stats["granted"]["BACKFILL"]
+        assert 0 == scheduler.stats["granted"]["ACCOUNT"]
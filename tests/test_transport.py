@@ -0,0 +1,215 @@
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.exceptions import ConnectionError
+from requests.exceptions import HTTPError
+
+from tests.server import H2Server
+from tests.server import Server
+from tests.server import paginated
+
+from coinbase.api import API
+from coinbase.auth import Auth
+from coinbase.cache import Cache
+from coinbase.limiter import Limiter
+from coinbase.messenger import Messenger
+from coinbase.retry import Retry
+from coinbase.transport import HttpxTransport
+from coinbase.transport import Reply
+from coinbase.transport import SessionTransport
+from coinbase.transport import Transport
+from coinbase.transport import Urllib3Transport
+from coinbase.wallet import Wallet
+
+listing = paginated(["a", "b"], 1)
+
+
+def pages(request):
+    status, _, payload = listing(request)
+    return status, {"ETag": '"v1"'}, payload
+
+
+class TestReply:
+    def test_reply(self):
+        reply = Reply(200, {"ETag": '"v1"'}, b'{"data": []}', "u", "OK")
+        assert reply.ok
+        assert {"data": []} == reply.json()
+        assert '{"data": []}' == reply.text
+        reply.raise_for_status()
+
+    def test_raise_for_status(self):
+        reply = Reply(404, {}, b"{}", "https://x.io/v2/time", "Not Found")
+        assert not reply.ok
+        with pytest.raises(HTTPError) as error:
+            reply.raise_for_status()
+        assert error.value.response is reply
+
+
+class TestUrllib3Transport:
+    def test_messenger(self):
+        with Server(pages) as server:
+            transport = Urllib3Transport()
+            messenger = Messenger(
+                Auth(API(server.settings)), Limiter(), transport=transport
+            )
+            wallet = Wallet(messenger)
+            assert ["a", "b"] == wallet.transaction.list("abc")
+            response = messenger.post("/time", {"a": 1})
+            assert isinstance(response, Reply)
+            assert '"v1"' == response.headers["etag"]
+            assert 3 == messenger.stats["requests"]
+            messenger.close()
+        assert {"starting_after": "a", "limit": "100"} == server.requests[1][
+            "query"
+        ]
+        assert b'{"a": 1}' == server.requests[2]["body"]
+        assert "CB-ACCESS-SIGN" in server.requests[2]["headers"]
+
+    def test_errors(self):
+        with Server(lambda request: (404, {}, {})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(),
+                transport=Urllib3Transport(),
+            )
+            with pytest.raises(HTTPError):
+                list(messenger.iter_items("/accounts"))
+        messenger = Messenger(
+            Auth(API({"rest": "http://127.0.0.1:9", "secret": "s"})),
+            Limiter(),
+            {"GET": Retry(total=1, backoff=0.01)},
+            transport=Urllib3Transport(),
+        )
+        with pytest.raises(ConnectionError):
+            messenger.get("/time")
+
+    def test_cache_revalidation(self):
+        def route(request):
+            if request["headers"].get("If-None-Match"):
+                return 304, {}, b""
+            return pages(request)
+
+        with Server(route) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(),
+                cache=Cache({"/accounts": 0}),
+                transport=Urllib3Transport(),
+            )
+            first = messenger.get("/accounts").json()
+            assert first is messenger.get("/accounts").json()
+        assert 2 == len(server.requests)
+
+    def test_reuse(self):
+        with Server(lambda request: (200, {}, {})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(rate=1000, capacity=100),
+                transport=Urllib3Transport(maxsize=4, block=True),
+            )
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda _: messenger.get("/time"), range(20)))
+            stats = messenger.stats
+        assert 20 == stats["requests"]
+        assert stats["connections"] <= 4
+
+
+class TestHttpxTransport:
+    def test_http2(self):
+        pytest.importorskip("h2")
+        with H2Server(pages) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(),
+                transport=HttpxTransport(http1=False),
+            )
+            assert ["a", "b"] == Wallet(messenger).transaction.list("abc")
+            response = messenger.post("/time", {"a": 1})
+            assert isinstance(response, Reply)
+            assert '"v1"' == response.headers["ETag"]
+            messenger.close()
+        assert b'{"a": 1}' == server.requests[2]["body"]
+        assert "cb-access-sign" in server.requests[2]["headers"]
+
+    def test_multiplexing(self):
+        pytest.importorskip("h2")
+        with H2Server(lambda request: (200, {}, {})) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(rate=1000, capacity=100),
+                transport=HttpxTransport(http1=False),
+            )
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda _: messenger.get("/time"), range(40)))
+            assert 40 == messenger.stats["requests"]
+            messenger.close()
+        assert 1 == server.connections
+
+    def test_http1(self):
+        pytest.importorskip("httpx")
+        with Server(pages) as server:
+            messenger = Messenger(
+                Auth(API(server.settings)),
+                Limiter(),
+                transport=HttpxTransport(),
+            )
+            assert ["a", "b"] == Wallet(messenger).transaction.list("abc")
+            messenger.close()
+
+    def test_errors(self):
+        pytest.importorskip("httpx")
+        messenger = Messenger(
+            Auth(API({"rest": "http://127.0.0.1:9", "secret": "s"})),
+            Limiter(),
+            {"GET": Retry(total=1, backoff=0.01)},
+            transport=HttpxTransport(),
+        )
+        with pytest.raises(ConnectionError):
+            messenger.get("/time")
+
+
+class TestSessionTransport:
+    def test_default(self, auth):
+        messenger = Messenger(auth)
+        assert isinstance(messenger.transport, SessionTransport)
+        assert messenger.transport.session is messenger.session
+
+    def test_proxies(self, monkeypatch):
+        monkeypatch.setenv("HTTPS_PROXY", "http://proxy:3128")
+        transport = SessionTransport()
+        proxies = transport.proxies("https://api.coinbase.com/v2/time")
+        assert "http://proxy:3128" == proxies["https"]
+        assert proxies is transport.proxies("https://api.coinbase.com/v2/x")
+
+    def test_redirect(self):
+        def route(request):
+            if "/v2/old" == request["path"]:
+                headers = {"Location": "/v2/time", "Set-Cookie": "a=1"}
+                return 302, headers, {}
+            return 200, {}, {"data": request["headers"].get("Cookie")}
+
+        with Server(route) as server:
+            messenger = Messenger(Auth(API(server.settings)), Limiter())
+            response = messenger.get("/old")
+        assert 200 == response.status_code
+        assert "a=1" == response.json()["data"]
+        assert ["/v2/old", "/v2/time"] == [
+            request["path"] for request in server.requests
+        ]
+
+
+def test_custom_transport():
+    class Canned(Transport):
+        def __init__(self):
+            self.sent = []
+
+        def send(self, method, url, headers, body, timeout):
+            self.sent.append((method, url, body))
+            return Reply(200, {}, b'{"data": {"iso": "now"}}', url)
+
+    transport = Canned()
+    api = API({"key": "k", "secret": "s", "rest": "https://x.io"})
+    messenger = Messenger(Auth(api), Limiter(), transport=transport)
+    assert "now" == Wallet(messenger).time.get()["data"]["iso"]
+    assert [("GET", "https://x.io/v2/time", b"")] == transport.sent
@@ -2,11 +2,21 @@
 import datetime
 import pytest
 
+from time import monotonic
+from time import sleep
+
+from typing import Iterator
+
 from dateutil.relativedelta import relativedelta
 
+from tests.server import Server
+from tests.server import paginated
 from tests.teardown import Teardown
 
+from coinbase.limiter import Limiter
+
 from coinbase.messenger import Subscriber
+from coinbase.messenger import get_messenger
 
 from coinbase.wallet import User
 from coinbase.wallet import Account
@@ -109,3 +119,46 @@ class TestPublicTime(Teardown):
         assert isinstance(response, dict)
         assert "data" in response
         assert "iso" in response["data"] and "epoch" in response["data"]
+
+
+class TestWalletIteration:
+    def test_iter(self):
+        with Server(paginated([{"id": "a"}, {"id": "b"}], 1)) as server:
+            wallet = Wallet(get_messenger(server.settings, Limiter()))
+            transactions = wallet.transaction.iter("abc")
+            assert isinstance(transactions, Iterator)
+            assert ["a", "b"] == [tx["id"] for tx in transactions]
+            assert [{"id": "a"}, {"id": "b"}] == wallet.buy.list("abc")
+        assert "/v2/accounts/abc/transactions" == server.requests[0]["path"]
+        assert "/v2/accounts/abc/buys" == server.requests[-1]["path"]
+
+
+class TestWalletFanOut:
+    def test_list_many(self):
+        listing = paginated(
+            lambda request: [{"id": request["path"].split("/")[3]}]
+        )
+
+        def route(request):
+            sleep(0.05)
+            return listing(request)
+
+        account_ids = [f"account-{n}" for n in range(16)]
+        with Server(route) as server:
+            limiter = Limiter(rate=1000, capacity=100)
+            wallet = Wallet(get_messenger(server.settings, limiter))
+            start = monotonic()
+            results = wallet.transaction.list_many(account_ids, workers=8)
+            elapsed = monotonic() - start
+        assert {key: [{"id": key}] for key in account_ids} == results
+        # 16 accounts at 50ms each take 0.8 seconds one after another
+        assert elapsed < 0.5
+
+    def test_iter_many(self):
+        with Server(paginated([1, 2])) as server:
+            wallet = Wallet(get_messenger(server.settings, Limiter()))
+            results = dict(wallet.buy.iter_many(["a", "b"], {"limit": 2}))
+        assert {"a": [1, 2], "b": [1, 2]} == results
+        assert {"/v2/accounts/a/buys", "/v2/accounts/b/buys"} == {
+            request["path"] for request in server.requests
+        }